@@ -0,0 +1,256 @@
+"""
+Release asset helpers for build.py: minification, content-hashed names
+and precompressed siblings.
+
+The minifiers are deliberately conservative. They drop comments and
+layout whitespace but never rename identifiers or rewrite string and
+template-literal contents, and JS keeps line breaks wherever automatic
+semicolon insertion could depend on them.
+"""
+import gzip
+import hashlib
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = {".html", ".js", ".css", ".json", ".svg", ".txt"}
+
+_IDENT = re.compile(r"[A-Za-z0-9_$]")
+# A '/' after one of these starts a regex literal rather than a division
+_REGEX_AFTER_CHARS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_AFTER_WORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw",
+                      "case", "do", "else", "yield", "await"}
+# Joining the next line onto one ending with these never changes how the code parses
+_JOIN_AFTER = set("{;,([")
+
+
+def content_hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def hashed_name(name, data) -> str:
+    """'app.js' -> 'app.<hash>.js' for the given content."""
+    stem, dot, suffix = name.rpartition(".")
+    if not dot:
+        return f"{name}.{content_hash(data)}"
+    return f"{stem}.{content_hash(data)}.{suffix}"
+
+
+def _skip_string(src, i, quote):
+    """Index just past the string literal starting at src[i] == quote."""
+    i += 1
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == quote or (c == "\n" and quote != "`"):
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_regex(src, i):
+    """Index just past the regex literal (and its flags) starting at src[i] == '/'."""
+    i += 1
+    in_class = False
+    while i < len(src):
+        c = src[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            i += 1
+            break
+        elif c == "\n":
+            break
+        i += 1
+    while i < len(src) and _IDENT.match(src[i]):
+        i += 1
+    return i
+
+
+def minify_js(src) -> str:
+    out = []
+    last = ""          # last significant character emitted in code
+    word = ""          # last identifier/keyword emitted, for regex detection
+    pending_space = False
+    pending_newline = False
+    # Template literals can nest code inside ${...}; track brace depth per level
+    stack = []         # entries: brace depth of the enclosing ${ } code, for each open template
+    depth = 0
+    i, n = 0, len(src)
+
+    def emit(text, is_operand=False):
+        nonlocal last, pending_space, pending_newline
+        if pending_newline and out and last not in _JOIN_AFTER:
+            out.append("\n")
+        elif (pending_space or pending_newline) and out:
+            prev, nxt = last, text[0]
+            if (_IDENT.match(prev) and _IDENT.match(nxt)) or (prev == nxt and prev in "+-") \
+                    or (prev in "+-" and nxt in "+-"):
+                out.append(" ")
+        pending_space = pending_newline = False
+        out.append(text)
+        last = "a" if is_operand else text[-1]
+
+    while i < n:
+        c = src[i]
+        if c in " \t\r":
+            pending_space = True
+            i += 1
+        elif c == "\n":
+            pending_newline = True
+            i += 1
+        elif src.startswith("//", i):
+            while i < n and src[i] != "\n":
+                i += 1
+        elif src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            pending_space = True
+        elif c in "'\"":
+            j = _skip_string(src, i, c)
+            emit(src[i:j], is_operand=True)
+            word = ""
+            i = j
+        elif c == "`" or (c == "}" and stack and depth == stack[-1]):
+            # Copy template text verbatim up to the closing backtick or the next ${
+            if c == "}":
+                stack.pop()
+            j = i + 1
+            while j < n:
+                if src[j] == "\\":
+                    j += 2
+                    continue
+                if src[j] == "`":
+                    j += 1
+                    break
+                if src.startswith("${", j):
+                    j += 2
+                    stack.append(depth)
+                    break
+                j += 1
+            emit(src[i:j], is_operand=src[j - 1] == "`")
+            word = ""
+            i = j
+        elif c == "/" and (last in _REGEX_AFTER_CHARS or last == "" or word in _REGEX_AFTER_WORDS):
+            j = _skip_regex(src, i)
+            emit(src[i:j], is_operand=True)
+            word = ""
+            i = j
+        elif _IDENT.match(c):
+            j = i
+            while j < n and _IDENT.match(src[j]):
+                j += 1
+            word = src[i:j]
+            emit(word)
+            i = j
+        else:
+            if c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+            emit(c)
+            word = ""
+            i += 1
+    return "".join(out).strip() + "\n"
+
+
+def minify_css(src) -> str:
+    out = []
+    i, n = 0, len(src)
+    pending_space = False
+    while i < n:
+        c = src[i]
+        if src.startswith("/*", i):
+            end = src.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            pending_space = True
+            continue
+        if c in " \t\r\n":
+            pending_space = True
+            i += 1
+            continue
+        if c in "'\"":
+            j = _skip_string(src, i, c)
+            token = src[i:j]
+            i = j
+        else:
+            token = c
+            i += 1
+        prev = out[-1][-1] if out else ""
+        # Spaces before ':' are kept: ".a :hover" and ".a:hover" differ
+        if pending_space and prev and prev not in "{};,>:" and token not in "{};,>":
+            out.append(" ")
+        pending_space = False
+        if token == "}" and prev == ";":
+            out[-1] = out[-1][:-1]
+        out.append(token)
+    return "".join(out)
+
+
+_RAW_BLOCK = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)", re.S | re.I)
+_TAG = re.compile(r"<[^>]+>")
+
+
+def minify_html(html) -> str:
+    """Collapse layout whitespace and drop comments; inline scripts and styles are minified too."""
+    parts = []
+    pos = 0
+    for m in _RAW_BLOCK.finditer(html):
+        parts.append(_minify_markup(html[pos:m.start()]))
+        open_tag, name, body, close_tag = m.group(1), m.group(2).lower(), m.group(3), m.group(4)
+        if name == "script" and "src=" not in open_tag and "json" not in open_tag:
+            body = minify_js(body).rstrip("\n")
+        elif name == "style":
+            body = minify_css(body)
+        parts.append(_minify_markup(open_tag) + body + close_tag)
+        pos = m.end()
+    parts.append(_minify_markup(html[pos:]))
+    return "".join(parts).strip() + "\n"
+
+
+def _minify_markup(text) -> str:
+    text = re.sub(r"<!--(?!\[if).*?-->", "", text, flags=re.S)
+    text = _TAG.sub(lambda m: re.sub(r"\s+", " ", m.group(0)), text)
+    # Whitespace containing a line break is layout; anything else may separate inline content
+    text = re.sub(r"\s*\n\s*", "\n", text)
+    text = re.sub(r">\n<", "><", text)
+    # Chunk edges border a <script>/<style>/... tag, so a line break there is between tags too
+    text = re.sub(r"^\n(?=<)|(?<=>)\n$", "", text)
+    if text == "\n":
+        return ""
+    text = re.sub(r"[ \t]+", " ", text)
+    return text.replace("\n", " ")
+
+
+def minify(name, content) -> str:
+    """Minify text content by file type; other files pass through."""
+    if name.endswith(".js"):
+        return minify_js(content)
+    if name.endswith(".css"):
+        return minify_css(content)
+    if name.endswith(".html"):
+        return minify_html(content)
+    return content
+
+
+def precompress(data) -> dict:
+    """{'.gz': bytes, '.br': bytes} for `data`; .br only when brotli is installed."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    # mtime=0 keeps the output byte-identical across builds
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    return variants
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the Python pipeline on synthetic catalogs.
+
+Catalogs of 1k, 10k and 100k models are generated from the real schema in
+scripts/openrouter_data.json, then each stage (process_data, the catalog
+index, the context and provider options, sharding, facets and the Jinja
+render) is measured for wall time, peak memory and output bytes.
+
+    python scripts/benchmark.py --save-baseline   # record data/benchmarks/baseline.json
+    python scripts/benchmark.py                   # compare against it, exit 1 on regression
+"""
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import pickle
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from build import (CAP_BITS, build_shards, compute_context_options, compute_provider_options, create_environment,
+                   normalize_catalog, render_dashboard)
+from catalog import ModelCatalog
+from facets import compute_facets
+from fetch import process_data
+
+# Paths
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+SAMPLE_FILE = BASE_DIR / "scripts" / "openrouter_data.json"
+TEMPLATES_DIR = BASE_DIR / "scripts" / "templates"
+BENCH_DIR = BASE_DIR / "data" / "benchmarks"
+BASELINE_FILE = BENCH_DIR / "baseline.json"
+LATEST_FILE = BENCH_DIR / "latest.json"
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_REPEAT = 3
+
+# Allowed growth over the baseline before a metric counts as a regression.
+# Timings are noisy, so they also need to move by an absolute amount.
+TOLERANCE = {"seconds": 0.25, "peak_bytes": 0.10, "output_bytes": 0.02}
+MIN_DELTA = {"seconds": 0.005, "peak_bytes": 256 * 1024, "output_bytes": 1024}
+
+CONTEXT_SIZES = (4096, 8192, 32768, 65536, 128000, 131072, 200000, 262144, 1000000, 1048576)
+
+
+def _scale_price(value, factor):
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return value
+    if price <= 0:
+        return value
+    return f"{price * factor:.10f}".rstrip("0")
+
+
+def make_catalog(size, seed=0) -> list[dict]:
+    """
+    `size` OpenRouter-shaped models derived from the sample catalog.
+
+    Each model copies a real one and varies its id, provider, prices,
+    context length and creation date. A few become embedding models so
+    every dashboard category is exercised.
+    """
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        seeds = json.load(f)['data']
+
+    rng = random.Random(seed)
+    # Provider count grows with the catalog, as it does on OpenRouter
+    providers = sorted({m['id'].split('/')[0] for m in seeds})
+    providers += [f"lab-{i}" for i in range(max(0, size // 50 - len(providers)))]
+    now = int(time.time())
+
+    models = []
+    for i in range(size):
+        src = rng.choice(seeds)
+        provider = rng.choice(providers)
+        slug = src['id'].split('/', 1)[-1].split(':')[0]
+        ctx = rng.choice(CONTEXT_SIZES)
+        factor = rng.uniform(0.25, 4.0)
+
+        m = dict(src)
+        m['id'] = f"{provider}/{slug}-{i}"
+        m['canonical_slug'] = m['id']
+        m['name'] = f"{src['name']} #{i}"
+        m['created'] = now - rng.randrange(2 * 365 * 24 * 3600)
+        m['context_length'] = ctx
+        m['pricing'] = {k: _scale_price(v, factor) for k, v in (src.get('pricing') or {}).items()}
+        m['architecture'] = dict(src.get('architecture') or {})
+        m['top_provider'] = dict(src.get('top_provider') or {}, context_length=ctx)
+        if rng.random() < 0.03:
+            m['id'] = f"{provider}/embed-{i}"
+            m['architecture']['modality'] = "text->embeddings"
+        models.append(m)
+    return models
+
+
+def _measure(fn, repeat):
+    """Best-of-`repeat` wall time, then one traced run for peak memory. Returns (result, seconds, peak)."""
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run_size(size, repeat=DEFAULT_REPEAT, seed=0) -> dict:
+    """Benchmark every stage on one synthetic catalog; returns {stage: metrics}."""
+    models = make_catalog(size, seed)
+    env = create_environment(TEMPLATES_DIR)
+    results = {}
+
+    def record(stage, fn, output_bytes):
+        result, seconds, peak = _measure(fn, repeat)
+        results[stage] = {
+            "seconds": round(seconds, 6),
+            "peak_bytes": peak,
+            "output_bytes": output_bytes(result),
+        }
+        return result
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        output_file = pathlib.Path(tmp) / "openrouter_data.json"
+
+        def process():
+            output_file.unlink(missing_ok=True)
+            return process_data(models, output_file=output_file)
+
+        data = record("process_data", process, lambda _: output_file.stat().st_size)
+        context_options = record("compute_context_options", lambda: compute_context_options(data.get("text", [])),
+                                 lambda r: len(json.dumps(r)))
+        catalog = record("catalog_index", lambda: ModelCatalog.from_grouped(data),
+                         lambda r: len(pickle.dumps(r.models, protocol=pickle.HIGHEST_PROTOCOL)))
+        provider_options = record("compute_provider_options", lambda: compute_provider_options(catalog),
+                                  lambda r: len(json.dumps(r)))
+        files, shard_index = record("build_shards", lambda: build_shards(data, {}),
+                                    lambda r: sum(len(c.encode('utf-8')) for c in r[0].values()))
+        records = normalize_catalog(data)
+        facets = record("compute_facets", lambda: compute_facets(records, CAP_BITS), lambda r: len(json.dumps(r)))
+        record("render", lambda: render_dashboard(env, shard_index, facets, context_options, provider_options, "bench"),
+               lambda html: len(html.encode('utf-8')))
+    return results
+
+
+def compare(current, baseline, tolerance=TOLERANCE, min_delta=MIN_DELTA) -> list[str]:
+    """Regressions of `current` against `baseline`, as printable lines; metrics without a tolerance are ignored."""
+    regressions = []
+    for size, stages in current["results"].items():
+        for stage, metrics in stages.items():
+            base = baseline.get("results", {}).get(size, {}).get(stage)
+            if not base:
+                continue
+            for metric, value in metrics.items():
+                old = base.get(metric)
+                if not old or metric not in tolerance:
+                    continue
+                if value - old > min_delta[metric] and value > old * (1 + tolerance[metric]):
+                    regressions.append(f"{size:>7} {stage:<26} {metric:<13} {old} -> {value} (+{(value / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _format_bytes(n) -> str:
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}GB"
+
+
+def print_results(report):
+    print(f"{'size':>7} {'stage':<26} {'time':>10} {'peak mem':>10} {'output':>10}")
+    for size, stages in report["results"].items():
+        for stage, m in stages.items():
+            print(f"{size:>7} {stage:<26} {m['seconds'] * 1000:>8.1f}ms "
+                  f"{_format_bytes(m['peak_bytes']):>10} {_format_bytes(m['output_bytes']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline stages on synthetic catalogs')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Catalog sizes to generate (default: 1000 10000 100000)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per stage; the best is kept')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic catalogs')
+    parser.add_argument('--baseline', type=pathlib.Path, default=BASELINE_FILE, help='Baseline file to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    args = parser.parse_args()
+
+    report = {"generated_at": int(time.time()), "seed": args.seed, "results": {}}
+    for size in args.sizes:
+        print(f"⏱️  Benchmarking {size} models...")
+        report["results"][str(size)] = run_size(size, repeat=args.repeat, seed=args.seed)
+
+    print_results(report)
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    LATEST_FILE.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"💾 Saved baseline to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+    regressions = compare(report, json.loads(args.baseline.read_text(encoding='utf-8')))
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,70 @@
 #!/usr/bin/env python3
 """
 Generates the main dashboard (index.html) from openrouter_data.json.
+
+The HTML is a small shell; model data ships as per-category shards under
+docs/data/ that the page fetches on demand, and the page's scripts are
+copied from scripts/static/. Returning visitors keep the shards in
+IndexedDB and catch up through the delta patches in docs/data/patches/
+(see patches.py).
 """
+import hashlib
 import json
 import pathlib
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import sys
+from collections import Counter
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from assets import COMPRESSIBLE, hashed_name, minify, minify_html, precompress
+from catalog import load_catalog
+from facets import compute_facets, quantiles_from_counts
+from get_openrouter_data import API_BASE
+import metrics
+from pages import generate_pages
+from patches import PATCHED_PARTS, build_patches
+
+try:
+    from costs import STANDARD_PROFILES, cost_table
+except ImportError:  # NumPy is optional; without it the page has no workload-cost sort
+    cost_table = None
+from search_index import build_search_index
+from skyline import skyline
+from manifest import hash_inputs, load_manifest, record_stage, save_manifest, stage_is_current, write_if_changed
+
+# Prefetched endpoints older than this (seconds) are refreshed live in the browser
+ENDPOINTS_MAX_AGE = 24 * 60 * 60
+# Live endpoint responses are reused for this long (seconds), in the page and in the service worker
+ENDPOINTS_LIVE_TTL = 10 * 60
+
+# Categories that have a dashboard tab
+DASHBOARD_CATEGORIES = ("text", "image", "embedding")
+
+# Dashboard scripts copied from scripts/static/ (embedded as window.DASHBOARD_ASSETS);
+# release builds publish them under content-hashed names
+DASHBOARD_ASSETS = {"app": "app.js", "query": "query.js", "worker": "worker.js", "sw": "sw.js"}
+# The service worker keeps its name in every build (browsers look for updates at a fixed URL);
+# build_service_worker() prepends the asset manifest, which is also published on its own
+SERVICE_WORKER = "sw.js"
+ASSET_MANIFEST = "asset-manifest.json"
+
+# Persistent Jinja bytecode cache
+JINJA_CACHE_DIR = pathlib.Path(__file__).resolve().parent.parent / "data" / ".cache" / "jinja"
+
+# Capability bits shared with the dashboard (embedded as window.CAP_BITS)
+CAP_BITS = {
+    "hasReasoning": 1 << 0,
+    "hasVision": 1 << 1,
+    "hasAudio": 1 << 2,
+    "hasVideo": 1 << 3,
+    "hasTools": 1 << 4,
+    "hasJSON": 1 << 5,
+    "hasCache": 1 << 6,
+    "hasLogprobs": 1 << 7,
+    "isFree": 1 << 8,
+    "isPaid": 1 << 9,
+    "isPareto": 1 << 10,  # on its category's price/context/throughput/latency frontier (skyline.py)
+}
 
 
 def _round_to_1024(value: int) -> int:
@@ -20,124 +80,455 @@ def _format_context_label(value: int) -> str:
     return f"{k}k+"
 
 
-def _percentile(sorted_vals, pct: int) -> int:
-    if not sorted_vals:
-        return 0
-    n = len(sorted_vals)
-    idx = int(round((pct / 100) * (n - 1)))
-    return sorted_vals[max(0, min(idx, n - 1))]
-
-
 def compute_context_options(models) -> list[dict]:
-    contexts = []
-    for m in models:
-        ctx = m.get("context_length")
-        if ctx:
-            contexts.append(int(ctx))
+    contexts = Counter(int(m["context_length"]) for m in models if m.get("context_length"))
 
     if not contexts:
         return [{"value": 0, "label": "Any"}]
 
-    contexts.sort()
-    unique = sorted(set(contexts))
-    if len(unique) <= 10:
-        values = unique
+    if len(contexts) <= 10:
+        values = sorted(contexts)
     else:
-        candidates = [
-            _percentile(contexts, 10),
-            _percentile(contexts, 25),
-            _percentile(contexts, 50),
-            _percentile(contexts, 75),
-            _percentile(contexts, 90),
-            _percentile(contexts, 95),
-            contexts[-1],
-        ]
+        candidates = quantiles_from_counts(contexts, (10, 25, 50, 75, 90, 95, 100)).values()
         values = sorted(set(_round_to_1024(v) for v in candidates if v > 0))
 
     options = [{"value": 0, "label": "Any"}]
     options.extend({"value": v, "label": _format_context_label(v)} for v in values)
     return options
 
-def compute_provider_options(data) -> list[str]:
-    providers = set()
-    for cat in data.values():
-        for m in cat:
-            model_id = m.get("id", "")
-            if "/" in model_id:
-                provider = model_id.split("/")[0]
-                providers.add(provider)
-    
-    # Sort by number of models per provider to show most important ones first
-    provider_counts = {}
-    for cat in data.values():
-        for m in cat:
-            model_id = m.get("id", "")
-            if "/" in model_id:
-                provider = model_id.split("/")[0]
-                provider_counts[provider] = provider_counts.get(provider, 0) + 1
-    
-    sorted_providers = sorted(providers, key=lambda p: provider_counts.get(p, 0), reverse=True)
-    return sorted_providers
+def compute_provider_options(catalog) -> list[str]:
+    # Provider index of the ModelCatalog; most models first
+    ranked = sorted(catalog.by_provider.items(), key=lambda item: len(item[1]), reverse=True)
+    return [p for p, _ in ranked if p]
+
+def load_provider_endpoints(endpoints_file, catalog) -> dict:
+    """Prefetched endpoints for models still in the catalog, keyed by model id."""
+    if not endpoints_file.exists():
+        return {}
+    with open(endpoints_file, 'r', encoding='utf-8') as f:
+        prefetched = json.load(f).get("models", {})
+    return {mid: entry for mid, entry in prefetched.items() if mid in catalog}
+
+def load_model_stats(stats_file, catalog) -> dict:
+    """Merged throughput/latency figures (see merge_stats.py) for models still in the catalog."""
+    if not stats_file.exists():
+        return {}
+    with open(stats_file, 'r', encoding='utf-8') as f:
+        merged = json.load(f).get("models", {})
+    return {mid: entry for mid, entry in merged.items() if mid in catalog}
+
+def compute_workload_costs(models) -> tuple[list, dict]:
+    """
+    (profiles, {model id: [daily USD per profile]}) for the standard workloads in costs.py.
+
+    Empty when NumPy is not installed. Costs a model can't serve (no image
+    input for an image workload, router pseudo-models) are None.
+    """
+    if cost_table is None or not models:
+        return [], {}
+    ids, table = cost_table(models, STANDARD_PROFILES)
+    profiles = [
+        {"name": name, "summary": f"{p['requests_per_day']:,} req/day, {p['input_tokens']:,} in "
+                                  f"({p['cache_hit']:.0%} cached) / {p['output_tokens']:,} out"
+                                  + (f" / {p['reasoning_tokens']:,} reasoning" if p['reasoning_tokens'] else "")
+                                  + (f" / {p['images']} images" if p['images'] else "")}
+        for name, p in STANDARD_PROFILES.items()
+    ]
+    costs = {
+        mid: [None if c != c else round(float(c), 4) for c in row]  # NaN -> None
+        for mid, row in zip(ids, table.tolist())
+    }
+    return profiles, costs
+
+def _dump(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
 
-def generate_dashboard():
+def _to_float(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def _per_million(value) -> float:
+    # Round away float noise like 2.9999999999999997 from per-token strings
+    return round(_to_float(value) * 1_000_000, 6)
+
+def capability_bits(m, price) -> int:
+    """Bitmask of CAP_BITS flags derived from supported_parameters and architecture."""
+    params = set(m.get("supported_parameters") or [])
+    inputs = set((m.get("architecture") or {}).get("input_modalities") or [])
+    cache = _to_float((m.get("pricing") or {}).get("input_cache_read"))
+    flags = {
+        "hasReasoning": "reasoning" in params or "reasoning" in m.get("id", ""),
+        "hasVision": "image" in inputs,
+        "hasAudio": "audio" in inputs,
+        "hasVideo": "video" in inputs,
+        "hasTools": "tools" in params,
+        "hasJSON": "structured_outputs" in params,
+        "hasCache": cache > 0,
+        "hasLogprobs": "logprobs" in params,
+        # Router pseudo-models report negative prices and are neither free nor paid
+        "isFree": price == 0,
+        "isPaid": price > 0,
+    }
+    return sum(bit for name, bit in CAP_BITS.items() if flags.get(name))
+
+def normalize_model(m, category, stats=None, cost=None) -> dict:
+    """
+    Flat per-model row with every number the table sorts and filters on.
+
+    Prices are USD per 1M tokens (per image for the image tab); `price` is
+    the tab's primary sort price and `key` the lowercased search key.
+    Descriptions and endpoints ship as separate chunks. Models with merged
+    stats also get `tps` (best provider throughput, tokens/s) and `lat`
+    (lowest provider latency, ms) plus `perf`, their rolling 1d/7d/30d
+    percentiles (sketches.py), and text models `cost`, the daily cost of
+    each standard workload profile.
+    """
+    pricing = m.get("pricing") or {}
+    p_in = _per_million(pricing.get("prompt"))
+    p_out = _per_million(pricing.get("completion"))
+    if category == "image":
+        price = _to_float(pricing.get("image")) or _to_float(pricing.get("request"))
+        free_price = price
+    elif category == "embedding":
+        price = free_price = p_in
+    else:
+        price = round((p_in + p_out) / 2, 6)
+        free_price = p_in
+    model_id = m.get("id", "")
+    name = m.get("name") or model_id
+    row = {
+        "id": model_id,
+        "name": name,
+        "provider": model_id.split("/")[0] if "/" in model_id else "",
+        "created": m.get("created") or 0,
+        "ctx": int(m.get("context_length") or 0),
+        "pin": p_in,
+        "pout": p_out,
+        "price": price,
+        "pcache": _per_million(pricing["input_cache_read"]) if pricing.get("input_cache_read") else None,
+        "caps": capability_bits(m, free_price),
+        "key": f"{name} {model_id}".lower(),
+    }
+    if stats:
+        row["tps"] = stats.get("best_tps")
+        row["lat"] = stats.get("min_latency_ms")
+        if stats.get("windows"):
+            # The dashboard shows throughput and p50 latency only
+            row["perf"] = {window: {k: p[k] for k in ("tps", "lat", "n") if k in p}
+                           for window, p in stats["windows"].items()}
+    if cost:
+        row["cost"] = cost
+    return row
+
+def normalize_catalog(data, stats=None, costs=None) -> dict:
+    """
+    Normalized rows for every dashboard category, shared by the shards and the facets.
+
+    Rows on their category's Pareto frontier get the isPareto capability bit.
+    """
+    stats = stats or {}
+    costs = costs or {}
+    records = {
+        cat: [normalize_model(m, cat, stats.get(m.get("id")), costs.get(m.get("id")) if cat == "text" else None)
+              for m in data.get(cat, [])]
+        for cat in DASHBOARD_CATEGORIES
+    }
+    for rows in records.values():
+        for i in skyline(rows):
+            rows[i]["caps"] |= CAP_BITS["isPareto"]
+    return records
+
+def build_shards(data, endpoints, records=None) -> tuple[dict, dict]:
+    """
+    Split the catalog into per-category chunks.
+
+    `records` are the rows from normalize_catalog(), computed here if not
+    given. Returns (files, index): files maps a path relative to docs/ to
+    its JSON text; index maps each category to the URLs of its models,
+    descriptions, endpoints and search-index chunks, for embedding in the page.
+    """
+    records = records or normalize_catalog(data)
+    files, index = {}, {}
+    for cat in DASHBOARD_CATEGORIES:
+        models = data.get(cat, [])
+        parts = {
+            "models": records[cat],
+            "descriptions": {m["id"]: m["description"] for m in models if m.get("description")},
+            "endpoints": {m["id"]: endpoints[m["id"]] for m in models if m["id"] in endpoints},
+            "search": build_search_index(models),
+        }
+        index[cat] = {"count": len(models)}
+        for part, payload in parts.items():
+            path = f"data/{cat}.json" if part == "models" else f"data/{cat}.{part}.json"
+            files[path] = _dump(payload)
+            index[cat][part] = path
+    return files, index
+
+def hash_shard_names(files, index) -> tuple[dict, dict]:
+    """Rename every shard to a content-hashed path so browsers can cache it indefinitely."""
+    renamed = {path: hashed_name(path, content) for path, content in files.items()}
+    files = {renamed[path]: content for path, content in files.items()}
+    index = {
+        cat: {part: renamed.get(value, value) if isinstance(value, str) else value for part, value in parts.items()}
+        for cat, parts in index.items()
+    }
+    return files, index
+
+def remove_stale(root_dir, docs_dir, outputs, previous) -> bool:
+    """
+    Delete files an earlier build wrote that this one did not.
+
+    `previous` holds the last build's outputs (repo-relative, from the
+    manifest); anything else under docs/data/ is also ours to remove.
+    Returns True if a file was deleted.
+    """
+    keep = {pathlib.Path(p).resolve() for p in outputs}
+    candidates = {root_dir / rel for rel in previous}
+    shard_dir = docs_dir / "data"
+    if shard_dir.exists():
+        candidates.update(p for p in shard_dir.iterdir() if p.is_file())
+    removed = False
+    for path in candidates:
+        if path.resolve() not in keep and path.exists():
+            path.unlink()
+            removed = True
+    return removed
+
+def build_service_worker(source, files, html, lazy=None) -> tuple[str, str]:
+    """
+    (sw.js, asset-manifest.json) for a build.
+
+    `files` maps each published path relative to docs/ (assets and shards)
+    to its content, and is precached on install; `lazy` (same shape) holds
+    the shards the page keeps up to date through patches, which the worker
+    only fetches on demand. The version hashes all of them together with
+    the page, so any change to the build yields a new worker to install.
+    """
+    lazy = lazy or {}
+    digest = hashlib.sha256()
+    for path in sorted({**files, **lazy}):
+        content = files[path] if path in files else lazy[path]
+        digest.update(path.encode("utf-8") + b"\0")
+        digest.update(content.encode("utf-8") if isinstance(content, str) else content)
+    digest.update(html.encode("utf-8"))
+    manifest = {
+        "version": digest.hexdigest()[:16],
+        "files": sorted(files),
+        "lazy": sorted(lazy),
+        "apiBase": API_BASE,
+        "endpointsTtl": ENDPOINTS_LIVE_TTL,
+    }
+    return f"self.ASSET_MANIFEST = {_dump(manifest)};\n{source}", json.dumps(manifest, indent=2)
+
+def create_environment(templates_dir):
+    # Compiled templates persist across runs, so repeated builds skip Jinja's parse/compile step
+    JINJA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(templates_dir),
+        bytecode_cache=FileSystemBytecodeCache(str(JINJA_CACHE_DIR)),
+        autoescape=select_autoescape(['html', 'xml']),
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+
+def render_dashboard(env, shard_index, facets, context_options, provider_options, generated_at,
+                     assets=DASHBOARD_ASSETS, has_stats=False, cost_profiles=(), data_patches=None) -> str:
+    """Render index.html; the model data itself lives in the shards."""
+    template = env.get_template('dashboard.html')
+    return template.render(
+        shard_index=_dump(shard_index),
+        cap_bits=_dump(CAP_BITS),
+        facets=_dump(facets),
+        assets=assets,
+        endpoints_max_age=ENDPOINTS_MAX_AGE,
+        endpoints_live_ttl=ENDPOINTS_LIVE_TTL,
+        generated_at=generated_at,
+        context_options=context_options,
+        provider_options=provider_options,
+        has_stats=has_stats,
+        api_base=API_BASE,
+        cost_profiles=list(cost_profiles),
+        data_patches=_dump(data_patches),
+    )
+
+def generate_dashboard(force=False, release=False, env=None, jobs=None):
+    """
+    Build docs/. A release build also minifies the HTML/JS/CSS, gives assets
+    and shards content-hashed names and writes .gz/.br siblings.
+
+    Per-model and per-provider pages (pages.py) are rendered alongside,
+    only where their content changed, over `jobs` processes.
+
+    A long-running caller (watch.py) passes its Jinja `env` to keep compiled
+    templates in memory between builds. Returns True if any output changed.
+    """
     # Paths
     base_dir = pathlib.Path(__file__).resolve().parent
     root_dir = base_dir.parent
     
     templates_dir = base_dir / "templates"
     data_file = root_dir / "data" / "openrouter_data.json"
+    endpoints_file = root_dir / "data" / "openrouter_endpoints.json"
+    stats_file = root_dir / "data" / "model_stats.json"
     output_file = root_dir / "docs" / "index.html"
+    docs_dir = output_file.parent
+    static_src = base_dir / "static"
     
     # Check data
     if not data_file.exists():
         print(f"❌ Data file not found: {data_file}")
-        return
+        return False
 
-    # Load Data
-    with open(data_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        
-    print(f"📊 Loaded data for dashboard generation")
+    # Skip the whole stage when data, template, static files and the build scripts are unchanged
+    static_files = [p for p in static_src.iterdir() if p.is_file()] if static_src.exists() else []
+    manifest = load_manifest()
+    helpers = [base_dir / "assets.py", base_dir / "catalog.py", base_dir / "costs.py", base_dir / "facets.py", base_dir / "search_index.py",
+               base_dir / "skyline.py", base_dir / "pages.py", base_dir / "patches.py"]
+    inputs = hash_inputs([data_file, endpoints_file, stats_file, __file__, *helpers, *templates_dir.iterdir(), *static_files])
+    inputs["release"] = release
+    inputs["api_base"] = API_BASE
+    inputs["workload_costs"] = cost_table is not None
+    if not force and stage_is_current(manifest, "build", inputs):
+        print(f"💤 Inputs unchanged, keeping {output_file}")
+        return False
+
+    # Load Data (from the catalog snapshot when fetch.py already parsed this file)
+    with metrics.stage("load"):
+        catalog = load_catalog(data_file)
+        data = catalog.grouped()
+    print(f"📊 Loaded {len(catalog)} models for dashboard generation")
+    metrics.count("models", {cat: len(models) for cat, models in data.items()})
 
     # Setup Jinja2
-    env = Environment(
-        loader=FileSystemLoader(templates_dir),
-        autoescape=select_autoescape(['html', 'xml']),
-        trim_blocks=True,
-        lstrip_blocks=True
-    )
+    env = env or create_environment(templates_dir)
     
     # Render
     import datetime
     now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
     
-    template = env.get_template('dashboard.html')
-    context_options = compute_context_options(data.get("text", []))
-    provider_options = compute_provider_options(data)
-    
-    html_content = template.render(
-        models_json=json.dumps(data, indent=2),
-        generated_at=now,
-        context_options=context_options,
-        provider_options=provider_options,
-    )
+    with metrics.stage("options"):
+        context_options = compute_context_options(data.get("text", []))
+        provider_options = compute_provider_options(catalog)
+    with metrics.stage("attach"):
+        endpoints = load_provider_endpoints(endpoints_file, catalog)
+        stats = load_model_stats(stats_file, catalog)
+        cost_profiles, costs = compute_workload_costs(data.get("text", []))
+    if endpoints:
+        print(f"🔌 Sharding prefetched endpoints for {len(endpoints)} models")
+    if stats:
+        print(f"🚀 Attaching throughput/latency stats for {len(stats)} models")
+    if costs:
+        print(f"💵 Precomputed {len(cost_profiles)} workload costs for {len(costs)} text models")
+    metrics.count("attached", {"endpoints": len(endpoints), "stats": len(stats), "costs": len(costs)})
+    with metrics.stage("normalize"):
+        records = normalize_catalog(data, stats, costs)
+    with metrics.stage("shards"):
+        shard_files, shard_index = build_shards(data, endpoints, records)
+    with metrics.stage("facets"):
+        facets = compute_facets(records, CAP_BITS)
+
+    # Static assets, minified and renamed by content in release builds
+    asset_files = {}
+    asset_urls = dict(DASHBOARD_ASSETS)
+    sw_source = None
+    with metrics.stage("assets"):
+        for item in static_files:
+            name, content = item.name, item.read_bytes()
+            if name == SERVICE_WORKER:
+                sw_source = content.decode('utf-8')
+                continue
+            if release:
+                content = minify(name, content.decode('utf-8')).encode('utf-8')
+                name = hashed_name(name, content)
+            asset_files[name] = content
+            asset_urls.update({key: name for key, src in DASHBOARD_ASSETS.items() if src == item.name})
+        if release:
+            shard_files, shard_index = hash_shard_names(shard_files, shard_index)
+    with metrics.stage("patches"):
+        patch_files, data_patches = build_patches(docs_dir, shard_files, shard_index)
+    metrics.count("patch_chain", len(data_patches["chain"]))
     
-    import shutil
+    with metrics.stage("render"):
+        html_content = render_dashboard(env, shard_index, facets, context_options, provider_options, now, asset_urls,
+                                        has_stats=bool(stats), cost_profiles=cost_profiles, data_patches=data_patches)
+        if release:
+            html_content = minify_html(html_content)
+
+    outputs = {output_file: html_content}
+    outputs.update((docs_dir / rel, content) for rel, content in shard_files.items())
+    outputs.update((docs_dir / rel, content) for rel, content in patch_files.items())
+    outputs.update((docs_dir / name, content) for name, content in asset_files.items())
+    if sw_source is not None:
+        patched = {index[part] for index in shard_index.values() for part in PATCHED_PARTS if index.get(part)}
+        precached = {rel: content for rel, content in shard_files.items() if rel not in patched}
+        lazy = {rel: content for rel, content in shard_files.items() if rel in patched}
+        sw_js, asset_manifest = build_service_worker(sw_source, {**precached, **asset_files}, html_content, lazy)
+        outputs[docs_dir / SERVICE_WORKER] = minify(SERVICE_WORKER, sw_js) if release else sw_js
+        outputs[docs_dir / ASSET_MANIFEST] = asset_manifest
+    if release:
+        raw_bytes = gz_bytes = 0
+        with metrics.stage("compress"):
+            for path, content in list(outputs.items()):
+                if path.suffix not in COMPRESSIBLE:
+                    continue
+                variants = precompress(content)
+                raw_bytes += len(content.encode('utf-8') if isinstance(content, str) else content)
+                gz_bytes += len(variants[".gz"])
+                outputs.update((path.with_name(path.name + ext), data) for ext, data in variants.items())
     
-    # Save index.html
-    output_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-        
-    # Copy static assets
-    static_src = base_dir / "static"
-    if static_src.exists():
-        for item in static_src.iterdir():
-            if item.is_file():
-                shutil.copy2(item, output_file.parent / item.name)
-        print(f"📦 Copied static assets to {output_file.parent}")
-        
-    print(f"✅ Generated Dashboard at {output_file}")
+    # Detail pages first, so the dashboard's links to them never dangle
+    with metrics.stage("pages"):
+        page_hashes, page_stats = generate_pages(docs_dir, templates_dir, data, records, CAP_BITS,
+                                                 manifest.get("pages", {}), endpoints, cost_profiles,
+                                                 release=release, jobs=jobs, env=env)
+    manifest["pages"] = page_hashes
+    metrics.count("pages", page_stats)
+    print(f"📄 Detail pages: {page_stats['rendered']} rendered, {page_stats['unchanged']} unchanged, "
+          f"{page_stats['removed']} removed")
+
+    # Save shards and static assets, then index.html: every file is swapped in atomically, and
+    # the page that references new (hashed) names only appears once they all exist
+    written = False
+    with metrics.stage("write"):
+        for path in sorted(outputs, key=lambda p: p == output_file):
+            written |= write_if_changed(path, outputs[path])
+        previous = manifest.get("build", {}).get("outputs", {})
+        written |= remove_stale(root_dir, docs_dir, outputs, previous)
+    written |= bool(page_stats['rendered'] or page_stats['removed'])
+    for path, content in outputs.items():
+        metrics.output(path, len(content.encode('utf-8') if isinstance(content, str) else content))
+    print(f"🧩 Wrote {len(shard_files)} data shards to {docs_dir / 'data'}")
+    chain = data_patches["chain"]
+    print(f"🩹 Data version {data_patches['version']}, {len(chain)} patch{'es' if len(chain) != 1 else ''} "
+          f"for returning visitors" + (f" (latest {len(patch_files[chain[-1][1]]) / 1024:.1f} KB)" if chain else ""))
+    if static_files:
+        print(f"📦 Synced static assets to {docs_dir}")
+    if release:
+        print(f"🗜️  Release build: {raw_bytes / 1024:.0f} KB minified, {gz_bytes / 1024:.0f} KB gzipped")
+
+    record_stage(manifest, "build", inputs, list(outputs))
+    save_manifest(manifest)
+    print(f"✅ Generated Dashboard at {output_file}" if written else f"💤 Dashboard unchanged: {output_file}")
+    return written
 
 if __name__ == "__main__":
-    generate_dashboard()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Build the dashboard from data/openrouter_data.json')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if no input changed')
+    parser.add_argument('--release', action='store_true',
+                        help='Minify, content-hash and precompress the output for deployment')
+    parser.add_argument('-j', '--jobs', type=int, help='Processes for rendering detail pages (default: one per core)')
+    metrics.add_profile_argument(parser)
+    args = parser.parse_args()
+
+    metrics.start_run("build", profile=args.profile)
+    status = "error"
+    try:
+        generate_dashboard(force=args.force, release=args.release, jobs=args.jobs)
+        status = "ok"
+    finally:
+        metrics.finish_run(status)
@@ -0,0 +1,212 @@
+"""
+Typed, indexed view of the processed catalog (data/openrouter_data.json).
+
+Every script used to reload the grouped JSON and re-derive the same
+things from raw dicts: the provider from the id, numeric prices, whether
+a model is free, the flat list across categories. ModelCatalog does that
+once. Each model becomes a compact Model record (``__slots__``, prices
+parsed to floats) that keeps the raw dict in ``raw`` for code that needs
+the full payload, and lookups by id, provider, category, input modality
+and supported parameter are built at load time.
+
+load_catalog() keeps a pickle snapshot in data/.cache/catalog/ keyed by
+the JSON file's content hash, so every stage after the first skips JSON
+parsing. fetch.py writes the snapshot as soon as it saves the catalog.
+"""
+import contextlib
+import gc
+import hashlib
+import json
+import os
+import pathlib
+import pickle
+import tempfile
+
+# Paths
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+DATA_FILE = BASE_DIR / "data" / "openrouter_data.json"
+SNAPSHOT_DIR = BASE_DIR / "data" / ".cache" / "catalog"
+
+# Bump when Model's fields change; old snapshots are then ignored
+SNAPSHOT_VERSION = 1
+
+# (content hash, ModelCatalog) last saved or loaded by this process; in a
+# long-running watch.py the build reuses the catalog fetch.py just made
+_recent = (None, None)
+
+
+def _price(value):
+    """Per-token price as a float, or None when missing or unparseable."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Model:
+    """One catalog model. Prices are USD per token (per image/request for those fields)."""
+
+    __slots__ = ("id", "name", "provider", "category", "created", "context_length",
+                 "prompt", "completion", "image", "request", "cache_read",
+                 "inputs", "outputs", "params", "raw")
+
+    def __init__(self, raw, category):
+        pricing = raw.get("pricing") or {}
+        arch = raw.get("architecture") or {}
+        self.id = raw.get("id") or ""
+        self.name = raw.get("name") or self.id
+        self.provider = self.id.split("/")[0] if "/" in self.id else ""
+        self.category = category
+        self.created = raw.get("created") or 0
+        self.context_length = int(raw.get("context_length") or 0)
+        self.prompt = _price(pricing.get("prompt"))
+        self.completion = _price(pricing.get("completion"))
+        self.image = _price(pricing.get("image"))
+        self.request = _price(pricing.get("request"))
+        self.cache_read = _price(pricing.get("input_cache_read"))
+        self.inputs = frozenset(arch.get("input_modalities") or ())
+        self.outputs = frozenset(arch.get("output_modalities") or ())
+        self.params = frozenset(raw.get("supported_parameters") or ())
+        self.raw = raw
+
+    @property
+    def is_free(self) -> bool:
+        """Both token prices are zero; a missing price counts as zero."""
+        return not self.prompt and not self.completion
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return f"Model({self.id!r}, {self.category!r})"
+
+
+class ModelCatalog:
+    """
+    All models of a grouped catalog, with lookup indexes.
+
+    by_id        {id: Model}
+    by_category  {category: [Model]}, in file order
+    by_provider  {provider: [Model]}
+    by_modality  {input modality: [Model]}
+    by_param     {supported parameter: [Model]}, e.g. by_param["tools"]
+    """
+
+    def __init__(self, models):
+        self.models = list(models)
+        self.by_id = {}
+        self.by_category = {}
+        self.by_provider = {}
+        self.by_modality = {}
+        self.by_param = {}
+        for m in self.models:
+            self.by_id[m.id] = m
+            self.by_category.setdefault(m.category, []).append(m)
+            self.by_provider.setdefault(m.provider, []).append(m)
+            for modality in m.inputs:
+                self.by_modality.setdefault(modality, []).append(m)
+            for param in m.params:
+                self.by_param.setdefault(param, []).append(m)
+
+    @classmethod
+    def from_grouped(cls, data) -> "ModelCatalog":
+        """From the {category: [model dict]} structure fetch.py writes."""
+        return cls(Model(raw, cat) for cat, models in data.items() if isinstance(models, list) for raw in models)
+
+    def __len__(self):
+        return len(self.models)
+
+    def __iter__(self):
+        return iter(self.models)
+
+    def __contains__(self, model_id):
+        return model_id in self.by_id
+
+    def get(self, model_id):
+        return self.by_id.get(model_id)
+
+    def category(self, name) -> list[dict]:
+        """Raw model dicts of one category, in file order."""
+        return [m.raw for m in self.by_category.get(name, ())]
+
+    def grouped(self) -> dict:
+        """The {category: [model dict]} structure the catalog was built from."""
+        return {cat: [m.raw for m in models] for cat, models in self.by_category.items()}
+
+    def raw_models(self) -> list[dict]:
+        """Every raw model dict, flattened across categories."""
+        return [m.raw for m in self.models]
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    # Loading allocates millions of small containers and none of them are garbage;
+    # the cyclic collector would otherwise rescan them all repeatedly.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def snapshot_path(content_hash, snapshot_dir=SNAPSHOT_DIR) -> pathlib.Path:
+    return snapshot_dir / f"v{SNAPSHOT_VERSION}-{content_hash[:24]}.pickle"
+
+
+def save_snapshot(catalog, content_hash, snapshot_dir=SNAPSHOT_DIR):
+    """Pickle `catalog`'s records under `content_hash`, replacing older snapshots."""
+    global _recent
+    _recent = (content_hash, catalog)
+    path = snapshot_path(content_hash, snapshot_dir)
+    if path.exists():  # keyed by content, so an existing snapshot is already current
+        return
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=snapshot_dir, prefix=".catalog.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(catalog.models, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    for old in snapshot_dir.glob("*.pickle"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def load_catalog(data_file=DATA_FILE, snapshot_dir=SNAPSHOT_DIR) -> ModelCatalog:
+    """
+    The catalog in `data_file`, from its snapshot when one matches the file's bytes.
+
+    A missing or unreadable snapshot is rebuilt from the JSON and saved.
+    Records are shared with earlier calls for the same bytes; treat them
+    as read-only.
+    """
+    global _recent
+    with open(data_file, 'rb') as f:
+        content = f.read()
+    content_hash = hashlib.sha256(content).hexdigest()
+    if _recent[0] == content_hash:
+        return _recent[1]
+    path = snapshot_path(content_hash, snapshot_dir)
+    with _gc_paused():
+        try:
+            with open(path, 'rb') as f:
+                _recent = (content_hash, ModelCatalog(pickle.load(f)))
+                return _recent[1]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            pass
+        catalog = ModelCatalog.from_grouped(json.loads(content))
+    try:
+        save_snapshot(catalog, content_hash, snapshot_dir)
+    except OSError:
+        pass  # a read-only checkout still works, just without the cache
+    return catalog
@@ -0,0 +1,84 @@
+"""
+Declarative model classification for the dashboard categories.
+
+CATEGORY_RULES is an ordered table of (category, field, test, values)
+rows; the first row that matches a model decides its category. The table
+is compiled once into predicates over a few fields extracted per model
+(lowercased id, input modalities, output modality), so classifying a
+model parses its modality string once and runs no repeated .lower() calls.
+
+To support a new modality, add rows here; process_data() in fetch.py
+groups by whatever categories the table names.
+"""
+import re
+
+# Fields a rule can test:
+#   id      lowercased model id
+#   inputs  set of input modalities, e.g. {"text", "image"} for "text+image->text"
+#   output  output side of the modality string, e.g. "text+image"
+# Tests: "contains" (substring of id), "is" (output equals one of), "has" (inputs include one of)
+CATEGORY_RULES = (
+    ("embedding", "id", "contains", ("embed",)),
+    ("embedding", "output", "is", ("embedding", "embeddings")),
+    # Anything that answers in text is an LLM, even with image or video input
+    ("text", "output", "is", ("text",)),
+    ("image", "output", "is", ("image", "text+image")),
+    ("audio", "output", "is", ("audio", "text+audio")),
+    ("video", "output", "is", ("video",)),
+    ("video", "inputs", "has", ("video",)),
+    # No usable modality: fall back to well-known model families
+    ("text", "id", "contains", ("gpt", "claude", "llama")),
+)
+
+# Catch-all for models no rule matches
+DEFAULT_CATEGORY = "other"
+
+
+def categories(rules=CATEGORY_RULES) -> list[str]:
+    """All category names in table order, plus the catch-all."""
+    names = list(dict.fromkeys(rule[0] for rule in rules))
+    if DEFAULT_CATEGORY not in names:
+        names.append(DEFAULT_CATEGORY)
+    return names
+
+
+def _compile_rule(field, test, values):
+    if test == "contains":
+        if field != "id":
+            raise ValueError(f"'contains' only applies to the id, not {field!r}")
+        pattern = re.compile("|".join(re.escape(v) for v in values))
+        return lambda f: pattern.search(f["id"]) is not None
+    if test == "is":
+        wanted = frozenset(values)
+        return lambda f: f[field] in wanted
+    if test == "has":
+        wanted = frozenset(values)
+        return lambda f: not wanted.isdisjoint(f[field])
+    raise ValueError(f"Unknown rule test: {test!r}")
+
+
+def _fields(model) -> dict:
+    modality = (model.get('architecture') or {}).get('modality') or ''
+    inputs, arrow, output = modality.partition('->')
+    return {
+        "id": model['id'].lower(),
+        "inputs": inputs.split('+') if arrow else (),
+        "output": output,
+    }
+
+
+def compile_rules(rules=CATEGORY_RULES):
+    """Compile a rule table into a classify(model) -> category function."""
+    compiled = [(category, _compile_rule(field, test, values)) for category, field, test, values in rules]
+
+    def classify(model) -> str:
+        fields = _fields(model)
+        for category, matches in compiled:
+            if matches(fields):
+                return category
+        return DEFAULT_CATEGORY
+
+    return classify
+
+
+classify = compile_rules()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Workload cost calculator over the whole catalog.
+
+Every model's pricing fields are converted into one (models x fields)
+NumPy matrix once; each workload profile becomes a vector of daily
+quantities over the same fields, so any number of profiles is priced
+against all models with a single matrix product.
+
+    python scripts/costs.py                                   # standard profiles, top 10 each
+    python scripts/costs.py --profile rag --top 25 --monthly
+    python scripts/costs.py --input 3000 --output 500 --cache-hit 0.6 --requests-per-day 20000
+"""
+import argparse
+import json
+import pathlib
+import sys
+
+import numpy as np
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from catalog import load_catalog
+
+# Paths
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+DATA_FILE = BASE_DIR / "data" / "openrouter_data.json"
+
+# Matrix columns, in order. Prices are USD per token except request (per call) and image (per image).
+PRICE_FIELDS = ("prompt", "completion", "input_cache_read", "internal_reasoning", "request", "image")
+
+# Per-request token counts, image counts and daily volume
+STANDARD_PROFILES = {
+    "chat": {"input_tokens": 1_500, "output_tokens": 400, "cache_hit": 0.3, "reasoning_tokens": 0,
+             "images": 0, "requests_per_day": 10_000},
+    "rag": {"input_tokens": 12_000, "output_tokens": 600, "cache_hit": 0.7, "reasoning_tokens": 0,
+            "images": 0, "requests_per_day": 5_000},
+    "agent": {"input_tokens": 30_000, "output_tokens": 1_500, "cache_hit": 0.8, "reasoning_tokens": 4_000,
+              "images": 0, "requests_per_day": 2_000},
+    "summarize": {"input_tokens": 8_000, "output_tokens": 1_000, "cache_hit": 0.0, "reasoning_tokens": 0,
+                  "images": 0, "requests_per_day": 20_000},
+    "vision": {"input_tokens": 1_000, "output_tokens": 300, "cache_hit": 0.0, "reasoning_tokens": 0,
+               "images": 2, "requests_per_day": 5_000},
+}
+
+
+def _price(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def price_matrix(models):
+    """
+    (ids, prices, vision) for a list of catalog models.
+
+    prices is float64 (models x PRICE_FIELDS). A missing cache-read price
+    falls back to the prompt price, and a missing or zero reasoning price
+    to the completion price, as OpenRouter bills them. Models with negative
+    prices (router pseudo-models) are all-NaN. vision marks models that
+    accept image input.
+    """
+    ids = [m.get("id", "") for m in models]
+    raw = np.array([[_price((m.get("pricing") or {}).get(f)) for f in PRICE_FIELDS] for m in models],
+                   dtype=np.float64).reshape(len(models), len(PRICE_FIELDS))
+    prompt, completion, cache_read, reasoning = raw[:, 0], raw[:, 1], raw[:, 2], raw[:, 3]
+    raw[:, 2] = np.where(np.isnan(cache_read), prompt, cache_read)
+    raw[:, 3] = np.where(np.isnan(reasoning) | (reasoning == 0), completion, reasoning)
+    raw[:, 4:] = np.nan_to_num(raw[:, 4:], nan=0.0)
+    raw[(raw[:, :2] < 0).any(axis=1) | np.isnan(raw[:, :2]).any(axis=1)] = np.nan
+    vision = np.array([
+        "image" in ((m.get("architecture") or {}).get("input_modalities") or []) for m in models
+    ], dtype=bool)
+    return ids, raw, vision
+
+
+def workload_matrix(profiles):
+    """(profiles x PRICE_FIELDS) daily quantities for {name: profile}; rows follow dict order."""
+    rows = []
+    for p in profiles.values():
+        rpd = p.get("requests_per_day", 1)
+        cached = p.get("input_tokens", 0) * p.get("cache_hit", 0.0)
+        rows.append([
+            (p.get("input_tokens", 0) - cached) * rpd,
+            p.get("output_tokens", 0) * rpd,
+            cached * rpd,
+            p.get("reasoning_tokens", 0) * rpd,
+            rpd,
+            p.get("images", 0) * rpd,
+        ])
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(PRICE_FIELDS))
+
+
+def daily_costs(prices, vision, profiles):
+    """(models x profiles) USD per day; NaN where a model can't serve the profile."""
+    costs = prices @ workload_matrix(profiles).T
+    needs_images = np.array([p.get("images", 0) > 0 for p in profiles.values()], dtype=bool)
+    costs[np.ix_(~vision, needs_images)] = np.nan
+    return costs
+
+
+def rank(ids, costs, top=None) -> list[list[tuple]]:
+    """Per profile column, [(model id, cost)] cheapest first, skipping NaN."""
+    ranked = []
+    for column in costs.T:
+        valid = np.flatnonzero(~np.isnan(column))
+        order = valid[np.argsort(column[valid], kind="stable")][:top]
+        ranked.append([(ids[i], float(column[i])) for i in order])
+    return ranked
+
+
+def cost_table(models, profiles=STANDARD_PROFILES, include_free=True) -> tuple[list, np.ndarray]:
+    """(ids, models x profiles daily cost matrix) for catalog models; the library entry point."""
+    ids, prices, vision = price_matrix(models)
+    costs = daily_costs(prices, vision, profiles)
+    if not include_free:
+        costs[(prices[:, :2] == 0).all(axis=1)] = np.nan
+    return ids, costs
+
+
+def load_models(data_file=DATA_FILE, category="text") -> list[dict]:
+    catalog = load_catalog(data_file)
+    if category == "all":
+        return catalog.raw_models()
+    return catalog.category(category)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rank models by the daily cost of a workload')
+    parser.add_argument('--profile', action='append', choices=list(STANDARD_PROFILES),
+                        help='Standard profile(s) to price (default: all, unless a custom workload is given)')
+    parser.add_argument('--input', type=int, help='Custom workload: input tokens per request')
+    parser.add_argument('--output', type=int, default=0, help='Custom workload: output tokens per request')
+    parser.add_argument('--cache-hit', type=float, default=0.0, help='Custom workload: cached share of input tokens')
+    parser.add_argument('--reasoning', type=int, default=0, help='Custom workload: reasoning tokens per request')
+    parser.add_argument('--images', type=int, default=0, help='Custom workload: input images per request')
+    parser.add_argument('--requests-per-day', type=int, default=1_000, help='Custom workload: requests per day')
+    parser.add_argument('--category', default='text', help='Catalog category, or "all" (default: text)')
+    parser.add_argument('--include-free', action='store_true', help='Also rank free (rate-limited) model variants')
+    parser.add_argument('--top', type=int, default=10, help='Models listed per profile (default: 10)')
+    parser.add_argument('--monthly', action='store_true', help='Report 30-day instead of daily cost')
+    parser.add_argument('--json', action='store_true', help='Print the ranking as JSON')
+    args = parser.parse_args()
+
+    if not DATA_FILE.exists():
+        print(f"❌ Data file not found: {DATA_FILE}")
+        sys.exit(1)
+
+    profiles = {name: STANDARD_PROFILES[name] for name in args.profile or []}
+    if args.input is not None:
+        profiles["custom"] = {"input_tokens": args.input, "output_tokens": args.output, "cache_hit": args.cache_hit,
+                              "reasoning_tokens": args.reasoning, "images": args.images,
+                              "requests_per_day": args.requests_per_day}
+    profiles = profiles or STANDARD_PROFILES
+
+    ids, costs = cost_table(load_models(DATA_FILE, args.category), profiles, args.include_free)
+    scale, period = (30, "month") if args.monthly else (1, "day")
+    ranked = rank(ids, costs * scale, args.top)
+
+    if args.json:
+        print(json.dumps({name: [{"id": mid, "usd": round(c, 4)} for mid, c in rows]
+                          for name, rows in zip(profiles, ranked)}, indent=2))
+        return
+    for name, rows in zip(profiles, ranked):
+        p = profiles[name]
+        print(f"\n💰 {name}: {p['requests_per_day']:,} req/day, {p['input_tokens']:,} in "
+              f"({p['cache_hit']:.0%} cached) / {p['output_tokens']:,} out"
+              + (f" / {p['reasoning_tokens']:,} reasoning" if p['reasoning_tokens'] else "")
+              + (f" / {p['images']} images" if p['images'] else ""))
+        for i, (mid, cost) in enumerate(rows, 1):
+            print(f"  {i:>3}. {mid:<55} ${cost:>12,.2f}/{period}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Facet aggregation for the dashboard filters.
+
+aggregate() makes one pass over a category's normalized rows (see
+build.normalize_model) and collects everything the filter bar needs:
+provider counts, per-capability counts, free/paid splits and context and
+price quantiles. Quantiles are read off value counts, so only the
+distinct values are ever sorted.
+"""
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+
+QUANTILES = (0, 10, 25, 50, 75, 90, 100)
+
+
+def quantiles_from_counts(counts, pcts=QUANTILES) -> dict:
+    """
+    Percentiles {"p<pct>": value} of the multiset described by {value: count}.
+
+    Matches indexing the sorted values at round(pct/100 * (n-1)).
+    """
+    if not counts:
+        return {}
+    values = sorted(counts)
+    cumulative = list(accumulate(counts[v] for v in values))
+    n = cumulative[-1]
+    return {f"p{p}": values[bisect_right(cumulative, int(round((p / 100) * (n - 1))))] for p in pcts}
+
+
+def aggregate(records, cap_bits) -> dict:
+    """Facets for one category's normalized rows."""
+    providers = Counter()
+    contexts = Counter()
+    prices = Counter()
+    bit_counts = [0] * max(cap_bits.values()).bit_length()
+
+    for r in records:
+        if r["provider"]:
+            providers[r["provider"]] += 1
+        if r["ctx"]:
+            contexts[r["ctx"]] += 1
+        # Router pseudo-models have negative prices; keep them out of the quantiles
+        if r["price"] >= 0:
+            prices[r["price"]] += 1
+        caps = r["caps"]
+        while caps:
+            low = caps & -caps
+            bit_counts[low.bit_length() - 1] += 1
+            caps ^= low
+
+    caps = {name: bit_counts[bit.bit_length() - 1] for name, bit in cap_bits.items()}
+    return {
+        "count": len(records),
+        "providers": dict(providers.most_common()),
+        "caps": caps,
+        "free": caps.get("isFree", 0),
+        "paid": caps.get("isPaid", 0),
+        "context": quantiles_from_counts(contexts),
+        "price": quantiles_from_counts(prices),
+    }
+
+
+def compute_facets(records_by_category, cap_bits) -> dict:
+    return {cat: aggregate(records, cap_bits) for cat, records in records_by_category.items()}
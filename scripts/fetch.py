@@ -1,25 +1,29 @@
 #!/usr/bin/env python3
 """
 Fetch all OpenRouter model data.
-Uses scripts/get_openrouter_data.py to fetch the raw data,
-then processes it into a grouped structure for the dashboard.
+Uses scripts/get_openrouter_data.py to fetch the catalog, classifies each
+model with the rule table in scripts/classify.py and writes the grouped
+structure for the dashboard. Everything stays in memory; with --stream,
+models are classified as they are parsed instead of after the whole
+catalog has been merged.
 """
 import json
 import pathlib
 import sys
-import os
+
+import requests
 
 # Create a reference to the scripts directory to import the other script
 # We assume this script is run from the root of the project or scripts dir
 # If run from root via update.sh:
 sys.path.append(str(pathlib.Path(__file__).resolve().parent))
 
-try:
-    from get_openrouter_data import fetch_openrouter_data
-except ImportError:
-    # If running directly from scripts/ dir
-    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
-    from get_openrouter_data import fetch_openrouter_data
+from catalog import ModelCatalog, save_snapshot, snapshot_path
+import metrics
+from classify import categories, classify
+from get_openrouter_data import catalog_body_files, fetch_catalog, iter_catalog, load_cached_catalog
+from history import HISTORY_DB, record_snapshot
+from manifest import hash_file, hash_inputs, load_manifest, record_stage, save_manifest, stage_is_current, write_if_changed
 
 # Paths
 BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
@@ -28,102 +32,142 @@ DATA_DIR = BASE_DIR / "data"
 RAW_DATA_FILE = "openrouter_data.json" 
 # This is the processed file we will create
 OUTPUT_FILE = DATA_DIR / "openrouter_data.json"
+# The rule table; editing it must reclassify an unchanged catalog
+CLASSIFY_FILE = pathlib.Path(__file__).resolve().parent / "classify.py"
 
-def process_data(raw_file):
-    """Process the raw OpenRouter data into grouped categories."""
-    if not os.path.exists(raw_file):
-        print(f"❌ Raw data file not found: {raw_file}")
-        return False
-
+def load_raw(raw_file) -> list[dict]:
+    """Models from a saved raw payload, e.g. the output of get_openrouter_data.py."""
     with open(raw_file, 'r', encoding='utf-8') as f:
-        raw_json = json.load(f)
-    
-    all_models = raw_json.get('data', [])
-    
-    grouped = {
-        "text": [],
-        "image": [],
-        "video": [],
-        "embedding": [],
-        "other": []
-    }
-    
-    print(f"📦 Processing {len(all_models)} OpenRouter models...")
-    
-    for model in all_models:
-        # Determine category based on architecture/modality
-        arch = model.get('architecture', {})
-        modality = arch.get('modality', '')
-        
-        # OpenRouter Modalities:
-        # text->text (Text)
-        # text+image->text (Multimodal Text/Vision)
-        # text->image (Image Gen)
-        # text->video (Video Gen - if any)
-        
-        if 'embedding' in model['id'].lower() or 'embed' in model['id'].lower() or modality.endswith('->embedding') or modality.endswith('->embeddings'):
-             # Note: modality might be text->embedding if that field exists, but robust check is ID for now.
-             grouped['embedding'].append(model) 
-
-        elif modality.endswith('->text'):
-            # Must come before 'image->' check if I was doing substring search, 
-            # but actually let's prioritize explicit output type.
-            # If it outputs text, it's Text/LLM (even if input is image).
-            grouped['text'].append(model)
-            
-        elif modality.endswith('->image') or modality.endswith('->text+image'):
-            # Image Generation or Editing
-            grouped['image'].append(model)
-        
-        elif modality.endswith('->video') or 'video->' in modality:
-            grouped['video'].append(model)
-            
-        else:
-            # Fallback
-            if 'gpt' in model['id'] or 'claude' in model['id'] or 'llama' in model['id']:
-                grouped['text'].append(model)
-            else:
-                grouped['other'].append(model)
-
-    # Save processed data
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(grouped, f, indent=2, ensure_ascii=False)
-        
-    print(f"💾 Saved processed data to {OUTPUT_FILE}")
-    print(f"  - Text: {len(grouped['text'])}")
-    print(f"  - Image: {len(grouped['image'])}")
-    print(f"  - Video: {len(grouped['video'])}")
-    print(f"  - Embedding: {len(grouped['embedding'])}")
-    print(f"  - Other: {len(grouped['other'])}")
-    
-    return True
+        return json.load(f).get('data', [])
 
-def main():
-    # 1. Fetch Data using the existing script
-    # We want to save it to a temporary location or the default location of that script
-    # get_openrouter_data saves to `openrouter_data.json` by default in CWD
-    
-    # We'll run it and let it save to the current working directory's root or wherever
-    # Ideally we pass absolute path if possible, but the script takes filename.
-    
-    # Let's just use the filename 'openrouter_raw_temp.json'
-    raw_filename = "openrouter_raw_temp.json"
-    
-    print("🚀 Fetching data from OpenRouter...")
-    success = fetch_openrouter_data(raw_filename)
+
+def group_models(models) -> dict:
+    """Classify `models` (any iterable, including a generator) in a single pass."""
+    grouped = {name: [] for name in categories()}
+    for model in models:
+        grouped[classify(model)].append(model)
+    return grouped
+
+
+def process_data(models, output_file=OUTPUT_FILE):
+    """
+    Group the models into categories and save the result to `output_file`.
+
+    `models` may be a list or a generator; it is consumed once.
+    Returns the grouped dict.
+    """
+    # A streamed catalog is downloaded and parsed inside this stage
+    with metrics.stage("classify"):
+        grouped = group_models(models)
+    print(f"📦 Processed {sum(len(v) for v in grouped.values())} OpenRouter models")
+    metrics.count("models", {name: len(v) for name, v in grouped.items()})
+
+    # Save processed data (only touches the file if the bytes changed)
+    with metrics.stage("write"):
+        content = json.dumps(grouped, indent=2, ensure_ascii=False)
+        written = write_if_changed(output_file, content)
+    metrics.output(output_file)
+    if written:
+        print(f"💾 Saved processed data to {output_file}")
+    else:
+        print(f"💤 Processed data unchanged: {output_file}")
+    for name, models in grouped.items():
+        print(f"  - {name.capitalize()}: {len(models)}")
     
-    if not success:
-        print("❌ Failed to fetch data from OpenRouter.")
-        return
-
-    # 2. Process and Group
-    if process_data(raw_filename):
-        print("✅ Data update complete.")
-        
-    # Cleanup temp file
-    if os.path.exists(raw_filename):
-        os.remove(raw_filename)
+    return grouped
+
+
+def processing_is_current(manifest, inputs) -> bool:
+    """True if these raw inputs were already classified, snapshotted and recorded in history."""
+    return (stage_is_current(manifest, "fetch", inputs)
+            and stage_is_current(manifest, "process", hash_inputs([OUTPUT_FILE])))
+
+
+def main(force=False, stream=False, raw_file=None, session=None) -> bool:
+    """
+    Run the fetch stage; returns False if the catalog could not be fetched.
+
+    `session` lets a long-running caller (watch.py) keep one connection pool.
+    """
+    manifest = load_manifest()
+
+    # 1. Fetch the catalog, or read a saved payload. The "fetch" stage is keyed
+    #    on the raw bytes, so an unchanged catalog is not even parsed.
+    if raw_file:
+        sources = [raw_file]
+        if not force and processing_is_current(manifest, hash_inputs([*sources, CLASSIFY_FILE])):
+            print(f"💤 {raw_file} unchanged since last run, nothing to process.")
+            return True
+        print(f"📂 Reading raw data from {raw_file}")
+        with metrics.stage("load"):
+            models = load_raw(raw_file)
+    elif stream:
+        # The bodies are only known once streamed, so this path always processes
+        print("🚀 Streaming data from OpenRouter...")
+        sources = catalog_body_files()
+        models = iter_catalog(session=session)
+    else:
+        print("🚀 Fetching data from OpenRouter...")
+        sources = catalog_body_files()
+        try:
+            with metrics.stage("fetch"):
+                catalog, changed = fetch_catalog(session=session, load_unchanged=False)
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Failed to fetch data from OpenRouter: {e}")
+            return False
+        if not changed:
+            print("♻️  Catalog not modified since last fetch (304).")
+        # Also catches a 200 whose body is byte-identical to the cached one
+        if not force and processing_is_current(manifest, hash_inputs([*sources, CLASSIFY_FILE])):
+            print("💤 Catalog unchanged since last run, nothing to process.")
+            return True
+        if catalog is None:
+            with metrics.stage("load"):
+                catalog = load_cached_catalog()
+        models = catalog['data']
+
+    # 2. Classify and group (a streamed catalog is fetched while this runs)
+    try:
+        grouped = process_data(models)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Failed to fetch data from OpenRouter: {e}")
+        return False
+
+    # 3. Snapshot the typed catalog so later stages (build.py, merge_stats.py, ...) skip JSON parsing
+    content_hash = hash_file(OUTPUT_FILE)
+    with metrics.stage("snapshot"):
+        save_snapshot(ModelCatalog.from_grouped(grouped), content_hash)
+    record_stage(manifest, "fetch", hash_inputs([*sources, CLASSIFY_FILE]),
+                 [OUTPUT_FILE, snapshot_path(content_hash)])
+
+    # 4. Append the changes to the history store, unless this exact catalog was recorded last run
+    inputs = hash_inputs([OUTPUT_FILE])
+    if not force and stage_is_current(manifest, "process", inputs):
+        save_manifest(manifest)
+        print("💤 Catalog unchanged since last run, history is up to date.")
+        return True
+    with metrics.stage("history"):
+        written = record_snapshot(grouped)
+    if written:
+        print(f"🗄️  Recorded {written} changed models in {HISTORY_DB}")
+    record_stage(manifest, "process", inputs, [OUTPUT_FILE])
+    save_manifest(manifest)
+    print("✅ Data update complete.")
+    return True
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fetch and categorize OpenRouter model data')
+    parser.add_argument('--force', action='store_true', help='Reprocess and record history even if the catalog is unchanged')
+    parser.add_argument('--stream', action='store_true', help='Classify models as they are parsed instead of after merging')
+    parser.add_argument('--from-file', dest='raw_file', help='Process a saved raw payload instead of fetching')
+    metrics.add_profile_argument(parser)
+    args = parser.parse_args()
+
+    metrics.start_run("fetch", profile=args.profile)
+    ok = False
+    try:
+        ok = main(force=args.force, stream=args.stream, raw_file=args.raw_file)
+    finally:
+        metrics.finish_run("ok" if ok else "error")
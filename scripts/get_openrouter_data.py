@@ -1,61 +1,310 @@
 import requests
+import hashlib
 import json
+import pathlib
+import random
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+import metrics
+from http_cache import CachingAdapter
+from manifest import write_if_changed
 
 # Configuration
 API_KEY = os.environ.get("OPENROUTER_API_KEY")
-API_URL = "https://openrouter.ai/api/v1/models"
+# Point at a mock (scripts/mock_openrouter.py) with e.g. OPENROUTER_API_BASE=http://127.0.0.1:8765/api/v1
+API_BASE = os.environ.get("OPENROUTER_API_BASE", "https://openrouter.ai/api/v1").rstrip("/")
+API_URL = f"{API_BASE}/models"
+EMBEDDINGS_API_URL = f"{API_BASE}/embeddings/models"
+CATALOG_URLS = [API_URL, EMBEDDINGS_API_URL]
 DEFAULT_OUTPUT_FILENAME = "openrouter_data.json"
 
+# HTTP behaviour
+REQUEST_TIMEOUT = (5, 30)  # (connect, read) seconds
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Conditional-request cache (ETag / Last-Modified validators + last good body)
+CACHE_DIR = pathlib.Path(__file__).resolve().parent.parent / "data" / ".cache" / "http"
+VALIDATORS_FILE = CACHE_DIR / "validators.json"
+
+# Returned by _fetch_catalog_url in place of the models when the server answered 304
+NOT_MODIFIED = object()
+
+
+def create_session(pool_size=8):
+    """
+    Create a requests session with a connection pool shared by all workers.
+
+    Responses go through the on-disk cache in http_cache.py, per OPENROUTER_HTTP_MODE.
+    """
+    session = requests.Session()
+    adapter = CachingAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    if API_KEY:
+        session.headers["Authorization"] = f"Bearer {API_KEY}"
+    return session
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Exponential backoff with full jitter, honouring a server Retry-After."""
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_CAP * 4)
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def get_with_retries(session, url, headers=None, timeout=REQUEST_TIMEOUT, max_retries=MAX_RETRIES,
+                     on_retry=None):
+    """
+    GET a URL, retrying connection errors and retryable status codes.
+
+    Returns the final response (which may still be an error status);
+    raises requests.exceptions.RequestException if every attempt failed
+    at the connection level. `on_retry(response)` is called before each
+    status-driven retry so callers can react to throttling.
+    """
+    for attempt in range(max_retries + 1):
+        start = time.perf_counter()
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            metrics.http_request(url, None, time.perf_counter() - start, 0, retry=attempt > 0)
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        metrics.http_request(url, response.status_code, time.perf_counter() - start, len(response.content),
+                             from_cache=getattr(response, "from_cache", False), retry=attempt > 0)
+
+        if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+            return response
+
+        if on_retry:
+            on_retry(response)
+        delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+        print(f"⏳ {url} returned {response.status_code}, retrying in {delay:.1f}s...")
+        time.sleep(delay)
+    return response
+
+
+def _cache_key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def _load_validators():
+    try:
+        with open(VALIDATORS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_validators(validators):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = VALIDATORS_FILE.with_suffix(".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(validators, f, indent=2)
+    os.replace(tmp, VALIDATORS_FILE)
+
+
+def _body_file(url) -> pathlib.Path:
+    return CACHE_DIR / f"{_cache_key(url)}.json"
+
+
+def catalog_body_files(urls=CATALOG_URLS) -> list[pathlib.Path]:
+    """The cached raw body of each catalog URL, i.e. the last payload it returned."""
+    return [_body_file(url) for url in urls]
+
+
+def _load_cached_body(url) -> list[dict]:
+    start = time.perf_counter()
+    with open(_body_file(url), 'rb') as f:
+        models = json.loads(f.read()).get('data', [])
+    metrics.timing("parse", time.perf_counter() - start)
+    return models
+
+
+def _fetch_catalog_url(session, url, cached):
+    """
+    Fetch one catalog URL conditionally.
+
+    Returns (models, meta) where meta holds the validators to persist and
+    whether the server answered 304. models is None for a tolerated 404
+    and NOT_MODIFIED for a 304; the cached body is not parsed here.
+    """
+    headers = {}
+    body_file = _body_file(url)
+    if cached and body_file.exists():
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    print(f"Querying OpenRouter API: {url}")
+    response = get_with_retries(session, url, headers=headers)
+
+    if response.status_code == 304:
+        return NOT_MODIFIED, dict(cached, not_modified=True)
+
+    # Embeddings endpoint might 404 if not available to public yet or something, so handle gracefully
+    if response.status_code == 404 and "embeddings" in url:
+        print(f"⚠️  Embeddings endpoint not found or not accessible: {url}")
+        return None, None
+
+    response.raise_for_status()
+    body = response.content
+    write_if_changed(body_file, body)
+
+    meta = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "not_modified": False,
+    }
+    start = time.perf_counter()
+    models = json.loads(body).get('data', [])
+    metrics.timing("parse", time.perf_counter() - start)
+    return models, meta
+
+
+def fetch_catalog(urls=CATALOG_URLS, session=None, load_unchanged=True):
+    """
+    Fetch all catalog URLs concurrently over one pooled session.
+
+    Cached bodies are only parsed when needed: when every endpoint answers
+    304 and `load_unchanged` is False, nothing is parsed and the catalog
+    is None.
+
+    Returns:
+        tuple: ({"data": [...]} deduplicated by id, or None, changed) where
+        changed is False only when every endpoint answered 304 Not Modified.
+    """
+    own_session = session is None
+    session = session or create_session(pool_size=len(urls))
+    validators = _load_validators()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+            futures = [
+                pool.submit(_fetch_catalog_url, session, url, validators.get(url))
+                for url in urls
+            ]
+            results = [f.result() for f in futures]
+    finally:
+        if own_session:
+            session.close()
+
+    changed = False
+    for url, (models_list, meta) in zip(urls, results):
+        if models_list is None:
+            validators.pop(url, None)
+            continue
+        changed = changed or not meta["not_modified"]
+        validators[url] = {k: meta[k] for k in ("etag", "last_modified")}
+    _save_validators(validators)
+    if not changed and not load_unchanged:
+        return None, False
+
+    return _merge_catalog(urls, [models_list for models_list, _ in results]), changed
+
+
+def load_cached_catalog(urls=CATALOG_URLS) -> dict:
+    """The catalog as last fetched, from the cached bodies, without any request."""
+    validators = _load_validators()
+    return _merge_catalog(urls, [NOT_MODIFIED if url in validators else None for url in urls])
+
+
+def _merge_catalog(urls, results) -> dict:
+    # Merge into dict by ID to deduplicate (keep URL order so later URLs win)
+    all_models = {}
+    for url, models_list in zip(urls, results):
+        if models_list is NOT_MODIFIED:
+            models_list = _load_cached_body(url)
+        for m in models_list or ():
+            all_models[m['id']] = m
+
+    # Convert back to list format expected by downstream scripts
+    return {"data": list(all_models.values())}
+
+
+def iter_catalog(urls=CATALOG_URLS, session=None):
+    """
+    Streaming variant of fetch_catalog(): yield models one at a time as each
+    endpoint's response is parsed, without building a merged copy.
+
+    Requests still run concurrently; models are yielded in URL order. A
+    model listed by several endpoints is yielded once, from the first URL
+    that lists it.
+    """
+    own_session = session is None
+    session = session or create_session(pool_size=len(urls))
+    validators = _load_validators()
+    seen = set()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+            futures = [
+                pool.submit(_fetch_catalog_url, session, url, validators.get(url))
+                for url in urls
+            ]
+            for url in urls:
+                # Pop each future so its response can be freed once consumed
+                models_list, meta = futures.pop(0).result()
+                if models_list is None:
+                    validators.pop(url, None)
+                    continue
+                if models_list is NOT_MODIFIED:
+                    models_list = _load_cached_body(url)
+                validators[url] = {k: meta[k] for k in ("etag", "last_modified")}
+                for m in models_list:
+                    if m['id'] not in seen:
+                        seen.add(m['id'])
+                        yield m
+                del models_list
+    finally:
+        if own_session:
+            session.close()
+
+    _save_validators(validators)
+
+
 def fetch_openrouter_data(output_filename=DEFAULT_OUTPUT_FILENAME):
     """
     Fetches model data from OpenRouter API and saves it as JSON.
-    
+
     Args:
         output_filename (str): Name of the file to save the data to
-        
+
     Returns:
         bool: True if successful, False otherwise
     """
-    headers = {}
-    if API_KEY:
-        headers["Authorization"] = f"Bearer {API_KEY}"
-    
-    urls = [
-        "https://openrouter.ai/api/v1/models",
-        "https://openrouter.ai/api/v1/embeddings/models"
-    ]
-    
-    all_models = {}
-    
     try:
-        for url in urls:
-            print(f"Querying OpenRouter API: {url}")
-            response = requests.get(url, headers=headers)
-            
-            # Embeddings endpoint might 404 if not available to public yet or something, so handle gracefully
-            if response.status_code == 404 and "embeddings" in url:
-                 print(f"⚠️  Embeddings endpoint not found or not accessible: {url}")
-                 continue
-                 
-            response.raise_for_status()
-            data = response.json()
-            
-            # Merge into dict by ID to deduplicate
-            models_list = data.get('data', [])
-            for m in models_list:
-                all_models[m['id']] = m
-                
-        # Convert back to list format expected by downstream scripts
-        combined_data = {"data": list(all_models.values())}
-        
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(combined_data, f, indent=4, ensure_ascii=False)
-        
-        print(f"OpenRouter data saved to '{output_filename}'. Total models: {len(all_models)}")
+        # A 304 leaves an existing output alone without re-parsing the cached bodies
+        with metrics.stage("fetch"):
+            combined_data, changed = fetch_catalog(load_unchanged=not os.path.exists(output_filename))
+        if not changed:
+            print("♻️  Catalog not modified since last fetch (304).")
+        if combined_data is None:
+            print(f"💤 '{output_filename}' is up to date.")
+            return True
+        metrics.count("models", len(combined_data['data']))
+
+        with metrics.stage("write"):
+            write_if_changed(output_filename, json.dumps(combined_data, indent=4, ensure_ascii=False))
+        metrics.output(output_filename)
+
+        print(f"OpenRouter data saved to '{output_filename}'. Total models: {len(combined_data['data'])}")
         return True
-        
+
     except requests.exceptions.RequestException as e:
         print(f"Error: Failed to query OpenRouter API: {e}", file=sys.stderr)
         return False
@@ -66,16 +315,22 @@ def fetch_openrouter_data(output_filename=DEFAULT_OUTPUT_FILENAME):
 def main():
     """Main function to run the script."""
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='Fetch OpenRouter model data')
     parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT_FILENAME,
                         help=f'Output filename (default: {DEFAULT_OUTPUT_FILENAME})')
+    metrics.add_profile_argument(parser)
     args = parser.parse_args()
-    
-    success = fetch_openrouter_data(args.output)
-    
+
+    metrics.start_run("get_openrouter_data", profile=args.profile)
+    success = False
+    try:
+        success = fetch_openrouter_data(args.output)
+    finally:
+        metrics.finish_run("ok" if success else "error")
+
     if not success:
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Indexed history of the OpenRouter catalog.
+
+Every processed catalog is folded into a SQLite store (data/history.sqlite).
+Only models that were added, changed or removed since the previous snapshot
+get a row, so the store grows with the amount of change, not the number of
+runs. The CLI answers range and price-diff questions straight from the
+indexes.
+
+Usage:
+    python scripts/history.py record
+    python scripts/history.py model openai/gpt-4o
+    python scripts/history.py price-changes --since 2026-01-01 --provider openai
+    python scripts/history.py removed --since 2026-10-01
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import pathlib
+import sqlite3
+import sys
+import time
+import zlib
+
+# Paths
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+CATALOG_FILE = DATA_DIR / "openrouter_data.json"
+HISTORY_DB = DATA_DIR / "history.sqlite"
+
+# Pricing fields tracked as numeric columns (USD per token / per unit)
+PRICE_FIELDS = ("prompt", "completion", "request", "image", "input_cache_read", "internal_reasoning")
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    taken_at INTEGER NOT NULL,
+    payload_hash TEXT NOT NULL,
+    model_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS model_versions (
+    model_id TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    taken_at INTEGER NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('added', 'changed', 'removed')),
+    category TEXT,
+    name TEXT,
+    context_length INTEGER,
+    {", ".join(f"{f} REAL" for f in PRICE_FIELDS)},
+    record_hash TEXT,
+    record BLOB
+);
+CREATE TABLE IF NOT EXISTS current_models (
+    model_id TEXT PRIMARY KEY,
+    record_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_versions_model ON model_versions(model_id, taken_at);
+CREATE INDEX IF NOT EXISTS idx_versions_provider ON model_versions(provider, taken_at);
+CREATE INDEX IF NOT EXISTS idx_versions_taken ON model_versions(taken_at, status);
+CREATE INDEX IF NOT EXISTS idx_snapshots_taken ON snapshots(taken_at);
+"""
+
+
+def connect(db_path=HISTORY_DB):
+    db_path = pathlib.Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _price(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _canonical(model) -> bytes:
+    return json.dumps(model, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def record_snapshot(data, taken_at=None, db_path=HISTORY_DB):
+    """
+    Fold a grouped catalog ({category: [model, ...]}) into the history store.
+
+    Returns the number of version rows written (0 if the catalog is identical
+    to the previous snapshot).
+    """
+    taken_at = int(taken_at or time.time())
+    models = {}
+    for category, items in data.items():
+        if not isinstance(items, list):
+            continue
+        for m in items:
+            blob = _canonical(m)
+            models[m["id"]] = (category, m, blob, hashlib.sha256(blob).hexdigest())
+    payload_hash = hashlib.sha256("".join(sorted(v[3] for v in models.values())).encode()).hexdigest()
+
+    conn = connect(db_path)
+    try:
+        last = conn.execute("SELECT payload_hash FROM snapshots ORDER BY taken_at DESC, id DESC LIMIT 1").fetchone()
+        if last and last["payload_hash"] == payload_hash:
+            return 0
+
+        current = dict(conn.execute("SELECT model_id, record_hash FROM current_models"))
+        with conn:
+            snapshot_id = conn.execute(
+                "INSERT INTO snapshots (taken_at, payload_hash, model_count) VALUES (?, ?, ?)",
+                (taken_at, payload_hash, len(models)),
+            ).lastrowid
+
+            rows = []
+            for mid, (category, m, blob, rhash) in models.items():
+                if current.get(mid) == rhash:
+                    continue
+                pricing = m.get("pricing") or {}
+                rows.append((
+                    mid, mid.split("/")[0], snapshot_id, taken_at,
+                    "changed" if mid in current else "added",
+                    category, m.get("name"), m.get("context_length"),
+                    *(_price(pricing.get(f)) for f in PRICE_FIELDS),
+                    rhash, zlib.compress(blob),
+                ))
+            for mid in current.keys() - models.keys():
+                rows.append((mid, mid.split("/")[0], snapshot_id, taken_at, "removed",
+                             None, None, None, *(None for _ in PRICE_FIELDS), None, None))
+
+            placeholders = ", ".join("?" * (10 + len(PRICE_FIELDS)))
+            conn.executemany(
+                f"INSERT INTO model_versions (model_id, provider, snapshot_id, taken_at, status, category, name, "
+                f"context_length, {', '.join(PRICE_FIELDS)}, record_hash, record) VALUES ({placeholders})",
+                rows,
+            )
+            conn.executemany("DELETE FROM current_models WHERE model_id = ?",
+                             [(mid,) for mid in current.keys() - models.keys()])
+            conn.executemany("INSERT OR REPLACE INTO current_models (model_id, record_hash) VALUES (?, ?)",
+                             [(mid, v[3]) for mid, v in models.items()])
+        return len(rows)
+    finally:
+        conn.close()
+
+
+def model_record(conn, model_id, at=None):
+    """The full model JSON as it was at `at` (default: latest), or None."""
+    row = conn.execute(
+        "SELECT record FROM model_versions WHERE model_id = ? AND taken_at <= ? "
+        "ORDER BY taken_at DESC LIMIT 1",
+        (model_id, at or sys.maxsize),
+    ).fetchone()
+    return json.loads(zlib.decompress(row["record"])) if row and row["record"] else None
+
+
+# --- Queries -----------------------------------------------------------------
+
+def query_model(conn, model_id):
+    return conn.execute(
+        f"SELECT taken_at, status, name, context_length, {', '.join(PRICE_FIELDS)} "
+        "FROM model_versions WHERE model_id = ? ORDER BY taken_at",
+        (model_id,),
+    ).fetchall()
+
+
+def query_price_changes(conn, since, until, provider=None, fields=PRICE_FIELDS):
+    """Versions whose price fields differ from the previous version of the same model."""
+    prev = ", ".join(f"LAG({f}) OVER w AS prev_{f}" for f in fields)
+    differs = " OR ".join(f"{f} IS NOT prev_{f}" for f in fields)
+    provider_clause = "AND provider = :provider" if provider else ""
+    return conn.execute(
+        f"""
+        SELECT * FROM (
+            SELECT model_id, taken_at, status, {', '.join(fields)}, {prev}
+            FROM model_versions
+            WHERE model_id IN (
+                SELECT DISTINCT model_id FROM model_versions
+                WHERE taken_at BETWEEN :since AND :until AND status = 'changed' {provider_clause}
+            )
+            WINDOW w AS (PARTITION BY model_id ORDER BY taken_at)
+        )
+        WHERE status = 'changed' AND taken_at BETWEEN :since AND :until AND ({differs})
+        ORDER BY taken_at, model_id
+        """,
+        {"since": since, "until": until, "provider": provider},
+    ).fetchall()
+
+
+def query_status(conn, status, since, until, provider=None):
+    provider_clause = "AND provider = ?" if provider else ""
+    params = [status, since, until] + ([provider] if provider else [])
+    return conn.execute(
+        "SELECT model_id, taken_at, name, category FROM model_versions "
+        f"WHERE status = ? AND taken_at BETWEEN ? AND ? {provider_clause} ORDER BY taken_at, model_id",
+        params,
+    ).fetchall()
+
+
+# --- CLI ---------------------------------------------------------------------
+
+def parse_time(value):
+    """Accept epoch seconds, YYYY-MM-DD or an ISO timestamp (UTC if no offset)."""
+    if value is None:
+        return None
+    if value.isdigit():
+        return int(value)
+    dt = datetime.datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return int(dt.timestamp())
+
+
+def fmt_time(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def fmt_per_million(value):
+    return "—" if value is None else f"${value * 1_000_000:.4f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the OpenRouter catalog history store')
+    parser.add_argument('--db', default=str(HISTORY_DB), help=f'SQLite store (default: {HISTORY_DB})')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('record', help='Append the current processed catalog as a snapshot')
+    p.add_argument('--file', default=str(CATALOG_FILE), help='Grouped catalog JSON to record')
+    p.add_argument('--at', help='Snapshot time (default: now)')
+
+    p = sub.add_parser('model', help='All recorded versions of one model')
+    p.add_argument('model_id')
+
+    for name, help_text in (('price-changes', 'Price changes in a time range'),
+                            ('added', 'Models added in a time range'),
+                            ('removed', 'Models removed in a time range')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('--since', help='Start (date, ISO time or epoch; default: beginning)')
+        p.add_argument('--until', help='End (default: now)')
+        p.add_argument('--provider', help='Restrict to one provider prefix, e.g. openai')
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    if args.command == 'record':
+        with open(args.file, 'r', encoding='utf-8') as f:
+            written = record_snapshot(json.load(f), parse_time(args.at), args.db)
+        print(f"🗄️  Recorded {written} changed rows into {args.db}" if written else "💤 Catalog unchanged, nothing recorded.")
+        return
+
+    conn = connect(args.db)
+    if args.command == 'model':
+        rows = query_model(conn, args.model_id)
+        for r in rows:
+            print(f"{fmt_time(r['taken_at'])}  {r['status']:<8} ctx={r['context_length'] or '—':<8} "
+                  f"in={fmt_per_million(r['prompt'])} out={fmt_per_million(r['completion'])} "
+                  f"cache={fmt_per_million(r['input_cache_read'])}")
+    else:
+        since = parse_time(args.since) or 0
+        until = parse_time(args.until) or int(time.time())
+        if args.command == 'price-changes':
+            rows = query_price_changes(conn, since, until, args.provider)
+            for r in rows:
+                diffs = [f"{f}: {fmt_per_million(r['prev_' + f])} → {fmt_per_million(r[f])}"
+                         for f in PRICE_FIELDS if r[f] != r['prev_' + f]]
+                print(f"{fmt_time(r['taken_at'])}  {r['model_id']}  " + ", ".join(diffs))
+        else:
+            rows = query_status(conn, args.command, since, until, args.provider)
+            for r in rows:
+                print(f"{fmt_time(r['taken_at'])}  {r['model_id']}" + (f"  ({r['name']})" if r['name'] else ""))
+    conn.close()
+    print(f"— {len(rows)} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+On-disk response cache for the OpenRouter HTTP calls, as a requests adapter.
+
+create_session() in get_openrouter_data.py mounts CachingAdapter, so every
+script that goes through it shares one cache. The mode comes from
+OPENROUTER_HTTP_MODE:
+
+    live    no caching (default)
+    cache   serve responses younger than OPENROUTER_HTTP_TTL seconds, fetch and store the rest
+    record  always fetch, store every cacheable response
+    replay  serve only stored responses; anything missing raises NotRecorded
+
+Recordings live in data/.cache/http/responses/, one JSON file per GET URL.
+mock_openrouter.py can serve them back as a local API.
+"""
+import base64
+import hashlib
+import json
+import os
+import pathlib
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+RESPONSES_DIR = pathlib.Path(__file__).resolve().parent.parent / "data" / ".cache" / "http" / "responses"
+
+MODES = ("live", "cache", "record", "replay")
+HTTP_MODE = os.environ.get("OPENROUTER_HTTP_MODE", "live")
+HTTP_TTL = float(os.environ.get("OPENROUTER_HTTP_TTL", 3600))
+
+# Transient failures are never stored; replaying them would make a retry loop pointless
+UNCACHEABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+# Hop-by-hop or body-encoding headers that no longer describe the stored body
+_DROP_HEADERS = {"content-encoding", "transfer-encoding", "content-length", "connection", "set-cookie"}
+
+
+class NotRecorded(requests.exceptions.RequestException):
+    """Replay mode found no stored response. Not a ConnectionError, so it is not retried."""
+
+
+def response_path(url, responses_dir=RESPONSES_DIR) -> pathlib.Path:
+    return responses_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()[:20]}.json"
+
+
+def store_response(response, responses_dir=RESPONSES_DIR):
+    """Write a response to the recordings directory (atomically)."""
+    body = response.content
+    try:
+        encoded = {"text": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        encoded = {"base64": base64.b64encode(body).decode("ascii")}
+    entry = {
+        "url": response.url,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS},
+        "stored_at": time.time(),
+        **encoded,
+    }
+    path = response_path(response.url, responses_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def load_entry(url, responses_dir=RESPONSES_DIR):
+    try:
+        with open(response_path(url, responses_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def iter_recordings(responses_dir=RESPONSES_DIR):
+    """Yield every stored entry (dicts as written by store_response)."""
+    if not responses_dir.exists():
+        return
+    for path in sorted(responses_dir.glob("*.json")):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                yield json.load(f)
+        except (OSError, ValueError):
+            continue
+
+
+def entry_body(entry) -> bytes:
+    if "base64" in entry:
+        return base64.b64decode(entry["base64"])
+    return entry["text"].encode("utf-8")
+
+
+def build_response(entry, request) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry.get("reason") or ""
+    response.headers = CaseInsensitiveDict(entry.get("headers") or {})
+    response._content = entry_body(entry)
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    response.from_cache = True
+    return response
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that answers GETs from, and records them to, the on-disk cache."""
+
+    def __init__(self, mode=HTTP_MODE, ttl=HTTP_TTL, responses_dir=RESPONSES_DIR, **kwargs):
+        if mode not in MODES:
+            raise ValueError(f"OPENROUTER_HTTP_MODE must be one of {', '.join(MODES)}, not {mode!r}")
+        super().__init__(**kwargs)
+        self.mode = mode
+        self.ttl = ttl
+        self.responses_dir = responses_dir
+
+    def send(self, request, **kwargs):
+        if self.mode == "live" or request.method != "GET":
+            return super().send(request, **kwargs)
+
+        if self.mode in ("cache", "replay"):
+            entry = load_entry(request.url, self.responses_dir)
+            if entry and (self.mode == "replay" or time.time() - entry.get("stored_at", 0) < self.ttl):
+                return build_response(entry, request)
+            if self.mode == "replay":
+                raise NotRecorded(f"No recorded response for {request.url}", request=request)
+
+        response = super().send(request, **kwargs)
+        # 304s only make sense against the caller's own validators
+        if response.status_code not in UNCACHEABLE_STATUSES and response.status_code != 304:
+            store_response(response, self.responses_dir)
+        return response
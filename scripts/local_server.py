@@ -0,0 +1,23 @@
+"""
+Serve a directory over HTTP on a free local port, in a background thread.
+
+Shared by the scripts that point a headless browser at local files:
+take_screenshot.py (the built dashboard) and stats_scraper.py --serve
+(the openrouterstats stand-in page).
+"""
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_directory(directory):
+    """Serve `directory` over HTTP on a free local port; call shutdown() on the result when done."""
+    handler = functools.partial(_QuietHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
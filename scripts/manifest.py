@@ -0,0 +1,102 @@
+"""
+Content-hash stage manifest for the update pipeline.
+
+Each stage records the hashes of its inputs and outputs in
+data/.cache/manifest.json. A stage whose inputs hash the same as last
+time, and whose outputs are still on disk untouched, can be skipped.
+"""
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+MANIFEST_FILE = BASE_DIR / "data" / ".cache" / "manifest.json"
+
+
+def hash_bytes(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """sha256 of a file's bytes, or None if it does not exist."""
+    h = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except FileNotFoundError:
+        return None
+    return h.hexdigest()
+
+
+def hash_inputs(paths) -> dict:
+    """Map each path (relative to the repo root) to its content hash."""
+    return {_rel(p): hash_file(p) for p in sorted(paths, key=str)}
+
+
+def _rel(path) -> str:
+    path = pathlib.Path(path).resolve()
+    try:
+        return str(path.relative_to(BASE_DIR))
+    except ValueError:
+        return str(path)
+
+
+def load_manifest() -> dict:
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(MANIFEST_FILE, json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def stage_is_current(manifest, stage, inputs) -> bool:
+    """True if `stage` last ran on identical inputs and its outputs are unchanged."""
+    entry = manifest.get(stage)
+    if not entry or entry.get("inputs") != inputs:
+        return False
+    return all(hash_file(BASE_DIR / p) == h for p, h in entry.get("outputs", {}).items())
+
+
+def record_stage(manifest, stage, inputs, outputs):
+    manifest[stage] = {"inputs": inputs, "outputs": hash_inputs(outputs)}
+
+
+def write_if_changed(path, content) -> bool:
+    """
+    Atomically write `content` to `path` unless the file already holds those bytes.
+
+    The new bytes go to a temp file in the same directory and are renamed
+    into place, so readers never see a half-written file.
+    Returns True if the file was written.
+    """
+    path = pathlib.Path(path)
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    try:
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        # mkstemp creates 0600 files; published outputs must stay world-readable
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
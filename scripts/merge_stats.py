@@ -1,6 +1,28 @@
+"""
+Join scraped openrouterstats.com rows onto the OpenRouter catalog.
+
+Scraped rows name models inconsistently (ids, display names, names
+without the "Vendor: " prefix), so the join builds normalized lookup
+indexes once: by id, canonical_slug, an alias table, display name and
+the id without its vendor. Throughput and latency strings are parsed to
+numbers column by column, and the merged result is written as typed
+per-provider numbers (model_stats.json) that build.py ships to the
+dashboard.
+
+Every scrape is also folded into rolling quantile sketches
+(sketches.py), and each model's p50/p90/p99 over the last 1, 7 and 30
+days is added to model_stats.json next to the latest snapshot.
+"""
 import json
 import os
 import pathlib
+import re
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from catalog import load_catalog
+from manifest import write_if_changed
+import sketches
 
 # Paths
 BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
@@ -8,54 +30,221 @@ DATA_DIR = BASE_DIR / "data"
 PROVIDERS_FILE = DATA_DIR / "openrouter_data.json" # Source of truth for models
 STATS_FILE = DATA_DIR / "openrouterstats_full_scraped.json"
 OUTPUT_FILE = DATA_DIR / "all_model_providers_with_stats.json"
+MODEL_STATS_FILE = DATA_DIR / "model_stats.json"
+UNMATCHED_FILE = DATA_DIR / "model_stats_unmatched.json"
+# Optional {"scraped model name": "openrouter/model-id"} overrides for names no index resolves
+ALIASES_FILE = DATA_DIR / "model_aliases.json"
+
+# Index lookup order; earlier indexes are more specific
+MATCH_ORDER = ("id", "canonical_slug", "alias", "name", "short_name", "id_tail")
+
+_NON_ALNUM = re.compile(r"[^a-z0-9.]+")
+_QUANTITY = re.compile(r"^\s*([0-9][0-9,]*\.?[0-9]*|\.[0-9]+)\s*([a-zA-Z/]*)")
+_RATE_SCALE = {"": 1, "k": 1e3, "m": 1e6}
+_DURATION_MS = {"": 1000, "s": 1000, "sec": 1000, "ms": 1, "m": 60_000, "min": 60_000}
+
+
+def normalize_key(text) -> str:
+    """'Anthropic: Claude 3.5 Sonnet' -> 'anthropic-claude-3.5-sonnet'."""
+    return _NON_ALNUM.sub("-", (text or "").lower()).strip("-")
+
+
+def _quantity(value):
+    m = _QUANTITY.match(value or "")
+    if not m:
+        return None, ""
+    return float(m.group(1).replace(",", "")), m.group(2).lower()
+
+
+def parse_throughput(values) -> list:
+    """Tokens/second for strings like '85.2 tok/s' or '1.2k tok/s'; None when unparseable."""
+    out = []
+    for number, unit in map(_quantity, values):
+        scale = _RATE_SCALE.get(unit.split("/")[0].removesuffix("tok").removesuffix("tps"), 1)
+        out.append(None if number is None else round(number * scale, 3))
+    return out
+
+
+def parse_latency(values) -> list:
+    """Milliseconds for strings like '0.45s', '450ms' or '1.2 s'; bare numbers are seconds."""
+    out = []
+    for number, unit in map(_quantity, values):
+        factor = _DURATION_MS.get(unit)
+        out.append(None if number is None or factor is None else round(number * factor, 3))
+    return out
+
+
+def parse_rows(rows) -> list[dict]:
+    """Typed copies of the scraped rows; each numeric column is parsed in one pass."""
+    columns = {
+        "throughput_tps": parse_throughput([r.get("p50_throughput") for r in rows]),
+        "latency_ms": parse_latency([r.get("p50_latency") for r in rows]),
+        "p90_latency_ms": parse_latency([r.get("p90_latency") for r in rows]),
+    }
+    return [
+        {
+            "model_name": (r.get("model_name") or "").strip(),
+            "provider": (r.get("provider") or "Unknown").strip(),
+            **{name: values[i] for name, values in columns.items()},
+        }
+        for i, r in enumerate(rows)
+    ]
+
+
+def load_aliases() -> dict:
+    if not ALIASES_FILE.exists():
+        return {}
+    with open(ALIASES_FILE, 'r', encoding='utf-8') as f:
+        return {normalize_key(k): v for k, v in json.load(f).items()}
+
+
+def build_indexes(models, aliases=None) -> dict:
+    """
+    Normalized-key -> model id maps, one per entry in MATCH_ORDER.
 
-def merge_stats():
-    if not os.path.exists(PROVIDERS_FILE) or not os.path.exists(STATS_FILE):
+    Keys shared by several models (e.g. the same tail under two vendors)
+    are left out of that index rather than guessed.
+    """
+    ids = {m["id"] for m in models}
+    indexes = {name: {} for name in MATCH_ORDER}
+    ambiguous = {name: set() for name in MATCH_ORDER}
+
+    def add(index, key, model_id):
+        if not key or key in ambiguous[index]:
+            return
+        current = indexes[index].setdefault(key, model_id)
+        if current != model_id:
+            del indexes[index][key]
+            ambiguous[index].add(key)
+
+    for m in models:
+        mid = m["id"]
+        name = m.get("name") or ""
+        add("id", normalize_key(mid), mid)
+        add("canonical_slug", normalize_key(m.get("canonical_slug")), mid)
+        add("name", normalize_key(name), mid)
+        # "Anthropic: Claude 3.5 Sonnet" is often listed as just "Claude 3.5 Sonnet"
+        if ": " in name:
+            add("short_name", normalize_key(name.split(": ", 1)[1]), mid)
+        add("id_tail", normalize_key(mid.split("/", 1)[-1]), mid)
+    for key, mid in (aliases or {}).items():
+        if mid in ids:
+            add("alias", key, mid)
+    return indexes
+
+
+def match_row(indexes, model_name):
+    """(model id, index name) for a scraped model name, or (None, None)."""
+    key = normalize_key(model_name)
+    for name in MATCH_ORDER:
+        mid = indexes[name].get(key)
+        if mid:
+            return mid, name
+    return None, None
+
+
+def _sort_key(row):
+    # Fastest first; rows without a throughput figure go last
+    return (row["throughput_tps"] is None, -(row["throughput_tps"] or 0))
+
+
+def match_scrape(stats_file, all_models=None):
+    """
+    (matched, unmatched, matched_by) for a scraped stats file: parsed rows
+    carrying the catalog `model_id` they matched, the rows that matched
+    nothing, and how many rows each index resolved.
+    """
+    if all_models is None:
+        all_models = load_catalog(PROVIDERS_FILE).raw_models()
+    with open(stats_file, 'r', encoding='utf-8') as f:
+        scraped_stats = json.load(f)
+
+    indexes = build_indexes(all_models, load_aliases())
+    matched = []
+    unmatched = []
+    matched_by = {name: 0 for name in MATCH_ORDER}
+    for row in parse_rows(scraped_stats):
+        mid, how = match_row(indexes, row["model_name"])
+        if mid is None:
+            unmatched.append(dict(row, key=normalize_key(row["model_name"])))
+            continue
+        matched_by[how] += 1
+        matched.append(dict(row, model_id=mid))
+    return matched, unmatched, matched_by
+
+
+def merge_stats(stats_file=STATS_FILE, sketch_db=sketches.SKETCH_DB):
+    if not os.path.exists(PROVIDERS_FILE) or not os.path.exists(stats_file):
         print("❌ Missing input files.")
         return
 
-    print("📖 Merging data into 'all_model_providers_with_stats.json'...")
-    with open(PROVIDERS_FILE, 'r', encoding='utf-8') as f:
-        raw_data = json.load(f)
-    
-    with open(STATS_FILE, 'r', encoding='utf-8') as f:
-        scraped_stats = json.load(f)
+    print(f"📖 Merging data into '{OUTPUT_FILE.name}'...")
+    all_models = load_catalog(PROVIDERS_FILE).raw_models()
+    matched_rows, unmatched, matched_by = match_scrape(stats_file, all_models)
 
-    # Index stats
-    stats_map = {}
-    for item in scraped_stats:
-        raw_name = item.get("model_name", "").strip()
-        if raw_name not in stats_map:
-            stats_map[raw_name] = []
-        stats_map[raw_name].append(item)
+    stats_by_model = {}
+    for row in matched_rows:
+        stats_by_model.setdefault(row["model_id"], []).append(
+            {k: v for k, v in row.items() if k != "model_id"})
 
-    # Flatten categories from openrouter_data.json
-    all_models = []
-    for cat in raw_data.values():
-        if isinstance(cat, list):
-            all_models.extend(cat)
+    # The scrape's mtime is when it was taken; a re-merge of the same file is not counted twice
+    conn = sketches.connect(sketch_db)
+    updated = sketches.ingest(conn, matched_rows, int(os.path.getmtime(stats_file)), sketches.file_digest(stats_file))
+    windows = sketches.window_stats(conn, [m["id"] for m in all_models])
+    conn.close()
 
     merged_data = []
+    model_stats = {}
     for m in all_models:
-        mid = m.get("id")
-        stat_list = stats_map.get(mid)
-        
+        stat_list = sorted(stats_by_model.get(m.get("id"), []), key=_sort_key)
+        merged_data.append(dict(m, throughput_stats=stat_list))
         if stat_list:
-            # Sort by throughput
-            def parse_tps(x):
-                try: return float(x.get("p50_throughput", "0").replace("tok/s", "").strip())
-                except: return 0
-            stat_list.sort(key=parse_tps, reverse=True)
-            m["throughput_stats"] = stat_list
-        else:
-            m["throughput_stats"] = []
-        
-        merged_data.append(m)
-
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(merged_data, f, indent=2, ensure_ascii=False)
-    
+            tps = [r["throughput_tps"] for r in stat_list if r["throughput_tps"] is not None]
+            latency = [r["latency_ms"] for r in stat_list if r["latency_ms"] is not None]
+            model_stats[m["id"]] = {
+                "best_tps": max(tps) if tps else None,
+                "min_latency_ms": min(latency) if latency else None,
+                "providers": {
+                    r["provider"]: {k: r[k] for k in ("throughput_tps", "latency_ms", "p90_latency_ms")}
+                    for r in stat_list
+                },
+            }
+        # Models missing from this scrape keep their rolling figures
+        if m["id"] in windows:
+            entry = model_stats.setdefault(m["id"], {"best_tps": None, "min_latency_ms": None, "providers": {}})
+            entry["windows"] = windows[m["id"]]["windows"]
+            for provider, rolling in windows[m["id"]]["providers"].items():
+                entry["providers"].setdefault(provider, {})["windows"] = rolling["windows"]
+
+    # Atomic and byte-stable: model_stats.json is a build input, so an unchanged merge must not touch it
+    write_if_changed(OUTPUT_FILE, json.dumps(merged_data, indent=2, ensure_ascii=False))
+
+    matched = len(matched_rows)
+    total = matched + len(unmatched)
+    rate = matched / total if total else 0.0
+    write_if_changed(MODEL_STATS_FILE, json.dumps({
+        "match": {"rows": total, "matched": matched, "rate": round(rate, 4), "by_index": matched_by},
+        "models": model_stats,
+    }, indent=2, ensure_ascii=False))
+    write_if_changed(UNMATCHED_FILE, json.dumps(unmatched, indent=2, ensure_ascii=False))
+
+    print(f"🔗 Matched {matched}/{total} rows ({rate:.1%}) to {len(stats_by_model)} models: "
+          + ", ".join(f"{name} {n}" for name, n in matched_by.items() if n))
+    if unmatched:
+        print(f"⚠️  {len(unmatched)} unmatched rows listed in {UNMATCHED_FILE}; add aliases to {ALIASES_FILE.name}")
     print(f"✅ Created {OUTPUT_FILE} with {len(merged_data)} models.")
+    print(f"📐 Updated {updated} rolling sketches; 1d/7d/30d percentiles for {len(windows)} models"
+          if updated else f"💤 Scrape already in {sketch_db.name}; 1d/7d/30d percentiles for {len(windows)} models")
+    print(f"📈 Wrote per-provider stats to {MODEL_STATS_FILE}")
 
 if __name__ == "__main__":
-    merge_stats()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Join scraped throughput/latency stats onto the catalog')
+    parser.add_argument('--stats', type=pathlib.Path, default=STATS_FILE,
+                        help=f'Scraped rows to merge (default: {STATS_FILE.name})')
+    parser.add_argument('--sketches', type=pathlib.Path, default=sketches.SKETCH_DB,
+                        help=f'Rolling percentile store (default: {sketches.SKETCH_DB.name})')
+    args = parser.parse_args()
+
+    merge_stats(args.stats, args.sketches)
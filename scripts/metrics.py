@@ -0,0 +1,254 @@
+"""
+Per-run instrumentation for the update pipeline.
+
+A script calls start_run() once, wraps its stages in `with stage("name"):`
+(stage() is for the main thread; worker threads report with timing())
+and calls finish_run(), which writes data/metrics/<time>-<script>.json:
+
+    stages   wall seconds and peak RSS after each stage (nested stages are "outer/inner")
+    http     request count, retries, errors, bytes and latency quantiles per URL
+             (per-model endpoint URLs are folded into one template)
+    counts   model counts per category and other tallies
+    outputs  bytes written per output file
+
+Without an active run every helper is a no-op, so library callers
+(benchmark.py, the perf harness) pay nothing.
+
+With profiling on (the scripts' --profile flag), each profiled stage also
+writes a cProfile dump (.prof, for pstats or snakeviz) and the top
+tracemalloc allocation sites (.txt) to data/metrics/profiles/.
+"""
+import contextlib
+import cProfile
+import json
+import marshal
+import os
+import pathlib
+import platform
+import re
+import sys
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+METRICS_DIR = BASE_DIR / "data" / "metrics"
+PROFILES_DIR = METRICS_DIR / "profiles"
+# Older run files are pruned beyond this many
+KEEP_RUNS = 200
+# Allocation sites listed per tracemalloc report
+TRACEMALLOC_TOP = 25
+
+_MODEL_URL = re.compile(r"/models/.+/endpoints$")
+
+_run = None
+_lock = threading.Lock()
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KiB
+
+
+def _quantile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def start_run(script, profile=None):
+    """
+    Begin collecting metrics for `script`.
+
+    `profile` is None (off), an empty collection (profile every top-level
+    stage) or the stage names to profile.
+    """
+    global _run
+    _run = {
+        "script": script,
+        "started_at": time.time(),
+        "started": time.perf_counter(),
+        "stages": {},
+        "http": {},
+        "counts": {},
+        "outputs": {},
+        "profile": None if profile is None else set(profile),
+        "profiled": [],
+        "stack": [],
+        "profiling": False,  # cProfile can't nest; inner stages of a profiled stage aren't profiled separately
+    }
+
+
+def active() -> bool:
+    return _run is not None
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Time a pipeline stage; profile it too when the run asked for it."""
+    if _run is None:
+        yield
+        return
+    stack = _run["stack"]
+    path = "/".join([*stack, name])
+    wanted = _run["profile"]
+    profiling = wanted is not None and not _run["profiling"] and (name in wanted or (not wanted and not stack))
+    stack.append(name)
+
+    profiler = None
+    traced_here = False
+    if profiling:
+        _run["profiling"] = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            traced_here = True
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        profiler.enable()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if profiler:
+            profiler.disable()
+            _dump_profile(path, profiler)
+            if traced_here:
+                tracemalloc.stop()
+            _run["profiling"] = False
+        stack.pop()
+        timing(path, seconds)
+
+
+def timing(path, seconds):
+    """Add `seconds` to a stage's total; thread-safe, for work done in worker threads."""
+    if _run is None:
+        return
+    with _lock:
+        entry = _run["stages"].setdefault(path, {"seconds": 0.0, "calls": 0})
+        entry["seconds"] = round(entry["seconds"] + seconds, 6)
+        entry["calls"] += 1
+        entry["peak_rss_bytes"] = peak_rss_bytes()
+
+
+def _run_stamp(run) -> str:
+    """
+    Start time with microseconds plus the pid, so two runs of one script in
+    the same second never share a file name; names still sort by start time.
+    """
+    started = run["started_at"]
+    micros = int(started % 1 * 1_000_000)
+    return f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(started))}.{micros:06d}-{os.getpid()}"
+
+
+def _dump_profile(path, profiler):
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    # A stage profiled again in the same run gets a numbered name
+    repeat = sum(p["stage"] == path for p in _run["profiled"])
+    suffix = f".{repeat + 1}" if repeat else ""
+    base = PROFILES_DIR / f"{_run_stamp(_run)}-{_run['script']}-{path.replace('/', '.')}{suffix}"
+    # What Profile.dump_stats() does, but refusing to overwrite an existing file
+    profiler.create_stats()
+    with open(f"{base}.prof", 'xb') as f:
+        marshal.dump(profiler.stats, f)
+    _, peak = tracemalloc.get_traced_memory()
+    lines = [f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB", ""]
+    for stat in tracemalloc.take_snapshot().statistics("lineno")[:TRACEMALLOC_TOP]:
+        lines.append(str(stat))
+    with open(f"{base}.txt", 'x', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    _run["profiled"].append({"stage": path, "cprofile": f"{base}.prof", "tracemalloc": f"{base}.txt",
+                             "traced_peak_bytes": peak})
+
+
+def http_request(url, status, seconds, nbytes, from_cache=False, retry=False):
+    """Record one HTTP attempt (status None for a connection-level failure)."""
+    if _run is None:
+        return
+    key = _MODEL_URL.sub("/models/{id}/endpoints", url.split("?")[0])
+    with _lock:
+        entry = _run["http"].setdefault(key, {"requests": 0, "retries": 0, "errors": 0, "from_cache": 0,
+                                              "bytes": 0, "latencies": []})
+        entry["requests"] += 1
+        entry["retries"] += bool(retry)
+        entry["errors"] += status is None or status >= 400
+        entry["from_cache"] += bool(from_cache)
+        entry["bytes"] += nbytes
+        entry["latencies"].append(seconds)
+
+
+def count(name, value):
+    """Record a tally, e.g. count("models", {"text": 337, ...})."""
+    if _run is not None:
+        _run["counts"][name] = value
+
+
+def output(path, nbytes=None):
+    """Record the size of an output file (read from disk unless given)."""
+    if _run is None:
+        return
+    if nbytes is None:
+        try:
+            nbytes = os.path.getsize(path)
+        except OSError:
+            return
+    path = pathlib.Path(path).resolve()
+    _run["outputs"][str(path.relative_to(BASE_DIR) if path.is_relative_to(BASE_DIR) else path)] = nbytes
+
+
+def _http_summary(http):
+    summary = {}
+    for key, entry in http.items():
+        latencies = sorted(entry.pop("latencies"))
+        summary[key] = dict(entry, seconds=round(sum(latencies), 6),
+                            p50_ms=round(_quantile(latencies, 0.5) * 1000, 3),
+                            p90_ms=round(_quantile(latencies, 0.9) * 1000, 3),
+                            max_ms=round(latencies[-1] * 1000, 3))
+    return summary
+
+
+def finish_run(status="ok"):
+    """Write the run's metrics file and end the run. Returns its path, or None without a run."""
+    global _run
+    if _run is None:
+        return None
+    run, _run = _run, None
+    report = {
+        "script": run["script"],
+        "status": status,
+        "started_at": int(run["started_at"]),
+        "seconds": round(time.perf_counter() - run["started"], 6),
+        "peak_rss_bytes": peak_rss_bytes(),
+        "python": platform.python_version(),
+        "argv": sys.argv[1:],
+        "stages": run["stages"],
+        "http": _http_summary(run["http"]),
+        "counts": run["counts"],
+        "outputs": run["outputs"],
+    }
+    if run["profiled"]:
+        report["profiles"] = run["profiled"]
+
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    path = METRICS_DIR / f"{_run_stamp(run)}-{run['script']}.json"
+    with open(path, 'x', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    for old in sorted(METRICS_DIR.glob("*.json"))[:-KEEP_RUNS]:
+        old.unlink(missing_ok=True)
+    print(f"📏 Metrics written to {path}")
+    return path
+
+
+def add_profile_argument(parser):
+    """The shared --profile [STAGE ...] option."""
+    parser.add_argument('--profile', nargs='*', metavar='STAGE',
+                        help='Write cProfile and tracemalloc reports to data/metrics/profiles/ '
+                             '(for the named stages, or every top-level stage)')
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenRouter API, for offline development and benchmarks.
+
+Serves /api/v1/models, /api/v1/embeddings/models and
+/api/v1/models/{id}/endpoints from responses recorded by http_cache.py
+(--recordings) or from a catalog synthesized from scripts/openrouter_data.json
+(--models N scales it up). Latency and error injection make retry and
+concurrency behaviour reproducible:
+
+    python scripts/mock_openrouter.py --latency 80 --jitter 40 --error-rate 0.05 &
+    OPENROUTER_API_BASE=http://127.0.0.1:8765/api/v1 python scripts/prefetch_endpoints.py --force -w 16
+"""
+import argparse
+import hashlib
+import json
+import pathlib
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from http_cache import RESPONSES_DIR, entry_body, iter_recordings
+
+SAMPLE_FILE = pathlib.Path(__file__).resolve().parent / "openrouter_data.json"
+API_PREFIX = "/api/v1"
+DEFAULT_PORT = 8765
+MOCK_PROVIDERS = ("Together", "DeepInfra", "Fireworks", "Novita", "Parasail", "Groq")
+
+
+def _is_embedding(m) -> bool:
+    return "embed" in m["id"] or (m.get("architecture") or {}).get("modality", "").endswith("embeddings")
+
+
+def synthesize_endpoints(m) -> dict:
+    """A deterministic /endpoints payload for one model, priced like the model."""
+    rng = random.Random(m["id"])
+    pricing = m.get("pricing") or {}
+    ctx = m.get("context_length") or 0
+    endpoints = [
+        {
+            "name": f"{provider} | {m['id']}",
+            "provider_name": provider,
+            "context_length": ctx,
+            "max_completion_tokens": (m.get("top_provider") or {}).get("max_completion_tokens"),
+            "quantization": rng.choice(("fp8", "bf16", "int4", None)),
+            "uptime_last_30m": round(rng.uniform(90, 100), 2),
+            "pricing": {"prompt": pricing.get("prompt"), "completion": pricing.get("completion")},
+        }
+        for provider in rng.sample(MOCK_PROVIDERS, rng.randint(1, 3))
+    ]
+    return {"data": {"id": m["id"], "name": m.get("name"), "endpoints": endpoints}}
+
+
+def synthesized_routes(models) -> dict:
+    """{path: (status, body bytes)} for a catalog."""
+    dump = lambda obj: json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    routes = {
+        f"{API_PREFIX}/models": (200, dump({"data": [m for m in models if not _is_embedding(m)]})),
+        f"{API_PREFIX}/embeddings/models": (200, dump({"data": [m for m in models if _is_embedding(m)]})),
+    }
+    for m in models:
+        routes[f"{API_PREFIX}/models/{m['id']}/endpoints"] = (200, dump(synthesize_endpoints(m)))
+    return routes
+
+
+def recorded_routes(responses_dir=RESPONSES_DIR) -> dict:
+    """{path: (status, body bytes)} from http_cache.py recordings, keyed by the recorded URL's path."""
+    routes = {}
+    for entry in iter_recordings(responses_dir):
+        routes[unquote(urlsplit(entry["url"]).path).rstrip("/")] = (entry["status"], entry_body(entry))
+    return routes
+
+
+class MockOpenRouter:
+    """Route table plus the injected latency/error behaviour and request counters."""
+
+    def __init__(self, routes, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, error_status=503, seed=0):
+        self.routes = routes
+        self.etags = {path: f'"{hashlib.sha1(body).hexdigest()[:16]}"' for path, (_, body) in routes.items()}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stats = {"requests": 0, "errors": 0, "not_modified": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def plan(self):
+        """(delay seconds, inject error?) for the next request."""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            error = self._rng.random() < self.error_rate
+            if error:
+                self.stats["errors"] += 1
+        return delay, error
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body=b"", headers=None):
+                self.send_response(status)
+                self.send_header("Access-Control-Allow-Origin", "*")
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                delay, error = api.plan()
+                if delay:
+                    time.sleep(delay)
+                path = unquote(urlsplit(self.path).path).rstrip("/")
+                if error:
+                    headers = {"Retry-After": "1"} if api.error_status == 429 else {}
+                    body = json.dumps({"error": {"code": api.error_status, "message": "Injected error"}}).encode()
+                    return self._send(api.error_status, body, headers)
+                if path not in api.routes:
+                    body = json.dumps({"error": {"code": 404, "message": f"No route for {path}"}}).encode()
+                    return self._send(404, body)
+                status, body = api.routes[path]
+                etag = api.etags[path]
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    with api._lock:
+                        api.stats["not_modified"] += 1
+                    return self._send(304, headers={"ETag": etag})
+                self._send(status, body, {"ETag": etag} if status == 200 else None)
+
+        return Handler
+
+
+def start_mock_server(api, host="127.0.0.1", port=0):
+    """Serve `api` in a background thread; port 0 picks a free port. Returns the server."""
+    server = ThreadingHTTPServer((host, port), api.handler())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_models(size=None, seed=0) -> list[dict]:
+    if size:
+        from benchmark import make_catalog
+        return make_catalog(size, seed)
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)['data']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a mock OpenRouter API locally')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--recordings', nargs='?', const=RESPONSES_DIR, type=pathlib.Path, metavar='DIR',
+                        help='Serve responses recorded with OPENROUTER_HTTP_MODE=record (default dir: data/.cache/http/responses)')
+    parser.add_argument('--models', type=int, default=0, help='Synthesize a catalog of N models instead of the sample')
+    parser.add_argument('--latency', type=float, default=0.0, help='Added latency per request, ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Uniform +/- jitter on the latency, ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with an error')
+    parser.add_argument('--error-status', type=int, default=503, help='Status for injected errors (429 adds Retry-After)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency, errors and synthetic models')
+    args = parser.parse_args()
+
+    if args.recordings:
+        routes = recorded_routes(args.recordings)
+        if not routes:
+            print(f"❌ No recordings in {args.recordings}; run a fetch with OPENROUTER_HTTP_MODE=record first")
+            sys.exit(1)
+    else:
+        routes = synthesized_routes(load_models(args.models, args.seed))
+
+    api = MockOpenRouter(routes, args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+    server = start_mock_server(api, args.host, args.port)
+    print(f"🧪 Mock OpenRouter serving {len(routes)} routes at http://{args.host}:{server.server_address[1]}{API_PREFIX}")
+    print(f"   latency {args.latency:g}±{args.jitter:g} ms, error rate {args.error_rate:.0%} ({args.error_status})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        print(f"📊 {api.stats['requests']} requests, {api.stats['errors']} injected errors, "
+              f"{api.stats['not_modified']} not modified")
+
+
+if __name__ == "__main__":
+    main()
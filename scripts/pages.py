@@ -0,0 +1,234 @@
+"""
+Static detail pages: one per model, one per provider and a provider index.
+
+build.py hands over the catalog with its normalized rows; every page's
+template context is built here in the parent process and hashed together
+with the page templates. Only pages whose hash differs from the last
+build (recorded in the stage manifest) or whose file is missing are
+rendered, and large batches are spread over a process pool whose
+workers each load the Jinja environment once, sharing the compiled
+templates through its on-disk bytecode cache.
+
+Contexts deliberately leave out volatile fields (fetch timestamps,
+uptime), so a daily rebuild only rewrites the pages of models that
+actually changed.
+
+    docs/models/<provider>/<model>.html
+    docs/providers/<provider>.html
+    docs/providers/index.html
+"""
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from assets import minify_html
+from manifest import hash_bytes, write_if_changed
+
+MODELS_DIR = "models"
+PROVIDERS_DIR = "providers"
+PAGE_TEMPLATES = ("page.html", "model.html", "provider.html", "providers.html")
+# Below this many pages to render, a process pool costs more to start than it saves
+PARALLEL_MIN_PAGES = 400
+PAGES_PER_TASK = 64
+
+CAP_LABELS = {
+    "hasReasoning": "Reasoning",
+    "hasVision": "Vision",
+    "hasAudio": "Audio input",
+    "hasVideo": "Video input",
+    "hasTools": "Tool calling",
+    "hasJSON": "Structured outputs",
+    "hasCache": "Prompt caching",
+    "hasLogprobs": "Logprobs",
+    "isFree": "Free",
+    "isPareto": "Non-dominated (price / context / speed)",
+}
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9._~-]+")
+
+
+def page_slug(text) -> str:
+    """A URL- and filesystem-safe path segment; ':' (as in ':free') becomes '~'."""
+    return _UNSAFE.sub("_", text.replace(":", "~")) or "_"
+
+
+def model_page(model_id) -> str:
+    """Path of a model's page relative to docs/, e.g. 'models/openai/gpt-4o~free.html'."""
+    provider, _, rest = model_id.partition("/")
+    parts = [page_slug(provider), page_slug(rest)] if rest else [page_slug(provider)]
+    return f"{MODELS_DIR}/{'/'.join(parts)}.html"
+
+
+def provider_page(provider) -> str:
+    return f"{PROVIDERS_DIR}/{page_slug(provider or 'other')}.html"
+
+
+def format_price(value) -> str:
+    """Same rules as formatPrice() in app.js; negative prices are router pseudo-models."""
+    if value is None:
+        return "—"
+    if value < 0:
+        return "Varies"
+    if value == 0:
+        return "Free"
+    return f"${value:.6f}" if value < 0.01 else f"${value:.4f}"
+
+
+def _prices(row, category):
+    if category == "image":
+        return [("Per image", format_price(row["price"]))]
+    if category == "embedding":
+        return [("Input / 1M", format_price(row["pin"]))]
+    prices = [("Input / 1M", format_price(row["pin"])), ("Output / 1M", format_price(row["pout"]))]
+    if row.get("pcache") is not None:
+        prices.append(("Cached input / 1M", format_price(row["pcache"])))
+    return prices
+
+
+def model_context(m, row, category, cap_bits, endpoints=None, cost_profiles=()) -> dict:
+    """Template context for one model page, from its raw catalog entry and normalized row."""
+    provider = row["provider"]
+    top = m.get("top_provider") or {}
+    created = row.get("created") or 0
+    costs = row.get("cost") or []
+    return {
+        "id": row["id"],
+        "name": row["name"],
+        "provider": provider or "other",
+        "provider_page": provider_page(provider),
+        "category": category,
+        "created": time.strftime("%Y-%m-%d", time.gmtime(created)) if created else None,
+        "prices": _prices(row, category),
+        "context": f"{row['ctx']:,} tokens" if row["ctx"] else "—",
+        "max_output": f"{top['max_completion_tokens']:,} tokens" if top.get("max_completion_tokens") else None,
+        "tps": round(row["tps"]) if row.get("tps") is not None else None,
+        "lat": round(row["lat"]) if row.get("lat") is not None else None,
+        # Rolling percentiles change with every scrape, unlike the other figures
+        "perf": [
+            (window, p.get("n"), p.get("tps"), p.get("lat"))
+            for window, p in (row.get("perf") or {}).items()
+        ],
+        "capabilities": [label for name, label in CAP_LABELS.items() if row["caps"] & cap_bits.get(name, 0)],
+        "modalities": (m.get("architecture") or {}).get("modality"),
+        "costs": [(p["name"], p["summary"], format_price(c)) for p, c in zip(cost_profiles, costs) if c is not None],
+        # Only fields that describe the deployment; uptime changes on every prefetch
+        "endpoints": [
+            {"provider_name": ep.get("provider_name"), "quantization": ep.get("quantization"),
+             "context": f"{ep['context_length']:,}" if ep.get("context_length") else "—",
+             "max_output": f"{ep['max_completion_tokens']:,}" if ep.get("max_completion_tokens") else None}
+            for ep in (endpoints or {}).get("endpoints") or []
+        ],
+        "description": m.get("description"),
+    }
+
+
+def provider_contexts(records, cap_bits) -> dict:
+    """{provider: template context} over every category's normalized rows."""
+    providers = {}
+    price_labels = {"text": "Avg / 1M", "image": "Per image", "embedding": "Input / 1M"}
+    for category, rows in records.items():
+        for row in rows:
+            p = providers.setdefault(row["provider"] or "other", {"categories": {}, "count": 0, "free": 0})
+            p["count"] += 1
+            p["free"] += bool(row["caps"] & cap_bits["isFree"])
+            p["categories"].setdefault(category, []).append({
+                "name": row["name"], "page": model_page(row["id"]), "price": format_price(row["price"]),
+                "price_label": price_labels.get(category, "Price"),
+                "context": f"{row['ctx'] // 1024:,}k" if row["ctx"] else "—",
+            })
+    return {
+        name: {"name": name, "count": p["count"], "free": p["free"],
+               "categories": [(cat, sorted(models, key=lambda x: x["name"].lower()))
+                              for cat, models in p["categories"].items()]}
+        for name, p in providers.items()
+    }
+
+
+def plan_pages(data, records, cap_bits, endpoints=None, cost_profiles=()) -> dict:
+    """{path relative to docs/: (template, context)} for every page of the build."""
+    endpoints = endpoints or {}
+    pages = {}
+    for category, rows in records.items():
+        for m, row in zip(data.get(category, []), rows):
+            pages[model_page(row["id"])] = ("model.html", {
+                "m": model_context(m, row, category, cap_bits, endpoints.get(row["id"]), cost_profiles),
+            })
+    providers = provider_contexts(records, cap_bits)
+    for name, context in providers.items():
+        pages[provider_page(name)] = ("provider.html", {"p": context})
+    pages[f"{PROVIDERS_DIR}/index.html"] = ("providers.html", {
+        "providers": sorted(({"name": n, "page": provider_page(n), "count": p["count"], "free": p["free"]}
+                             for n, p in providers.items()), key=lambda p: (-p["count"], p["name"])),
+    })
+    return pages
+
+
+# --- Rendering (runs in pool workers) ---
+_worker_env = None
+_worker_minify = None
+
+
+def _init_worker(templates_dir, release, env=None):
+    global _worker_env, _worker_minify
+    if env is None:
+        from build import create_environment  # build.py imports this module
+        env = create_environment(templates_dir)
+    _worker_env = env
+    _worker_minify = minify_html if release else None
+
+
+def _render_batch(docs_dir, batch) -> int:
+    """Render and write (path, template, context) pages; returns how many files changed."""
+    written = 0
+    for rel, template, context in batch:
+        root = "../" * rel.count("/")
+        html = _worker_env.get_template(template).render(root=root, **context)
+        if _worker_minify:
+            html = _worker_minify(html)
+        written += write_if_changed(os.path.join(docs_dir, rel), html)
+    return written
+
+
+def generate_pages(docs_dir, templates_dir, data, records, cap_bits, previous, endpoints=None, cost_profiles=(),
+                   release=False, jobs=None, env=None):
+    """
+    Render the detail pages that changed since the build whose page hashes are `previous`.
+
+    Small batches render in this process with `env`; larger ones use `jobs`
+    worker processes (default: one per core).
+
+    Returns (hashes, stats): the new {path: hash} map to store in the
+    manifest, and counts of rendered, unchanged and removed pages.
+    """
+    template_hash = hash_bytes(b"".join((templates_dir / name).read_bytes() for name in PAGE_TEMPLATES))
+    pages = plan_pages(data, records, cap_bits, endpoints, cost_profiles)
+    hashes = {}
+    todo = []
+    for rel, (template, context) in pages.items():
+        digest = hash_bytes(f"{template_hash}{release}{template}" + json.dumps(context, sort_keys=True))[:20]
+        hashes[rel] = digest
+        if previous.get(rel) != digest or not (docs_dir / rel).exists():
+            todo.append((rel, template, context))
+
+    jobs = jobs or os.cpu_count() or 1
+    if len(todo) < PARALLEL_MIN_PAGES or jobs == 1:
+        _init_worker(templates_dir, release, env)
+        _render_batch(str(docs_dir), todo)
+    else:
+        batches = [todo[i:i + PAGES_PER_TASK] for i in range(0, len(todo), PAGES_PER_TASK)]
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(templates_dir, release)) as pool:
+            list(pool.map(_render_batch, [str(docs_dir)] * len(batches), batches))
+
+    removed = 0
+    for rel in previous.keys() - hashes.keys():
+        path = docs_dir / rel
+        if path.exists():
+            path.unlink()
+            removed += 1
+            # Drop a provider's model directory once its last page is gone
+            if path.parent != docs_dir and not any(path.parent.iterdir()):
+                path.parent.rmdir()
+    return hashes, {"rendered": len(todo), "unchanged": len(pages) - len(todo), "removed": removed}
@@ -0,0 +1,159 @@
+"""
+Delta patches between consecutive dashboard builds.
+
+The id-keyed shards (model rows, descriptions, prefetched endpoints) get
+one data version per build. When it changes, build.py publishes a patch
+from the previous version to the new one under docs/data/patches/: per
+tab and shard, the models added, removed and changed (field by field).
+A returning visitor whose browser holds an older version applies only
+the patches it is missing and skips the full shards.
+
+The chain keeps the last MAX_PATCH_CHAIN patches. Older visitors, and
+any shard whose patch would be more than FULL_RATIO of its full size
+(e.g. after an endpoint refresh touched every model), load the full
+shard instead.
+
+docs/data/patches/index.json records the published version and the
+shard paths it came from, so the next build can diff against them
+without any local state.
+"""
+import hashlib
+import json
+
+PATCH_DIR = "data/patches"
+PATCH_INDEX = f"{PATCH_DIR}/index.json"
+PATCHED_PARTS = ("models", "descriptions", "endpoints")
+MAX_PATCH_CHAIN = 20
+FULL_RATIO = 0.5
+
+_MISSING = object()
+
+
+def _dump(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def data_version(files, index) -> str:
+    """Hash of every patched shard's content, in a fixed order."""
+    digest = hashlib.sha256()
+    for tab in sorted(index):
+        for part in PATCHED_PARTS:
+            path = index[tab].get(part)
+            if path:
+                digest.update(f"{tab}:{part}\0".encode("utf-8"))
+                digest.update(files[path].encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def diff_rows(old, new):
+    """
+    Patch section turning the row list `old` into `new`, or None if equal.
+
+    {"removed": [ids], "changed": {id: {"set": {...}, "unset": [...]}},
+     "added": [[index, row], ...]}; "order" (every id) is only sent when
+    rows that stayed were reordered.
+    """
+    old_by_id = {r["id"]: r for r in old}
+    new_ids = [r["id"] for r in new]
+    new_set = set(new_ids)
+    section = {}
+    removed = [r["id"] for r in old if r["id"] not in new_set]
+    changed = {}
+    added = []
+    for i, row in enumerate(new):
+        before = old_by_id.get(row["id"])
+        if before is None:
+            added.append([i, row])
+        elif before != row:
+            change = {"set": {k: v for k, v in row.items() if before.get(k, _MISSING) != v}}
+            unset = [k for k in before if k not in row]
+            if unset:
+                change["unset"] = unset
+            changed[row["id"]] = change
+    if removed:
+        section["removed"] = removed
+    if changed:
+        section["changed"] = changed
+    if added:
+        section["added"] = added
+    if [r["id"] for r in old if r["id"] in new_set] != [i for i in new_ids if i in old_by_id]:
+        section["order"] = new_ids
+    return section or None
+
+
+def diff_map(old, new):
+    """Patch section turning the {id: value} map `old` into `new`, or None if equal."""
+    section = {}
+    changed = {k: v for k, v in new.items() if old.get(k, _MISSING) != v}
+    removed = [k for k in old if k not in new]
+    if changed:
+        section["set"] = changed
+    if removed:
+        section["removed"] = removed
+    return section or None
+
+
+def _diff_part(part, old_text, new_text):
+    old, new = json.loads(old_text), json.loads(new_text)
+    if part == "models":
+        if len({r["id"] for r in new}) != len(new) or len({r["id"] for r in old}) != len(old):
+            return {"full": True}
+        section = diff_rows(old, new)
+    else:
+        section = diff_map(old, new)
+    if section is not None and len(_dump(section)) > FULL_RATIO * len(new_text):
+        return {"full": True}
+    return section
+
+
+def build_patches(docs_dir, files, index) -> tuple[dict, dict]:
+    """
+    (files, page info) for this build's patch chain.
+
+    `files`/`index` are the build's shards as published (after any
+    renaming); the previous build is read back from docs/ through its
+    patch index. files maps each patch, and the index, to its content;
+    page info is {"version", "chain": [[from version, url], ...]} for
+    the dashboard.
+    """
+    version = data_version(files, index)
+    shards = {tab: {part: index[tab][part] for part in PATCHED_PARTS if index[tab].get(part)} for tab in index}
+    index_file = docs_dir / PATCH_INDEX
+    previous = json.loads(index_file.read_text(encoding="utf-8")) if index_file.exists() else {}
+    chain = previous.get("chain", [])
+    # Only extend a chain whose last version is still on disk, unchanged
+    prev_files = {}
+    for parts in previous.get("shards", {}).values():
+        for path in parts.values():
+            if (docs_dir / path).exists():
+                prev_files[path] = (docs_dir / path).read_text(encoding="utf-8")
+    prev_index = previous.get("shards", {})
+    intact = (len(prev_files) == sum(map(len, prev_index.values()))
+              and previous.get("version") == data_version(prev_files, prev_index))
+    if not intact:
+        chain = []
+
+    out = {}
+    if intact and previous["version"] != version:
+        patch = {"from": previous["version"], "to": version, "shards": {}}
+        for tab, parts in shards.items():
+            for part, path in parts.items():
+                old_path = prev_index.get(tab, {}).get(part)
+                section = (_diff_part(part, prev_files[old_path], files[path]) if old_path
+                           else {"full": True})
+                if section is not None:
+                    patch["shards"].setdefault(tab, {})[part] = section
+        url = f"{PATCH_DIR}/{version}.json"
+        out[url] = _dump(patch)
+        chain = chain + [{"from": previous["version"], "to": version, "url": url, "bytes": len(out[url])}]
+    chain = chain[-MAX_PATCH_CHAIN:]
+    # A chain is only usable up to its newest gap
+    for i in range(len(chain) - 1, -1, -1):
+        url = chain[i]["url"]
+        if url not in out:
+            if not (docs_dir / url).exists():
+                chain = chain[i + 1:]
+                break
+            out[url] = (docs_dir / url).read_text(encoding="utf-8")
+    out[PATCH_INDEX] = json.dumps({"version": version, "shards": shards, "chain": chain}, indent=2)
+    return out, {"version": version, "chain": [[link["from"], link["url"]] for link in chain]}
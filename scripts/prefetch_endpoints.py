@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Prefetch per-model provider endpoints for every model in the catalog.
+
+Runs the `/models/{id}/endpoints` lookups concurrently at build time so the
+dashboard's details panel can open from local data instead of issuing one
+live request per click.
+"""
+import json
+import pathlib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from catalog import load_catalog
+from get_openrouter_data import API_BASE, create_session, get_with_retries
+from manifest import write_if_changed
+
+# Paths
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+CATALOG_FILE = DATA_DIR / "openrouter_data.json"
+OUTPUT_FILE = DATA_DIR / "openrouter_endpoints.json"
+
+ENDPOINTS_URL = API_BASE + "/models/{model_id}/endpoints"
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 10.0  # requests per second across all workers
+DEFAULT_MAX_AGE = 6 * 60 * 60  # seconds before a cached entry is refetched
+
+# Only the fields the dashboard renders are kept
+ENDPOINT_FIELDS = ("provider_name", "context_length", "quantization", "max_completion_tokens", "uptime_last_30m")
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter shared by the worker pool.
+
+    A 429 halves the rate (down to `min_rate`); each success nudges it back
+    towards the configured ceiling.
+    """
+
+    def __init__(self, rate, min_rate=1.0):
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.rate = rate
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + 1.0 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def throttled(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate * 1.05)
+
+
+def compact_endpoint(ep):
+    """Strip an endpoint record down to what the details panel shows."""
+    out = {k: ep.get(k) for k in ENDPOINT_FIELDS}
+    pricing = ep.get("pricing") or {}
+    out["pricing"] = {"prompt": pricing.get("prompt"), "completion": pricing.get("completion")}
+    return out
+
+
+def fetch_model_endpoints(session, limiter, model_id):
+    """Fetch and compact the endpoint list for one model."""
+    def on_retry(response):
+        if response.status_code == 429:
+            limiter.throttled()
+
+    limiter.wait()
+    response = get_with_retries(session, ENDPOINTS_URL.format(model_id=model_id), on_retry=on_retry)
+    response.raise_for_status()
+    limiter.succeeded()
+    data = response.json().get("data") or {}
+    return [compact_endpoint(ep) for ep in data.get("endpoints") or []]
+
+
+def load_model_ids(catalog_file=CATALOG_FILE):
+    return [mid for mid in load_catalog(catalog_file).by_id if mid]
+
+
+def load_endpoints(path=OUTPUT_FILE):
+    """Load the prefetched endpoints file, or an empty structure."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"generated_at": 0, "models": {}}
+
+
+def prefetch_endpoints(workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, max_age=DEFAULT_MAX_AGE, force=False,
+                       session=None):
+    """
+    Fetch endpoints for every catalog model and write them next to the catalog.
+
+    Entries younger than `max_age` seconds are reused unless `force` is set.
+    Models that have left the catalog are dropped from the output. A
+    long-lived `session` (watch.py) is reused and left open.
+    """
+    if not CATALOG_FILE.exists():
+        print(f"❌ Catalog file not found: {CATALOG_FILE}")
+        return False
+
+    model_ids = load_model_ids()
+    previous = load_endpoints()["models"]
+    now = time.time()
+    results = {mid: previous[mid] for mid in model_ids
+               if mid in previous and not force and now - previous[mid].get("fetched_at", 0) < max_age}
+    todo = [mid for mid in model_ids if mid not in results]
+
+    print(f"🔌 Prefetching endpoints for {len(todo)} models ({len(results)} still fresh, {workers} workers)...")
+    limiter = RateLimiter(rate)
+    own_session = session is None
+    session = session or create_session(pool_size=workers)
+    failed = 0
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(fetch_model_endpoints, session, limiter, mid): mid for mid in todo}
+            for i, future in enumerate(as_completed(futures), 1):
+                mid = futures[future]
+                try:
+                    results[mid] = {"fetched_at": int(time.time()), "endpoints": future.result()}
+                except requests.exceptions.RequestException as e:
+                    failed += 1
+                    # Keep a stale entry rather than nothing; the dashboard refetches it live
+                    if mid in previous:
+                        results[mid] = previous[mid]
+                    print(f"⚠️  {mid}: {e}")
+                if i % 50 == 0:
+                    print(f"  {i}/{len(todo)} done...")
+    finally:
+        if own_session:
+            session.close()
+
+    models = {mid: results[mid] for mid in model_ids if mid in results}
+    if models == previous:
+        print(f"💤 Endpoints unchanged for {len(models)} models ({failed} failed)")
+        return True
+
+    output = {"generated_at": int(time.time()), "models": models}
+    write_if_changed(OUTPUT_FILE, json.dumps(output, ensure_ascii=False, separators=(",", ":")))
+    print(f"💾 Saved endpoints for {len(models)} models to {OUTPUT_FILE} ({failed} failed)")
+    return True
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Prefetch provider endpoints for all catalog models')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Concurrent requests (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help=f'Max requests per second (default: {DEFAULT_RATE})')
+    parser.add_argument('--max-age', type=int, default=DEFAULT_MAX_AGE,
+                        help=f'Reuse entries younger than this many seconds (default: {DEFAULT_MAX_AGE})')
+    parser.add_argument('--force', action='store_true', help='Refetch every model')
+    args = parser.parse_args()
+
+    if not prefetch_endpoints(args.workers, args.rate, args.max_age, args.force):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
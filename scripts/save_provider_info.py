@@ -1,6 +1,10 @@
 import json
 import os
 import pathlib
+import sys
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from catalog import load_catalog
 
 # Paths
 BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
@@ -14,39 +18,22 @@ def save_provider_info():
         return
 
     print(f"📖 Reading from {INPUT_FILE}...")
-    with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    catalog = load_catalog(INPUT_FILE)
 
     extracted_data = []
-
-    # Iterate through all categories in the grouped data
-    for category, models in data.items():
-        if not isinstance(models, list):
-            continue
-            
-        for model in models:
-            # Check if free
-            pricing = model.get('pricing', {})
-            is_free = False
-            try:
-                p_prompt = float(pricing.get('prompt', 0))
-                p_completion = float(pricing.get('completion', 0))
-                if p_prompt == 0 and p_completion == 0:
-                    is_free = True
-            except (ValueError, TypeError):
-                pass
-
-            info = {
-                "id": model.get("id"),
-                "name": model.get("name"),
-                "is_free": is_free,
-                "pricing": pricing,
-                "top_provider": model.get("top_provider", {}),
-                "context_length": model.get("context_length"),
-                # Include architecture as it relates to provider capabilities sometimes
-                "architecture": model.get("architecture", {})
-            }
-            extracted_data.append(info)
+    for record in catalog:
+        model = record.raw
+        info = {
+            "id": model.get("id"),
+            "name": model.get("name"),
+            "is_free": record.is_free,
+            "pricing": model.get("pricing", {}),
+            "top_provider": model.get("top_provider", {}),
+            "context_length": model.get("context_length"),
+            # Include architecture as it relates to provider capabilities sometimes
+            "architecture": model.get("architecture", {})
+        }
+        extracted_data.append(info)
 
     print(f"🔍 Extracted provider info for {len(extracted_data)} models.")
     
@@ -0,0 +1,58 @@
+"""
+Inverted search index for the dashboard's search box.
+
+build_search_index() maps every token of a model's name, id, provider and
+description to the models containing it, with a per-field weight so name
+and id hits rank above description hits. The dashboard resolves queries
+against this index (prefix matches via binary search over the sorted
+vocabulary, typo tolerance via trigram similarity) instead of scanning
+every model on each keystroke.
+
+The tokenizer must stay in sync with `tokenize` in static/query.js.
+"""
+import re
+from collections import defaultdict
+
+# Lowercase alphanumeric runs; dotted version numbers like "3.5" stay whole
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+
+FIELD_WEIGHTS = {"name": 10, "id": 8, "provider": 6, "description": 1}
+
+# Only applied to descriptions, where they carry no signal
+STOPWORDS = frozenset("""
+a an and are as at be been but by can for from has have in into is it its of on or that the their this
+to was were which while will with
+""".split())
+
+
+def tokenize(text) -> list[str]:
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def _field_tokens(m, field) -> set:
+    if field == "provider":
+        return set(tokenize(m.get("id", "").split("/")[0]))
+    tokens = set(tokenize(m.get(field)))
+    if field == "description":
+        tokens = {t for t in tokens if len(t) > 1 and t not in STOPWORDS}
+    return tokens
+
+
+def build_search_index(models) -> dict:
+    """
+    Build the index for one category.
+
+    Document numbers are positions in `models`, i.e. in the category's
+    models shard. Returns {"tokens": [...sorted vocabulary],
+    "postings": [[doc, weight, doc, weight, ...] per token]}.
+    """
+    index = defaultdict(dict)
+    for doc, m in enumerate(models):
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in _field_tokens(m, field):
+                hits = index[token]
+                hits[doc] = hits.get(doc, 0) + weight
+
+    tokens = sorted(index)
+    postings = [[x for doc, w in sorted(index[t].items()) for x in (doc, w)] for t in tokens]
+    return {"tokens": tokens, "postings": postings}
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Rolling throughput/latency percentiles from repeated stats scrapes.
+
+Each openrouterstats.com scrape is a single p50/p90 snapshot per model and
+provider. merge_stats.py folds every scrape's parsed numbers into
+mergeable quantile sketches kept in data/stats_sketches.sqlite: one
+sketch per (model, provider, metric, UTC day), and days older than the
+longest window are dropped. A window's percentiles come from merging its
+daily sketches, so memory per key is bounded by
+RETENTION_DAYS x MAX_BINS no matter how often the scraper runs.
+
+The sketch is a log-bucketed histogram (as in DDSketch): values land in
+buckets whose width grows geometrically, so every quantile it returns is
+within RELATIVE_ACCURACY of a value that was actually observed, and two
+sketches merge by adding bucket counts.
+
+Usage:
+    python scripts/sketches.py ingest data/openrouterstats_full_scraped.json
+    python scripts/sketches.py show openai/gpt-4o
+"""
+import argparse
+import hashlib
+import math
+import pathlib
+import sqlite3
+import struct
+import sys
+
+# Paths
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+SKETCH_DB = DATA_DIR / "stats_sketches.sqlite"
+
+RELATIVE_ACCURACY = 0.01
+# Buckets per sketch; beyond this the lowest ones are collapsed (only the low tail loses accuracy)
+MAX_BINS = 512
+WINDOWS = {"1d": 1, "7d": 7, "30d": 30}
+RETENTION_DAYS = max(WINDOWS.values())
+QUANTILES = (0.5, 0.9, 0.99)
+# Sketch name -> parsed scrape column (merge_stats.parse_rows)
+METRICS = {"tps": "throughput_tps", "lat": "latency_ms", "lat_p90": "p90_latency_ms"}
+DAY = 86_400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sketches (
+    model_id TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    sketch BLOB NOT NULL,
+    PRIMARY KEY (model_id, provider, metric, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sketches_day ON sketches(day);
+CREATE TABLE IF NOT EXISTS ingests (
+    digest TEXT PRIMARY KEY,
+    taken_at INTEGER NOT NULL,
+    rows INTEGER NOT NULL
+);
+"""
+
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+_HEADER = struct.Struct("<IIdd")
+
+
+class QuantileSketch:
+    """Mergeable log-bucketed quantile sketch over non-negative values."""
+
+    __slots__ = ("bins", "count", "zeros", "min", "max")
+
+    def __init__(self):
+        self.bins = {}
+        self.count = 0
+        self.zeros = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value, weight=1):
+        if value is None or value < 0 or math.isnan(value):
+            return
+        self.count += weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value == 0:
+            self.zeros += weight
+            return
+        key = math.ceil(math.log(value) / _LOG_GAMMA)
+        self.bins[key] = self.bins.get(key, 0) + weight
+        if len(self.bins) > MAX_BINS:
+            self._collapse()
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        self.count += other.count
+        self.zeros += other.zeros
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        if len(self.bins) > MAX_BINS:
+            self._collapse()
+        return self
+
+    def _collapse(self):
+        keys = sorted(self.bins)
+        excess = keys[:len(keys) - MAX_BINS + 1]
+        self.bins[keys[len(excess)]] += sum(self.bins.pop(k) for k in excess)
+
+    def quantile(self, q):
+        """Value at rank q (0..1), or None for an empty sketch."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                # Bucket midpoint, clamped to what was actually observed
+                estimate = 2 * _GAMMA ** key / (_GAMMA + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def to_bytes(self) -> bytes:
+        keys = sorted(self.bins)
+        return (_HEADER.pack(self.count, self.zeros, self.min, self.max)
+                + struct.pack(f"<{len(keys)}i{len(keys)}I", *keys, *(self.bins[k] for k in keys)))
+
+    @classmethod
+    def from_bytes(cls, blob):
+        sketch = cls()
+        sketch.count, sketch.zeros, sketch.min, sketch.max = _HEADER.unpack_from(blob)
+        n = (len(blob) - _HEADER.size) // 8
+        values = struct.unpack_from(f"<{n}i{n}I", blob, _HEADER.size)
+        sketch.bins = dict(zip(values[:n], values[n:]))
+        return sketch
+
+
+def connect(db_path=SKETCH_DB) -> sqlite3.Connection:
+    pathlib.Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def ingest(conn, rows, taken_at, digest) -> int:
+    """
+    Fold one scrape's parsed rows (dicts with model_id, provider and the
+    METRICS columns) into that UTC day's sketches.
+
+    A scrape whose digest was already ingested is skipped, so re-running
+    merge_stats on the same file doesn't double-count it. Returns the
+    number of sketches updated.
+    """
+    if conn.execute("SELECT 1 FROM ingests WHERE digest = ?", (digest,)).fetchone():
+        return 0
+    day = int(taken_at) // DAY
+    current = {
+        (mid, provider, metric): QuantileSketch.from_bytes(blob)
+        for mid, provider, metric, blob in conn.execute(
+            "SELECT model_id, provider, metric, sketch FROM sketches WHERE day = ?", (day,))
+    }
+    touched = set()
+    for row in rows:
+        for metric, column in METRICS.items():
+            if row.get(column) is None:
+                continue
+            key = (row["model_id"], row["provider"], metric)
+            current.setdefault(key, QuantileSketch()).add(row[column])
+            touched.add(key)
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO sketches VALUES (?, ?, ?, ?, ?)",
+            [(*key, day, current[key].to_bytes()) for key in touched],
+        )
+        conn.execute("INSERT INTO ingests VALUES (?, ?, ?)", (digest, int(taken_at), len(rows)))
+        # Retention follows the newest scrape, so back-filling an old file can't drop recent days
+        newest = conn.execute("SELECT MAX(day) FROM sketches").fetchone()[0]
+        conn.execute("DELETE FROM sketches WHERE day <= ?", (newest - RETENTION_DAYS,))
+        conn.execute("DELETE FROM ingests WHERE taken_at <= ?", ((newest - RETENTION_DAYS) * DAY,))
+    return len(touched)
+
+
+def _summary(sketches) -> dict:
+    out = {metric: [round(sketches[metric].quantile(q), 1) for q in QUANTILES]
+           for metric in METRICS if metric in sketches}
+    out["n"] = max(s.count for s in sketches.values())
+    return out
+
+
+def window_stats(conn, model_ids=None, end_day=None) -> dict:
+    """
+    {model id: {"windows": {...}, "providers": {provider: {"windows": {...}}}}}
+    where each windows map is {"1d": {metric: [p50, p90, p99], "n": samples}, ...}.
+
+    Windows end at `end_day` (default: the newest day in the store), so a
+    stale scrape still reports its own last day rather than nothing. The
+    model-level windows merge all of its providers' sketches.
+    """
+    if end_day is None:
+        end_day = conn.execute("SELECT MAX(day) FROM sketches").fetchone()[0]
+        if end_day is None:
+            return {}
+    wanted = set(model_ids) if model_ids is not None else None
+    merged = {}
+    for mid, provider, metric, day, blob in conn.execute(
+            "SELECT model_id, provider, metric, day, sketch FROM sketches WHERE day > ? AND day <= ?",
+            (end_day - RETENTION_DAYS, end_day)):
+        if wanted is not None and mid not in wanted:
+            continue
+        sketch = QuantileSketch.from_bytes(blob)
+        for window, days in WINDOWS.items():
+            if end_day - day < days:
+                for scope in (provider, None):
+                    merged.setdefault((mid, scope, window), {}).setdefault(metric, QuantileSketch()).merge(sketch)
+
+    stats = {}
+    for (mid, provider, window), sketches in sorted(merged.items(), key=lambda kv: WINDOWS[kv[0][2]]):
+        entry = stats.setdefault(mid, {"windows": {}, "providers": {}})
+        target = entry if provider is None else entry["providers"].setdefault(provider, {"windows": {}})
+        target["windows"][window] = _summary(sketches)
+    return stats
+
+
+def file_digest(path) -> str:
+    return hashlib.sha256(pathlib.Path(path).read_bytes()).hexdigest()
+
+
+def main():
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    from merge_stats import STATS_FILE, match_scrape
+
+    parser = argparse.ArgumentParser(description='Rolling throughput/latency percentile sketches')
+    parser.add_argument('--db', type=pathlib.Path, default=SKETCH_DB, help=f'Sketch store (default: {SKETCH_DB.name})')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('ingest', help='Fold a scrape into the sketches (merge_stats.py does this on every run)')
+    p.add_argument('stats', type=pathlib.Path, nargs='?', default=STATS_FILE)
+    p.add_argument('--taken-at', type=int, help='Scrape time as a Unix timestamp (default: the file mtime)')
+    p = sub.add_parser('show', help='Windowed percentiles for one model')
+    p.add_argument('model_id')
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == 'ingest':
+        rows = match_scrape(args.stats)[0]
+        taken_at = args.taken_at or int(args.stats.stat().st_mtime)
+        updated = ingest(conn, rows, taken_at, file_digest(args.stats))
+        print(f"📐 Updated {updated} sketches" if updated else "💤 Scrape already ingested")
+        return
+    stats = window_stats(conn, [args.model_id]).get(args.model_id)
+    if not stats:
+        print(f"❌ No samples for {args.model_id}")
+        sys.exit(1)
+    for scope, windows in [("all providers", stats["windows"])] + [
+            (p, s["windows"]) for p, s in sorted(stats["providers"].items())]:
+        print(f"{scope}:")
+        for window, summary in windows.items():
+            figures = "  ".join(f"{metric} {'/'.join(f'{v:g}' for v in summary[metric])}"
+                                for metric in METRICS if metric in summary)
+            print(f"  {window:>4} (n={summary['n']}): {figures}")
+
+
+if __name__ == "__main__":
+    main()
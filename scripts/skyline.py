@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Pareto frontier (skyline) over the dashboard's normalized model rows.
+
+A model is on the frontier when no other model is at least as good on
+every objective and strictly better on one. The default objectives are
+price (lower is better), context length, throughput (higher) and latency
+(lower). Throughput and latency come from merged stats (merge_stats.py);
+models without them count as slowest.
+
+skyline() is sort-filter-skyline: candidates are sorted lexicographically,
+which no dominated point can precede, so each one only has to be checked
+against the frontier found so far, never against all other models. Two
+objectives reduce to a single sweep.
+
+    python scripts/skyline.py --min-context 32768 --require hasTools --max-price 5
+"""
+import math
+
+# (row field, "min" | "max")
+DEFAULT_OBJECTIVES = (("price", "min"), ("ctx", "max"), ("tps", "max"), ("lat", "min"))
+
+# Value for a missing objective: the worst possible
+_WORST = {"min": math.inf, "max": -math.inf}
+
+
+def _vector(row, objectives) -> tuple:
+    """The row's objectives, all turned into "lower is better"."""
+    vec = []
+    for field, direction in objectives:
+        value = row.get(field)
+        if value is None:
+            value = _WORST[direction]
+        vec.append(value if direction == "min" else -value)
+    return tuple(vec)
+
+
+def dominates(a, b) -> bool:
+    """True if vector a is no worse than b everywhere and differs somewhere (lower is better)."""
+    return a != b and all(x <= y for x, y in zip(a, b))
+
+
+def skyline(rows, objectives=DEFAULT_OBJECTIVES, min_context=0, required_caps=0, max_price=None) -> list[int]:
+    """
+    Indices of the non-dominated rows, cheapest-first along the first objective.
+
+    Rows failing a constraint (context below `min_context`, missing any
+    bit of `required_caps`, price above `max_price`) are left out before
+    dominance is computed. Router pseudo-models (negative price) never
+    take part. Rows with identical objectives are all kept.
+    """
+    vectors = {}
+    for i, r in enumerate(rows):
+        if r["price"] < 0 or r["ctx"] < min_context or (r["caps"] & required_caps) != required_caps:
+            continue
+        if max_price is not None and r["price"] > max_price:
+            continue
+        vectors[i] = _vector(r, objectives)
+
+    # A dominating vector is lexicographically smaller, so it is always seen first
+    order = sorted(vectors, key=vectors.__getitem__)
+    front = []
+    if len(objectives) == 2:
+        best = math.inf
+        last = None
+        for i in order:
+            v = vectors[i]
+            if v[1] < best or v == last:
+                front.append(i)
+                best, last = v[1], v
+        return front
+
+    front_vectors = []
+    for i in order:
+        v = vectors[i]
+        if not any(dominates(f, v) for f in front_vectors):
+            front.append(i)
+            front_vectors.append(v)
+    return front
+
+
+def main():
+    import argparse
+    import pathlib
+    import sys
+
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    from build import CAP_BITS, DASHBOARD_CATEGORIES, load_model_stats, normalize_catalog
+    from catalog import load_catalog
+
+    base_dir = pathlib.Path(__file__).resolve().parent.parent
+    data_file = base_dir / "data" / "openrouter_data.json"
+    stats_file = base_dir / "data" / "model_stats.json"
+
+    parser = argparse.ArgumentParser(description='List the Pareto-optimal models for price, context and speed')
+    parser.add_argument('--category', default='text', choices=DASHBOARD_CATEGORIES)
+    parser.add_argument('--min-context', type=int, default=0, help='Minimum context length in tokens')
+    parser.add_argument('--require', nargs='+', default=[], choices=[c for c in CAP_BITS if c != "isPareto"],
+                        metavar='CAP', help=f'Required capabilities: {", ".join(CAP_BITS)}')
+    parser.add_argument('--max-price', type=float, help='Maximum price (USD per 1M tokens, averaged in/out for text)')
+    parser.add_argument('--objectives', nargs='+', default=[f for f, _ in DEFAULT_OBJECTIVES],
+                        choices=[f for f, _ in DEFAULT_OBJECTIVES], help='Objectives to trade off')
+    args = parser.parse_args()
+
+    if not data_file.exists():
+        print(f"❌ Data file not found: {data_file}")
+        sys.exit(1)
+    catalog = load_catalog(data_file)
+    rows = normalize_catalog(catalog.grouped(), load_model_stats(stats_file, catalog))[args.category]
+
+    objectives = tuple(o for o in DEFAULT_OBJECTIVES if o[0] in args.objectives)
+    required = 0
+    for cap in args.require:
+        required |= CAP_BITS[cap]
+    front = skyline(rows, objectives, args.min_context, required, args.max_price)
+
+    print(f"🎯 {len(front)} non-dominated {args.category} models "
+          f"(of {len(rows)}; objectives: {', '.join(f for f, _ in objectives)})")
+    for i in front:
+        r = rows[i]
+        speed = ""
+        if r.get("tps") is not None or r.get("lat") is not None:
+            speed = f"  {r.get('tps') or 0:>7.0f} tok/s  {r.get('lat') or 0:>6.0f} ms"
+        print(f"  {r['id']:<55} ${r['price']:>9.4f}  {r['ctx'] // 1024:>6}k{speed}")
+
+
+if __name__ == "__main__":
+    main()
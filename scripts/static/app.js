@@ -0,0 +1,917 @@
+/*
+ * Dashboard UI.
+ *
+ * Build-time settings (shard URLs, capability bits, asset names) come from
+ * the inline block in templates/dashboard.html. Filtering and sorting run in
+ * worker.js via query.js, and the table body is virtualized: only rows near
+ * the viewport are in the DOM, and their nodes are reused across renders.
+ * Model rows, descriptions and endpoints are kept in IndexedDB between
+ * visits and brought up to date with the build's delta patches.
+ */
+const CAP_BITS = window.CAP_BITS;
+const ENDPOINTS_MAX_AGE = window.ENDPOINTS_MAX_AGE;
+const ENDPOINTS_LIVE_TTL = window.ENDPOINTS_LIVE_TTL || 0;
+const ASSETS = window.DASHBOARD_ASSETS;
+const API_BASE = window.API_BASE || 'https://openrouter.ai/api/v1';
+const COST_PROFILES = window.COST_PROFILES || [];
+const DATA_PATCHES = window.DATA_PATCHES || null;
+const PATCHED_PARTS = ['models', 'descriptions', 'endpoints'];
+const INPUT_DEBOUNCE_MS = 150;
+const ROW_ESTIMATE_PX = 110;   // row height assumed until rows have been measured
+const OVERSCAN_PX = 800;       // extra rows rendered above and below the viewport
+const ROW_CACHE_LIMIT = 1500;  // detached row nodes kept around for reuse
+
+window.openRouterModels = {};
+let currentTab = 'text';
+let sortKey = 'price_avg';
+let sortAsc = true;
+let sortBeforeSearch = null;
+let activeFilters = new Set();
+
+const shardRequests = {};
+const descriptionsLoaded = new Set();
+
+const fetchJson = (url) => fetch(url).then(res => {
+    if (!res.ok) throw new Error(`${res.status} loading ${url}`);
+    return res.json();
+});
+
+// --- Shards kept in IndexedDB as {version, data}, one record per tab and part ---
+const snapshotStore = (() => {
+    if (!DATA_PATCHES || typeof indexedDB === 'undefined') return null;
+    let db = null;
+    const open = () => db || (db = new Promise((resolve, reject) => {
+        const req = indexedDB.open('dashboard-data', 1);
+        req.onupgradeneeded = () => req.result.createObjectStore('shards');
+        req.onsuccess = () => resolve(req.result);
+        req.onerror = () => reject(req.error);
+    }));
+    const run = (mode, fn) => open().then(conn => new Promise((resolve, reject) => {
+        const tx = conn.transaction('shards', mode);
+        const req = fn(tx.objectStore('shards'));
+        tx.oncomplete = () => resolve(req.result);
+        tx.onerror = () => reject(tx.error);
+    }));
+    return {
+        get: (key) => run('readonly', store => store.get(key)),
+        // The store is open by the time this runs, so put() clones the data before callers can mutate it
+        put: (key, value) => run('readwrite', store => store.put(value, key)),
+    };
+})();
+
+// One patch file covers every tab and part; fetch each once
+const patchRequests = {};
+const fetchPatch = (url) => {
+    if (!patchRequests[url]) {
+        patchRequests[url] = fetchJson(url);
+        patchRequests[url].catch(() => { delete patchRequests[url]; });
+    }
+    return patchRequests[url];
+};
+
+// Apply one patch section (patches.py: diff_rows / diff_map) to a part's data
+const applyPatch = (part, data, patch) => {
+    if (part !== 'models') {
+        Object.assign(data, patch.set);
+        (patch.removed || []).forEach(id => { delete data[id]; });
+        return data;
+    }
+    const removed = new Set(patch.removed);
+    let rows = data.filter(m => !removed.has(m.id));
+    for (const m of rows) {
+        const change = patch.changed && patch.changed[m.id];
+        if (!change) continue;
+        Object.assign(m, change.set);
+        (change.unset || []).forEach(k => { delete m[k]; });
+    }
+    const added = patch.added || [];
+    if (patch.order) {
+        const byId = new Map(rows.map(m => [m.id, m]));
+        added.forEach(([, m]) => byId.set(m.id, m));
+        rows = patch.order.map(id => byId.get(id));
+        if (rows.includes(undefined)) throw new Error('Patch order names an unknown model');
+    } else {
+        added.forEach(([i, m]) => rows.splice(i, 0, m));
+    }
+    return rows;
+};
+
+// The stored copy of a part, brought up to this build's version; null when it can't be
+const patchedShard = async (tab, part, stored) => {
+    const start = DATA_PATCHES.chain.findIndex(([from]) => from === stored.version);
+    if (start < 0) return null;  // older than the chain: cheaper to take the full shard
+    let data = stored.data;
+    for (const [, url] of DATA_PATCHES.chain.slice(start)) {
+        const patch = ((await fetchPatch(url)).shards[tab] || {})[part];
+        if (!patch) continue;
+        if (patch.full) return null;
+        data = applyPatch(part, data, patch);
+    }
+    if (part === 'models' && data.length !== window.dataShards[tab].count) return null;
+    return data;
+};
+
+const loadStoredShard = async (tab, part, url) => {
+    const key = tab + ':' + part;
+    const stored = await snapshotStore.get(key).catch(() => null);
+    if (stored && stored.version === DATA_PATCHES.version) return stored.data;
+    let data = null;
+    if (stored) {
+        try {
+            data = await patchedShard(tab, part, stored);
+        } catch (e) {
+            console.warn(`Patching ${key} failed; loading the full shard.`, e);
+        }
+    }
+    if (!data) {
+        try {
+            data = await fetchJson(url);
+        } catch (e) {
+            // Offline with an older copy: show it, but don't record it as current
+            if (stored) return (await snapshotStore.get(key)).data;
+            throw e;
+        }
+    }
+    snapshotStore.put(key, { version: DATA_PATCHES.version, data }).catch(() => {});
+    return data;
+};
+
+// Fetch one chunk ('models' | 'descriptions' | 'endpoints' | 'search') of a tab, once
+const loadShard = (tab, part) => {
+    const key = tab + ':' + part;
+    if (!shardRequests[key]) {
+        const url = window.dataShards[tab] && window.dataShards[tab][part];
+        shardRequests[key] = !url ? Promise.resolve(part === 'models' ? [] : {})
+            : snapshotStore && PATCHED_PARTS.includes(part) ? loadStoredShard(tab, part, url)
+            : fetchJson(url);
+        // Let a failed request be retried on the next call
+        shardRequests[key].catch(() => { delete shardRequests[key]; });
+    }
+    return shardRequests[key];
+};
+
+// Live provider endpoints: concurrent lookups of one model share a request, and answers
+// are reused for ENDPOINTS_LIVE_TTL seconds (sw.js also keeps them across visits)
+const liveEndpoints = new Map();
+const fetchLiveEndpoints = (modelId) => {
+    const hit = liveEndpoints.get(modelId);
+    if (hit && Date.now() - hit.at < ENDPOINTS_LIVE_TTL * 1000) return hit.request;
+    const request = fetch(`${API_BASE}/models/${modelId}/endpoints`).then(async (res) => {
+        if (!res.ok) throw new Error(`${res.status} loading endpoints for ${modelId}`);
+        const json = await res.json();
+        return (json.data && json.data.endpoints) ? json.data.endpoints : [];
+    });
+    liveEndpoints.set(modelId, { at: Date.now(), request });
+    request.catch(() => liveEndpoints.delete(modelId));
+    return request;
+};
+
+// Repeat visits are served by the service worker (cached, revalidated in the background) and work offline
+if (typeof navigator !== 'undefined' && 'serviceWorker' in navigator && ASSETS.sw && location.protocol.startsWith('http')) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register(ASSETS.sw).catch(e => console.warn('Service worker registration failed.', e));
+    });
+}
+
+// --- Query engine: runs in worker.js, or on the main thread when workers are unavailable ---
+const queryClient = (() => {
+    // The local engine mirrors everything sent to the worker so it can take over at any time
+    const local = DashboardQuery.createQueryEngine(CAP_BITS);
+    const pending = new Map();
+    let worker = null;
+    let nextId = 0;
+
+    const fallBack = (e) => {
+        console.warn('Query worker unavailable; filtering on the main thread.', e);
+        worker = null;
+        pending.forEach(job => job.resolve(local.run(job.query)));
+        pending.clear();
+    };
+
+    try {
+        worker = new Worker(ASSETS.worker);
+        worker.onmessage = ({ data }) => {
+            const job = pending.get(data.id);
+            pending.delete(data.id);
+            if (job) job.resolve(data);
+        };
+        worker.onerror = fallBack;
+        worker.postMessage({ type: 'init', capBits: CAP_BITS, queryUrl: new URL(ASSETS.query, location.href).href });
+    } catch (e) {
+        worker = null;
+    }
+
+    const post = (msg) => { if (worker) worker.postMessage(msg); };
+    return {
+        setModels(tab, models) {
+            local.setModels(tab, models);
+            post({ type: 'models', tab, models });
+        },
+        setDescriptions(tab, descriptions) {
+            local.setDescriptions(tab, descriptions);
+            post({ type: 'descriptions', tab, descriptions });
+        },
+        setSearchIndex(tab, index) {
+            local.setSearchIndex(tab, index);
+            post({ type: 'searchIndex', tab, index });
+        },
+        hasSearchIndex: (tab) => local.hasSearchIndex(tab),
+        // Resolves to {order, maxPrice, maxCache}
+        run(query) {
+            if (!worker) return Promise.resolve(local.run(query));
+            const id = ++nextId;
+            return new Promise(resolve => {
+                pending.set(id, { resolve, query });
+                worker.postMessage({ type: 'query', id, query });
+            });
+        }
+    };
+})();
+
+async function ensureModels(tab) {
+    if (!window.openRouterModels[tab]) {
+        const models = await loadShard(tab, 'models');
+        if (!window.openRouterModels[tab]) {
+            window.openRouterModels[tab] = models;
+            queryClient.setModels(tab, models);
+        }
+    }
+    return window.openRouterModels[tab];
+}
+
+async function ensureDescriptions(tab) {
+    const models = await ensureModels(tab);
+    if (descriptionsLoaded.has(tab)) return false;
+    const desc = await loadShard(tab, 'descriptions');
+    if (descriptionsLoaded.has(tab)) return false;
+    models.forEach(m => { m.description = desc[m.id] || ''; });
+    queryClient.setDescriptions(tab, desc);
+    descriptionsLoaded.add(tab);
+    return true;
+}
+
+// The search index is only fetched once someone types into the search box
+async function ensureSearchIndex(tab) {
+    await ensureModels(tab);
+    if (queryClient.hasSearchIndex(tab)) return false;
+    const raw = await loadShard(tab, 'search');
+    if (queryClient.hasSearchIndex(tab)) return false;
+    queryClient.setSearchIndex(tab, raw);
+    return true;
+}
+
+const debounce = (fn, ms) => {
+    let timer = null;
+    return (...args) => {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn(...args), ms);
+    };
+};
+
+const formatPrice = (p) => {
+    if (p === 0) return 'Free';
+    if (p < 0.01) return '$' + p.toFixed(6);
+    return '$' + p.toFixed(4);
+};
+
+const strategies = {
+    text: {
+        getPrice: (m, type) => type === 'input' ? m.pin : type === 'output' ? m.pout : m.price,
+        getCachePrice: (m) => m.pcache,
+        renderPrice: (m, max) => {
+            const inp = strategies.text.getPrice(m, 'input');
+            const out = strategies.text.getPrice(m, 'output');
+            const avg = strategies.text.getPrice(m, 'avg');
+            const pct = max > 0 ? (avg / max) * 100 : 0;
+            return `<div class="price-bridge" title="Avg: ${formatPrice(avg)}">
+        <div class="price-bridge-top">
+            <div class="price-value-group">
+                <span class="price-value-num">${formatPrice(inp)}</span>
+                <span class="price-value-label">In</span>
+            </div>
+            <div class="price-bridge-avg-info">Avg ${formatPrice(avg)}</div>
+            <div class="price-value-group" style="text-align: right;">
+                <span class="price-value-num">${formatPrice(out)}</span>
+                <span class="price-value-label">Out</span>
+            </div>
+        </div>
+        <div class="rel-bar-container">
+            <div class="rel-bar-bg"><div class="rel-bar-fill ${getBarColor(pct)}" style="width:${pct}%"></div></div>
+        </div>
+    </div>`;
+        },
+        renderCache: (m, max) => {
+            const cache = strategies.text.getCachePrice(m);
+            if (cache === null) return `<span style="opacity:0.3">—</span>`;
+            const pct = max > 0 ? (cache / max) * 100 : 0;
+            return `<div class="price-cell">
+        <div class="price-val">${formatPrice(cache)}</div>
+        <div class="rel-bar-container"><div class="rel-bar-bg"><div class="rel-bar-fill ${getBarColor(pct)}" style="width:${pct}%"></div></div></div>
+    </div>`;
+        },
+        renderCaps: (m) => {
+            const badges = [];
+            if (m.caps & CAP_BITS.hasReasoning) badges.push('<span class="feature-badge feat-reasoning">Reasoning</span>');
+            if (m.caps & CAP_BITS.hasVision) badges.push('<span class="feature-badge feat-vision">Vision</span>');
+            if (m.caps & CAP_BITS.hasTools) badges.push('<span class="feature-badge feat-func">Tools</span>');
+            if (m.caps & CAP_BITS.hasJSON) badges.push('<span class="feature-badge feat-json">JSON</span>');
+            if (m.caps & CAP_BITS.hasCache) badges.push('<span class="feature-badge feat-cache">Cache</span>');
+            return `<div class="feature-tags">${badges.join('') || '—'}</div>`;
+        }
+    },
+    image: {
+        getPrice: (m) => m.price,
+        renderPrice: (m, max) => {
+            const p = strategies.image.getPrice(m);
+            const pct = max > 0 ? (p / max) * 100 : 0;
+            return `<div class="price-cell">
+        <div class="price-val">${formatPrice(p)} / img</div>
+        <div class="rel-bar-container"><div class="rel-bar-bg"><div class="rel-bar-fill ${getBarColor(pct)}" style="width:${pct}%"></div></div></div>
+    </div>`;
+        }
+    },
+    embedding: {
+        getPrice: (m) => m.price,
+        renderPrice: (m, max) => {
+            const p = strategies.embedding.getPrice(m);
+            const pct = max > 0 ? (p / max) * 100 : 0;
+            return `<div class="price-cell">
+        <div class="price-val">${formatPrice(p)} / 1M</div>
+        <div class="rel-bar-container"><div class="rel-bar-bg"><div class="rel-bar-fill ${getBarColor(pct)}" style="width:${pct}%"></div></div></div>
+    </div>`;
+        }
+    }
+};
+
+const headers = {
+    text: [
+        { key: 'name', label: 'Model', class: 'col-model' },
+        { key: 'price_combined', label: 'Pricing ($/1M)', class: 'col-combined-price' },
+        { key: 'cache', label: 'Cache Hit', class: 'col-cache' },
+        { key: 'context', label: 'Ctx', class: 'col-ctx' },
+        { key: 'caps', label: 'Caps', class: 'col-caps' }
+    ],
+    image: [{ key: 'name', label: 'Model', class: 'col-model' }, { key: 'price', label: 'Price', class: 'col-price' }],
+    embedding: [{ key: 'name', label: 'Model', class: 'col-model' }, { key: 'price', label: 'Price', class: 'col-price' }, { key: 'context', label: 'Context', class: 'col-ctx' }]
+};
+
+function getBarColor(p) { return p < 20 ? 'bar-low' : p < 60 ? 'bar-med' : 'bar-high'; }
+
+const getMinContext = () => {
+    const el = document.getElementById('minContext');
+    const val = el ? parseInt(el.value, 10) : 0;
+    return Number.isFinite(val) ? val : 0;
+};
+
+const getMaxAvgPrice = () => {
+    const el = document.getElementById('maxAvgPrice');
+    if (!el) return null;
+    const val = parseFloat(el.value);
+    return Number.isFinite(val) ? val : null;
+};
+
+function updateRangeControlsVisibility() {
+    const range = document.getElementById('rangeControls');
+    if (!range) return;
+    range.style.display = currentTab === 'text' ? 'flex' : 'none';
+}
+
+function setCheapestSort() {
+    if (currentTab !== 'text') return;
+    sortKey = 'price_avg';
+    sortAsc = true;
+    renderTable();
+}
+
+function setNewestSort() {
+    sortKey = 'created';
+    sortAsc = false;
+    renderTable();
+}
+
+function setFastestSort() {
+    sortKey = 'throughput';
+    sortAsc = false;
+    renderTable();
+}
+
+function setLowestLatencySort() {
+    sortKey = 'latency';
+    sortAsc = true;
+    renderTable();
+}
+
+function setCostSort(value) {
+    if (currentTab !== 'text' || value === '') return;
+    sortKey = 'cost:' + value;
+    sortAsc = true;
+    renderTable();
+}
+
+function setContextPriceSort() {
+    if (currentTab !== 'text') return;
+    sortKey = 'context_price';
+    sortAsc = true;
+    renderTable();
+}
+
+async function switchTab(t) {
+    currentTab = t; 
+    activeFilters.clear(); 
+    sortKey = t === 'text' ? 'price_avg' : 'price';
+    sortAsc = true;
+    renderFilters(); 
+    updateRangeControlsVisibility(); 
+    document.querySelectorAll('.tab-btn').forEach(b => b.classList.toggle('active', b.innerText.toLowerCase().includes(t)));
+
+    // First visit to a tab: fetch its shard before the first render
+    if (!window.openRouterModels[t]) {
+        const tbody = document.getElementById('tableBody');
+        view = null;
+        renderSeq++;
+        tbody.innerHTML = '<tr><td colspan="5"><div class="loading-text">Loading models...</div></td></tr>';
+        try {
+            await ensureModels(t);
+        } catch (e) {
+            console.error(e);
+            tbody.innerHTML = '<tr><td colspan="5"><div style="color:var(--secondary); padding:10px;">Error loading model data. Please reload.</div></td></tr>';
+            return;
+        }
+        if (currentTab !== t) return;
+    }
+    renderTable();
+
+    // Descriptions are not needed for first paint; pull them in afterwards
+    ensureDescriptions(t).then(loaded => { if (loaded && currentTab === t) renderTable(); }).catch(console.error);
+}
+
+function toggleFilter(fid) {
+    if (activeFilters.has(fid)) {
+        activeFilters.delete(fid);
+    } else {
+        // Exclusivity logic
+        if (fid === 'isFree') activeFilters.delete('isPaid');
+        if (fid === 'isPaid') activeFilters.delete('isFree');
+        
+        activeFilters.add(fid);
+    }
+    renderFilters(); 
+    renderTable();
+}
+
+function clearFilters() {
+    activeFilters.clear();
+    renderFilters();
+    renderTable();
+}
+
+const renderFilters = () => {
+    const bar = document.getElementById('filterBar');
+    const groups = [];
+    
+    if (currentTab === 'text') {
+        // Text Features
+        groups.push({ group: 'Pricing', items: [
+            { id: 'isFree', label: '🆓 Free' }, 
+            { id: 'isPaid', label: '💰 Paid' }
+        ]});
+        groups.push({ group: 'Features', items: [
+            { id: 'hasReasoning', label: '🧠 Reasoning' }, 
+            { id: 'hasVision', label: '👁️ Vision' }, 
+            { id: 'hasAudio', label: '🎵 Audio' },
+            { id: 'hasVideo', label: '📺 Video' },
+            { id: 'hasTools', label: '🛠️ Tools' },
+            { id: 'hasJSON', label: '📋 JSON' },
+            { id: 'hasCache', label: '⚡ Caching' },
+            { id: 'hasLogprobs', label: '📊 Logprobs' }
+        ]});
+
+        // dynamic providers
+        const providers = window.providerOptions.slice(0, 30).map(p => ({
+            id: 'prov_' + p,
+            label: p.split('-').map(w => w.charAt(0).toUpperCase() + w.slice(1)).join(' ')
+        }));
+        groups.push({ group: 'Providers', items: providers });
+    } else {
+        groups.push({ group: 'Status', items: [
+            { id: 'isFree', label: '🆓 Free' },
+            { id: 'isPaid', label: '💰 Paid' }
+        ] });
+    }
+    // Frontier membership is precomputed per category at build time (skyline.py)
+    groups.push({ group: 'Trade-off', items: [
+        { id: 'isPareto', label: '🎯 Non-dominated only' }
+    ] });
+    
+    bar.innerHTML = groups.map(g => {
+        if (g.group === 'Pricing') {
+            return `
+                <div class="filter-group">
+                    <div class="filter-group-label">${g.group}</div>
+                    <div class="filter-segment">
+                        ${g.items.map(f => `
+                            <div class="filter-segment-item ${activeFilters.has(f.id) ? 'active' : ''}" 
+                                 onclick="toggleFilter('${f.id}')">
+                                ${f.label}<span class="filter-count" data-fid="${f.id}"></span>
+                            </div>
+                        `).join('')}
+                    </div>
+                </div>
+            `;
+        }
+        return `
+            <div class="filter-group">
+                <div class="filter-group-label">${g.group}</div>
+                ${g.items.map(f => `
+                    <div class="filter-item ${activeFilters.has(f.id) ? 'active' : ''}" onclick="toggleFilter('${f.id}')">${f.label}<span class="filter-count" data-fid="${f.id}"></span></div>
+                `).join('')}
+            </div>
+        `;
+    }).join('');
+
+    filterCountEls = new Map();
+    bar.querySelectorAll('.filter-count').forEach(el => filterCountEls.set(el.dataset.fid, el));
+    updateFilterCounts(filterCounts[currentTab] || window.FACETS[currentTab]);
+}
+
+// --- Facet counts: how many rows each chip would leave if it were added ---
+// Seeded from the build-time facets, then refreshed from every query result.
+let filterCountEls = new Map();
+const filterCounts = {};
+
+function updateFilterCounts(counts) {
+    if (!counts) return;
+    filterCountEls.forEach((el, fid) => {
+        const n = fid.startsWith('prov_') ? (counts.providers[fid.slice(5)] || 0) : (counts.caps[fid] || 0);
+        const text = ` ${n}`;
+        // Only touch chips whose count actually changed
+        if (el.textContent === text) return;
+        el.textContent = text;
+        el.parentNode.classList.toggle('is-empty', n === 0);
+    });
+}
+
+// Typing and the price box re-query only once input pauses
+const renderTableDebounced = debounce(renderTable, INPUT_DEBOUNCE_MS);
+
+function onSearchInput() {
+    const hasTerm = document.getElementById('searchInput').value.trim() !== '';
+    // Rank by relevance while searching; restore the previous sort when the box is cleared
+    if (hasTerm && !sortBeforeSearch) {
+        sortBeforeSearch = [sortKey, sortAsc];
+        sortKey = 'relevance';
+    } else if (!hasTerm && sortBeforeSearch) {
+        if (sortKey === 'relevance') [sortKey, sortAsc] = sortBeforeSearch;
+        sortBeforeSearch = null;
+    }
+    renderTableDebounced();
+}
+
+function handleSort(key) {
+    if (key === 'price_combined') {
+        if (sortKey === 'price_avg') sortKey = 'price_input';
+        else if (sortKey === 'price_input') sortKey = 'price_output';
+        else sortKey = 'price_avg';
+        sortAsc = true;
+    } else {
+        if (sortKey === key) sortAsc = !sortAsc; else { sortKey = key; sortAsc = true; }
+    }
+    renderTable();
+}
+
+function renderHeader() {
+    const cols = headers[currentTab];
+    document.getElementById('tableHead').innerHTML = `<tr>${cols.map(c => {
+        let label = c.label;
+        const isPriceCombined = c.key === 'price_combined';
+        if (isPriceCombined) {
+            const activeIn = sortKey === 'price_input' ? 'active-sort' : '';
+            const activeAvg = sortKey === 'price_avg' ? 'active-sort' : '';
+            const activeOut = sortKey === 'price_output' ? 'active-sort' : '';
+            label = `Pricing ($/1M) <div class="price-header-sort">
+                <span class="${activeIn}" onclick="event.stopPropagation(); handleSort('price_input')">In</span> | 
+                <span class="${activeAvg}" onclick="event.stopPropagation(); handleSort('price_avg')">Avg</span> | 
+                <span class="${activeOut}" onclick="event.stopPropagation(); handleSort('price_output')">Out</span>
+            </div>`;
+        }
+        const isActive = sortKey === c.key || (isPriceCombined && sortKey.startsWith('price_'));
+        const icon = isActive ? (sortAsc ? '▲' : '▼') : '';
+        return `<th class="${c.class}" onclick="handleSort('${c.key}')">${label} ${icon}</th>`;
+    }).join('')}</tr>`;
+}
+
+// Current result set: {tab, models, order (model indices in display order), maxPrice, maxCache, sig}
+let view = null;
+let renderSeq = 0;
+
+async function renderTable() {
+    const tab = currentTab;
+    const seq = ++renderSeq;
+    renderHeader();
+
+    const term = document.getElementById('searchInput').value;
+    if (term.trim() && !queryClient.hasSearchIndex(tab)) {
+        // Substring matching until the index arrives, then re-rank
+        ensureSearchIndex(tab).then(added => {
+            if (added && currentTab === tab && document.getElementById('searchInput').value.trim()) renderTable();
+        }).catch(console.error);
+    }
+
+    const { order, maxPrice, maxCache, counts } = await queryClient.run({
+        tab,
+        term,
+        filters: [...activeFilters],
+        minContext: tab === 'text' ? getMinContext() : 0,
+        maxAvgPrice: tab === 'text' ? getMaxAvgPrice() : null,
+        sortKey,
+        sortAsc
+    });
+    // A newer render started while this one was waiting on the worker
+    if (seq !== renderSeq) return;
+
+    filterCounts[tab] = counts;
+    updateFilterCounts(counts);
+
+    // Update visible count in UI
+    const countInfo = document.querySelector('.meta');
+    if (countInfo) {
+        const baseText = countInfo.innerHTML.split(' | ')[0];
+        countInfo.innerHTML = `${baseText} | <strong>Showing ${order.length} models</strong>`;
+    }
+
+    // Rows whose signature is unchanged keep their markup; the bars depend on the maxima
+    const sig = `${maxPrice}|${maxCache}|${descriptionsLoaded.has(tab)}|${sortKey.startsWith('cost:') ? sortKey : ''}`;
+    view = { tab, models: window.openRouterModels[tab] || [], order, maxPrice, maxCache, sig };
+    offsets = null;
+    renderWindow();
+}
+
+// Daily cost of the workload profile being sorted by, if any
+function costLine(m) {
+    if (!sortKey.startsWith('cost:') || !m.cost) return '';
+    const p = +sortKey.slice(5);
+    const c = m.cost[p];
+    if (c == null) return '';
+    return `<div class="model-perf">💵 ≈ $${c < 100 ? c.toFixed(2) : Math.round(c).toLocaleString()}/day (${COST_PROFILES[p].name})</div>`;
+}
+
+function renderRowCells(m, maxPrice, maxCache) {
+    const strat = strategies[currentTab];
+    const created = m.created || 0;
+    const isNew = created > (Date.now() / 1000 - 30 * 24 * 60 * 60);
+    const desc = m.description || '';
+
+    const modelCell = `
+        <td>
+            <div style="display: flex; align-items: center; gap: 4px;">
+                <a href="https://openrouter.ai/models/${m.id}" target="_blank" class="model-name" onclick="event.stopPropagation()">${m.name}</a>
+                ${isNew ? '<span class="new-badge">NEW</span>' : ''}
+            </div>
+            <div class="model-id">${m.id}</div>
+            ${costLine(m)}
+            ${m.tps != null || m.lat != null ? `<div class="model-perf"${perfTitle(m)}>${m.tps != null ? `🚀 ${Math.round(m.tps)} tok/s` : ''}${m.tps != null && m.lat != null ? ' · ' : ''}${m.lat != null ? `⏱️ ${Math.round(m.lat)} ms` : ''}</div>` : ''}
+            ${desc ? `<div class="model-description" title="Click to expand" onclick="event.stopPropagation(); this.classList.toggle('expanded'); scheduleWindowRender()">${desc}</div>` : ''}
+        </td>
+    `;
+
+    if (currentTab === 'text') {
+        return `${modelCell}
+                <td>${strat.renderPrice(m, maxPrice)}</td>
+                <td>${strat.renderCache(m, maxCache)}</td>
+                <td>${Math.round(m.ctx / 1024)}k</td>
+                <td>${strat.renderCaps(m)}</td>`;
+    }
+    if (currentTab === 'image') {
+        return `${modelCell}
+                <td>${strat.renderPrice(m, maxPrice)}</td>`;
+    }
+    return `${modelCell}
+            <td>${strat.renderPrice(m, maxPrice)}</td>
+            <td>${Math.round(m.ctx / 1024)}k</td>`;
+}
+
+// --- Virtualized table body ---
+// Row nodes are cached per model and reused across renders and scrolling; heights are
+// measured once a row has been laid out and estimated from the running average before.
+const rowNodes = new Map();    // `${tab}:${id}` -> {row, details, sig}
+const rowHeights = new Map();  // `${tab}:${id}` -> px, model row plus details row
+let measuredTotal = 0;
+let offsets = null;            // offsets[i] = top of the i-th visible row within the body
+let windowRenderPending = false;
+
+const rowKey = (tab, m) => tab + ':' + m.id;
+
+function makeSpacer() {
+    const tr = document.createElement('tr');
+    tr.className = 'spacer-row';
+    tr.appendChild(document.createElement('td'));
+    return tr;
+}
+const topSpacer = makeSpacer();
+const bottomSpacer = makeSpacer();
+
+function setSpacer(spacer, px, colSpan) {
+    const td = spacer.firstChild;
+    td.colSpan = colSpan;
+    td.style.height = px + 'px';
+    spacer.style.display = px > 0 ? '' : 'none';
+}
+
+function setRowHeight(key, px) {
+    measuredTotal += px - (rowHeights.get(key) || 0);
+    rowHeights.set(key, px);
+}
+
+function computeOffsets() {
+    const { tab, models, order } = view;
+    const estimate = rowHeights.size ? measuredTotal / rowHeights.size : ROW_ESTIMATE_PX;
+    offsets = new Float64Array(order.length + 1);
+    for (let i = 0; i < order.length; i++) {
+        offsets[i + 1] = offsets[i] + (rowHeights.get(rowKey(tab, models[order[i]])) || estimate);
+    }
+}
+
+// First index whose bottom edge lies below `y`
+function rowAt(y) {
+    let lo = 0, hi = offsets.length - 1;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (offsets[mid + 1] <= y) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+function getRowEntry(tab, m, cols) {
+    const key = rowKey(tab, m);
+    let entry = rowNodes.get(key);
+    if (!entry) {
+        const row = document.createElement('tr');
+        row.className = 'model-row';
+        row.onclick = () => toggleDetails(m.id, key);
+        const details = document.createElement('tr');
+        details.className = 'details-row';
+        details.innerHTML = `<td colspan="${cols}"><div class="details-content"><div class="desc-area"></div><div class="provider-area"></div></div></td>`;
+        entry = { row, details, sig: null };
+        rowNodes.set(key, entry);
+    }
+    return entry;
+}
+
+function renderWindow() {
+    windowRenderPending = false;
+    if (!view || view.tab !== currentTab) return;
+    const tbody = document.getElementById('tableBody');
+    const { tab, models, order, maxPrice, maxCache, sig } = view;
+    const cols = headers[tab].length;
+    if (!offsets) computeOffsets();
+
+    // Visible slice of the body, relative to the top of the tbody
+    const bodyTop = tbody.getBoundingClientRect().top;
+    const start = rowAt(Math.max(0, -bodyTop - OVERSCAN_PX));
+    const end = Math.min(order.length, rowAt(window.innerHeight - bodyTop + OVERSCAN_PX) + 1);
+
+    const entries = [];
+    for (let i = start; i < end; i++) {
+        const m = models[order[i]];
+        const entry = getRowEntry(tab, m, cols);
+        if (entry.sig !== sig) {
+            entry.row.innerHTML = renderRowCells(m, maxPrice, maxCache);
+            entry.sig = sig;
+        }
+        entries.push(entry);
+    }
+
+    setSpacer(topSpacer, offsets[start], cols);
+    setSpacer(bottomSpacer, offsets[order.length] - offsets[end], cols);
+    const nodes = [topSpacer];
+    entries.forEach(e => nodes.push(e.row, e.details));
+    nodes.push(bottomSpacer);
+    tbody.replaceChildren(...nodes);
+
+    // Measure what was just laid out; only the spacers move when estimates were off
+    let changed = false;
+    for (let i = start; i < end; i++) {
+        const key = rowKey(tab, models[order[i]]);
+        const entry = rowNodes.get(key);
+        const h = entry.row.offsetHeight + entry.details.offsetHeight;
+        if (h && Math.abs(h - (rowHeights.get(key) || 0)) > 1) {
+            setRowHeight(key, h);
+            changed = true;
+        }
+    }
+    if (changed) {
+        computeOffsets();
+        setSpacer(topSpacer, offsets[start], cols);
+        setSpacer(bottomSpacer, offsets[order.length] - offsets[end], cols);
+    }
+
+    if (rowNodes.size > ROW_CACHE_LIMIT) {
+        const live = new Set(entries);
+        for (const [key, entry] of rowNodes) {
+            if (!live.has(entry)) rowNodes.delete(key);
+            if (rowNodes.size <= ROW_CACHE_LIMIT / 2) break;
+        }
+    }
+}
+
+function scheduleWindowRender() {
+    if (windowRenderPending) return;
+    windowRenderPending = true;
+    requestAnimationFrame(() => {
+        // Expanded rows and wrapped descriptions change heights
+        offsets = null;
+        renderWindow();
+    });
+}
+
+window.addEventListener('scroll', () => {
+    if (windowRenderPending || !view) return;
+    windowRenderPending = true;
+    requestAnimationFrame(renderWindow);
+}, { passive: true });
+
+window.addEventListener('resize', () => {
+    // Widths changed, so every measured height is stale
+    rowHeights.clear();
+    measuredTotal = 0;
+    scheduleWindowRender();
+});
+
+async function toggleDetails(modelId, key) {
+    const entry = rowNodes.get(key);
+    if (!entry) return;
+    const row = entry.details;
+    const descArea = row.querySelector('.desc-area');
+    const provArea = row.querySelector('.provider-area');
+    const tab = key.slice(0, key.indexOf(':'));
+
+    if (row.classList.contains('expanded')) {
+        row.classList.remove('expanded');
+        scheduleWindowRender();
+        return;
+    }
+    row.classList.add('expanded');
+    scheduleWindowRender();
+    
+    // 1. Always show description immediately if not already there
+    if (!descArea.innerHTML) {
+        await ensureDescriptions(tab).catch(console.error);
+        const m = window.openRouterModels[tab].find(x => x.id === modelId);
+        descArea.innerHTML = m ? `<div style="margin-bottom: 20px; color: var(--text-main); line-height: 1.6;"><strong>Description:</strong><br>${m.description || 'No description available.'}<div style="margin-top: 8px;"><a href="${modelPageUrl(m.id)}" onclick="event.stopPropagation()">Model page →</a></div></div>` : '';
+        scheduleWindowRender();
+    }
+
+    // 2. Render provider data only once
+    if (provArea.innerHTML && provArea.innerHTML !== '<div class="loading-text">Fetching live provider data...</div>') return;
+
+    // Prefer the endpoints prefetched at build time; only stale or missing entries go live
+    const prefetched = await loadShard(tab, 'endpoints').catch(() => ({}));
+    const local = prefetched[modelId];
+    const isFresh = local && (Date.now() / 1000 - local.fetched_at) < ENDPOINTS_MAX_AGE;
+    if (isFresh) {
+        provArea.innerHTML = renderEndpoints(local.endpoints);
+        scheduleWindowRender();
+        return;
+    }
+    
+    provArea.innerHTML = '<div class="loading-text">Fetching live provider data...</div>';
+    try {
+        provArea.innerHTML = renderEndpoints(await fetchLiveEndpoints(modelId));
+    } catch (e) { 
+        console.error(e); 
+        provArea.innerHTML = local
+            ? renderEndpoints(local.endpoints)
+            : '<div style="color:var(--secondary); padding:10px;">Error loading live data. Please try again.</div>'; 
+    }
+    scheduleWindowRender();
+}
+
+// Rolling p50 / p90 / p99 across providers (merge_stats.py + sketches.py), as a tooltip
+const perfTitle = (m) => {
+    if (!m.perf) return '';
+    const lines = Object.entries(m.perf).map(([win, p]) => {
+        const parts = [];
+        if (p.tps) parts.push(`${p.tps.map(Math.round).join(' / ')} tok/s`);
+        if (p.lat) parts.push(`${p.lat.map(Math.round).join(' / ')} ms`);
+        return `${win} p50 / p90 / p99 (${p.n} samples): ${parts.join(' · ')}`;
+    });
+    return ` title="${lines.join('&#10;')}"`;
+};
+
+// Static per-model pages written by build.py (pages.py: page_slug / model_page)
+const pageSlug = (s) => s.replace(/:/g, '~').replace(/[^A-Za-z0-9._~-]+/g, '_') || '_';
+const modelPageUrl = (id) => {
+    const i = id.indexOf('/');
+    return 'models/' + (i < 0 ? pageSlug(id) : pageSlug(id.slice(0, i)) + '/' + pageSlug(id.slice(i + 1))) + '.html';
+};
+
+const renderEndpoints = (eps) => eps.length ? `<table class="provider-table"><thead><tr><th>Provider</th><th>Price (In/Out)</th><th>Ctx</th><th>Quant</th></tr></thead><tbody>${eps.map(ep => `
+            <tr><td>${ep.provider_name}</td><td>${formatPrice(parseFloat(ep.pricing.prompt) * 1000000)} / ${formatPrice(parseFloat(ep.pricing.completion) * 1000000)}</td><td>${Math.round(ep.context_length / 1024)}k</td><td>${ep.quantization || '—'}</td></tr>`).join('')}</tbody></table>` : 'No details available.';
+
+const priceFacet = window.FACETS.text && window.FACETS.text.price;
+if (priceFacet && priceFacet.p50 !== undefined) {
+    document.getElementById('maxAvgPrice').title = `Median avg price ${formatPrice(priceFacet.p50)}, 90th percentile ${formatPrice(priceFacet.p90)}`;
+}
+
+updateRangeControlsVisibility();
+switchTab('text');
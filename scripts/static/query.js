@@ -0,0 +1,199 @@
+/*
+ * Filtering, sorting and search for the dashboard.
+ *
+ * Loaded by worker.js so the work runs off the main thread, and by the page
+ * itself as a fallback when Web Workers are unavailable. Operates on the
+ * normalized rows written by build.py:normalize_model.
+ */
+(function (global) {
+    'use strict';
+
+    // Must match search_index.TOKEN_RE
+    const tokenize = (text) => (text || '').toLowerCase().match(/[a-z0-9]+(?:\.[0-9]+)*/g) || [];
+
+    const trigramsOf = (t) => {
+        const padded = ` ${t} `;
+        const out = new Set();
+        for (let i = 0; i < padded.length - 2; i++) out.add(padded.slice(i, i + 3));
+        return out;
+    };
+
+    // Query resolver over the prebuilt index (see scripts/search_index.py)
+    function createSearchIndex({ tokens, postings }) {
+        let trigramMap = null; // trigram -> token indices, built on the first fuzzy lookup
+
+        const lowerBound = (prefix) => {
+            let lo = 0, hi = tokens.length;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (tokens[mid] < prefix) lo = mid + 1; else hi = mid;
+            }
+            return lo;
+        };
+
+        // Vocabulary tokens within a small trigram distance of `q`, with a similarity factor
+        const fuzzy = (q) => {
+            if (!trigramMap) {
+                trigramMap = new Map();
+                tokens.forEach((t, i) => trigramsOf(t).forEach(g => {
+                    if (!trigramMap.has(g)) trigramMap.set(g, []);
+                    trigramMap.get(g).push(i);
+                }));
+            }
+            const qGrams = trigramsOf(q);
+            const shared = new Map();
+            qGrams.forEach(g => (trigramMap.get(g) || []).forEach(i => shared.set(i, (shared.get(i) || 0) + 1)));
+            const out = [];
+            shared.forEach((n, i) => {
+                if (Math.abs(tokens[i].length - q.length) > 2) return;
+                const dice = (2 * n) / (qGrams.size + tokens[i].length); // a padded token has length-many trigrams
+                if (dice >= 0.5) out.push([i, 0.5 * dice]);
+            });
+            return out;
+        };
+
+        // Vocabulary matches for one query token: exact > prefix > fuzzy
+        const matchToken = (q) => {
+            const out = [];
+            for (let i = lowerBound(q); i < tokens.length && tokens[i].startsWith(q); i++) {
+                out.push([i, tokens[i] === q ? 1 : 0.8]);
+            }
+            return out.length || q.length < 3 ? out : fuzzy(q);
+        };
+
+        return {
+            // Map of doc index -> score for docs matching every query token, or null for an empty query
+            search(query) {
+                const qTokens = [...new Set(tokenize(query))];
+                if (!qTokens.length) return null;
+                let result = null;
+                for (const q of qTokens) {
+                    const scores = new Map();
+                    for (const [ti, factor] of matchToken(q)) {
+                        const p = postings[ti];
+                        for (let j = 0; j < p.length; j += 2) {
+                            const sc = p[j + 1] * factor;
+                            if (sc > (scores.get(p[j]) || 0)) scores.set(p[j], sc);
+                        }
+                    }
+                    if (result === null) { result = scores; continue; }
+                    for (const [doc, sc] of result) {
+                        if (scores.has(doc)) result.set(doc, sc + scores.get(doc)); else result.delete(doc);
+                    }
+                }
+                return result;
+            }
+        };
+    }
+
+    // Numeric sort keys; 'context_price' and 'relevance' are handled separately
+    const SORT_FIELDS = {
+        price_input: 'pin',
+        price_output: 'pout',
+        price_avg: 'price',
+        price: 'price',
+        name: 'key',
+        context: 'ctx',
+        created: 'created',
+        throughput: 'tps',
+        latency: 'lat',
+    };
+
+    function createQueryEngine(capBits) {
+        const tabs = {};
+        const capNames = Object.keys(capBits);
+        const bitCount = Math.max(...Object.values(capBits)).toString(2).length;
+        const tabState = (tab) => tabs[tab] || (tabs[tab] = { models: [], descKeys: null, index: null });
+
+        // Filter ids are capability bits or 'prov_<provider>'
+        const checkFilter = (m, fid) => {
+            if (fid in capBits) return (m.caps & capBits[fid]) !== 0;
+            if (fid.startsWith('prov_')) return m.provider === fid.slice(5);
+            return false;
+        };
+
+        return {
+            setModels(tab, models) { tabState(tab).models = models; },
+            setDescriptions(tab, desc) {
+                const st = tabState(tab);
+                st.descKeys = st.models.map(m => (desc[m.id] || '').toLowerCase());
+            },
+            setSearchIndex(tab, raw) { tabState(tab).index = createSearchIndex(raw); },
+            hasSearchIndex(tab) { return !!tabState(tab).index; },
+
+            /*
+             * Run one query: {tab, term, filters, minContext, maxAvgPrice, sortKey, sortAsc}.
+             * Returns {order: Int32Array of model indices, maxPrice, maxCache, counts}, where
+             * counts = {caps: {flag: n}, providers: {provider: n}} over the matched rows, i.e.
+             * how many results each filter chip would leave if it were added.
+             */
+            run(q) {
+                const st = tabState(q.tab);
+                const models = st.models;
+                const term = (q.term || '').trim().toLowerCase();
+                const hits = term && st.index ? st.index.search(term) : null;
+                const scores = new Float64Array(models.length);
+                const matched = [];
+                const bitCounts = new Int32Array(bitCount);
+                const providers = {};
+                let maxPrice = 0.000001, maxCache = 0.000001;
+
+                for (let i = 0; i < models.length; i++) {
+                    const m = models[i];
+                    if (hits) {
+                        if (!hits.has(i)) continue;
+                        scores[i] = hits.get(i);
+                    } else if (term && !m.key.includes(term) && !(st.descKeys && st.descKeys[i].includes(term))) {
+                        // Index not loaded yet: plain substring match
+                        continue;
+                    }
+                    if (m.ctx < q.minContext) continue;
+                    if (q.maxAvgPrice !== null && m.price > q.maxAvgPrice) continue;
+                    let ok = true;
+                    for (const fid of q.filters) if (!checkFilter(m, fid)) { ok = false; break; }
+                    if (!ok) continue;
+
+                    matched.push(i);
+                    if (m.price > maxPrice) maxPrice = m.price;
+                    if (m.pcache > maxCache) maxCache = m.pcache;
+                    // Facet counts accumulate in the same pass, one step per set bit
+                    for (let caps = m.caps; caps; caps &= caps - 1) bitCounts[31 - Math.clz32(caps & -caps)]++;
+                    if (m.provider) providers[m.provider] = (providers[m.provider] || 0) + 1;
+                }
+
+                const dir = q.sortAsc ? 1 : -1;
+                let cmp;
+                if (q.sortKey === 'context_price') {
+                    cmp = (a, b) => (models[b].ctx - models[a].ctx) || (models[a].price - models[b].price);
+                } else if (q.sortKey === 'relevance') {
+                    cmp = (a, b) => (scores[b] - scores[a]) || (models[a].price - models[b].price);
+                } else if (q.sortKey.startsWith('cost:')) {
+                    // Precomputed daily cost of a standard workload (build.py); unpriced models last
+                    const p = +q.sortKey.slice(5);
+                    const cost = i => (models[i].cost ? models[i].cost[p] : null);
+                    cmp = (a, b) => {
+                        const vA = cost(a), vB = cost(b);
+                        if (vA == null || vB == null) return (vA == null) - (vB == null);
+                        return (vA - vB) * dir;
+                    };
+                } else if (SORT_FIELDS[q.sortKey]) {
+                    const f = SORT_FIELDS[q.sortKey];
+                    cmp = (a, b) => {
+                        const vA = models[a][f], vB = models[b][f];
+                        // Models without merged stats have no tps/lat; keep them last either way
+                        if ((vA == null || vB == null) && (f === 'tps' || f === 'lat')) return (vA == null) - (vB == null);
+                        const nA = vA || 0, nB = vB || 0;
+                        return nA < nB ? -dir : nA > nB ? dir : 0;
+                    };
+                }
+                if (cmp) matched.sort(cmp);
+
+                const caps = {};
+                for (const name of capNames) caps[name] = bitCounts[31 - Math.clz32(capBits[name])];
+                return { order: Int32Array.from(matched), maxPrice, maxCache, counts: { caps, providers } };
+            }
+        };
+    }
+
+    global.DashboardQuery = { tokenize, createSearchIndex, createQueryEngine };
+})(typeof self !== 'undefined' ? self : this);
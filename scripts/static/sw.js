@@ -0,0 +1,141 @@
+/*
+ * Service worker for the dashboard.
+ *
+ * build.py prepends `self.ASSET_MANIFEST = {...}` (the same JSON it writes
+ * to asset-manifest.json): the build version, every file of the build and
+ * the TTL for live endpoint responses. A new build therefore changes this
+ * file's bytes, which is what makes the browser install the new worker.
+ *
+ *   - install precaches the build's files into `dashboard-<version>`, except
+ *     the `lazy` shards: the page keeps those in IndexedDB and updates them
+ *     with small patches, so they are only fetched when it asks for them
+ *   - the page, scripts and precached shards are served stale-while-revalidate:
+ *     straight from cache, refreshed in the background
+ *   - lazy shards are fetched from the network, falling back to this
+ *     build's cached copy offline
+ *   - live `/models/{id}/endpoints` responses are cached for `endpointsTtl`
+ *     seconds, and concurrent requests for one URL share a single fetch
+ *   - activate drops all but the current and previous build caches, so a
+ *     page still showing the previous build keeps its files
+ */
+const MANIFEST = self.ASSET_MANIFEST;
+const CACHE_PREFIX = 'dashboard-';
+const STATIC_CACHE = CACHE_PREFIX + MANIFEST.version;
+const ENDPOINTS_CACHE = 'dashboard-endpoints';
+const FETCHED_AT_HEADER = 'x-sw-fetched-at';
+const KEEP_BUILDS = 2;
+
+const scopeUrl = (path) => new URL(path, self.registration.scope).href;
+const INDEX_URL = scopeUrl('./');
+const BUILD_FILES = new Set(MANIFEST.files.map(scopeUrl));
+const LAZY_FILES = new Set((MANIFEST.lazy || []).map(scopeUrl));
+const ENDPOINTS_PATH = /\/models\/.+\/endpoints$/;
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(STATIC_CACHE);
+        // Fetch past the HTTP cache so the new build never precaches a stale copy
+        await cache.addAll([INDEX_URL, ...BUILD_FILES].map(url => new Request(url, { cache: 'reload' })));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        const builds = (await caches.keys()).filter(name => name.startsWith(CACHE_PREFIX) && name !== ENDPOINTS_CACHE);
+        // caches.keys() lists caches in creation order; keep the newest builds
+        const keep = new Set([STATIC_CACHE, ...builds.filter(n => n !== STATIC_CACHE).slice(-(KEEP_BUILDS - 1))]);
+        await Promise.all(builds.filter(name => !keep.has(name)).map(name => caches.delete(name)));
+        await self.clients.claim();
+    })());
+});
+
+// --- Stale-while-revalidate for the page and everything the build published ---
+const revalidations = new Map();
+
+const revalidate = (request, key) => {
+    if (!revalidations.has(key)) {
+        const done = fetch(request).then(async (response) => {
+            if (response.ok) await (await caches.open(STATIC_CACHE)).put(key, response.clone());
+            return response;
+        }).finally(() => revalidations.delete(key));
+        revalidations.set(key, done);
+    }
+    return revalidations.get(key);
+};
+
+const staleWhileRevalidate = async (event, key) => {
+    // This build's copy first; caches.match() alone would search older builds first
+    const cached = await (await caches.open(STATIC_CACHE)).match(key) || await caches.match(key);
+    const fresh = revalidate(event.request, key);
+    if (cached) {
+        event.waitUntil(fresh.catch(() => {}));
+        return cached;
+    }
+    return fresh.then(r => r.clone());
+};
+
+// Never another build's copy: the page would store it as this build's data
+const networkFirst = async (event, key) => {
+    const cache = await caches.open(STATIC_CACHE);
+    try {
+        const response = await fetch(event.request);
+        if (response.ok) event.waitUntil(cache.put(key, response.clone()));
+        return response;
+    } catch (e) {
+        const cached = await cache.match(key);
+        if (cached) return cached;
+        throw e;
+    }
+};
+
+// --- TTL cache with in-flight dedup for live provider endpoints ---
+const endpointRequests = new Map();
+
+const fetchEndpoints = (request) => {
+    const url = request.url;
+    if (!endpointRequests.has(url)) {
+        const done = (async () => {
+            const cache = await caches.open(ENDPOINTS_CACHE);
+            const cached = await cache.match(url);
+            const fetchedAt = cached ? Number(cached.headers.get(FETCHED_AT_HEADER)) : 0;
+            if (cached && Date.now() / 1000 - fetchedAt < MANIFEST.endpointsTtl) return cached;
+            try {
+                const response = await fetch(request);
+                if (!response.ok) return cached || response;
+                const headers = new Headers(response.headers);
+                headers.set(FETCHED_AT_HEADER, String(Math.floor(Date.now() / 1000)));
+                const body = await response.arrayBuffer();
+                await cache.put(url, new Response(body, { status: response.status, statusText: response.statusText, headers }));
+                return new Response(body, { status: response.status, statusText: response.statusText, headers });
+            } catch (e) {
+                // Offline: an expired answer beats none
+                if (cached) return cached;
+                throw e;
+            }
+        })().finally(() => endpointRequests.delete(url));
+        endpointRequests.set(url, done);
+    }
+    // Every waiting page gets its own copy of the shared response body
+    return endpointRequests.get(url).then(r => r.clone());
+};
+
+self.addEventListener('fetch', (event) => {
+    const { request } = event;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+
+    if (MANIFEST.apiBase && request.url.startsWith(MANIFEST.apiBase) && ENDPOINTS_PATH.test(url.pathname)) {
+        event.respondWith(fetchEndpoints(request));
+        return;
+    }
+    if (request.mode === 'navigate' && (request.url === INDEX_URL || request.url === scopeUrl('index.html'))) {
+        event.respondWith(staleWhileRevalidate(event, INDEX_URL));
+        return;
+    }
+    if (BUILD_FILES.has(url.origin + url.pathname)) {
+        event.respondWith(staleWhileRevalidate(event, url.origin + url.pathname));
+    } else if (LAZY_FILES.has(url.origin + url.pathname)) {
+        event.respondWith(networkFirst(event, url.origin + url.pathname));
+    }
+});
@@ -0,0 +1,32 @@
+/*
+ * Web Worker that runs dashboard queries off the main thread.
+ *
+ * The page sends 'init' (with the URL of query.js and the capability
+ * bits), then each tab's rows, descriptions and search index as they load,
+ * and finally 'query' messages. Each query is answered with the matching
+ * model indices in display order.
+ */
+let engine = null;
+
+self.onmessage = ({ data: msg }) => {
+    switch (msg.type) {
+        case 'init':
+            importScripts(msg.queryUrl);
+            engine = self.DashboardQuery.createQueryEngine(msg.capBits);
+            break;
+        case 'models':
+            engine.setModels(msg.tab, msg.models);
+            break;
+        case 'descriptions':
+            engine.setDescriptions(msg.tab, msg.descriptions);
+            break;
+        case 'searchIndex':
+            engine.setSearchIndex(msg.tab, msg.index);
+            break;
+        case 'query': {
+            const result = engine.run(msg.query);
+            self.postMessage({ type: 'result', id: msg.id, ...result }, [result.order.buffer]);
+            break;
+        }
+    }
+};
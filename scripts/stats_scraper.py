@@ -0,0 +1,294 @@
+"""
+Scraper for the openrouterstats.com throughput/latency table.
+
+The page loads its rows as JSON and renders them into a (possibly
+virtualized) table. Responses are captured as they arrive through
+Playwright, so usually no scrolling is needed at all. Otherwise the
+rendered rows are read in one pass, and the table is scrolled only if the
+site's "N rows" counter says rows are still missing. The scan stops as
+soon as that count is reached or the table bottom is hit.
+
+Progress is checkpointed to data/.cache/, so an interrupted scan picks up
+where it stopped with --resume. --serve DIR points the scraper at a
+local stand-in page (see scripts/fixtures/openrouterstats/).
+"""
+import json
+import os
+import pathlib
+import re
+import sys
+
+from playwright.sync_api import sync_playwright
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from local_server import serve_directory
+from manifest import write_if_changed
+
+# Paths
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+OUTPUT_FILE = DATA_DIR / "openrouterstats_full_scraped.json"
+CHECKPOINT_FILE = DATA_DIR / ".cache" / "stats_scrape.json"
+
+STATS_URL = "https://www.openrouterstats.com/"
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36")
+NAV_TIMEOUT_MS = 90_000
+MAX_SCROLL_STEPS = 500
+
+# Field names seen in row-like JSON objects, mapped onto the scraped row schema
+FIELD_ALIASES = {
+    "model_name": ("model_name", "modelName", "model", "model_id", "modelId", "slug"),
+    "provider": ("provider", "provider_name", "providerName"),
+    "p50_throughput": ("p50_throughput", "throughput_p50", "p50Throughput", "throughput", "tps"),
+    "p50_latency": ("p50_latency", "latency_p50", "p50Latency", "latency",
+                    "p50_latency_ms", "latency_p50_ms", "p50LatencyMs", "latency_ms", "latencyMs",
+                    "p50_latency_s", "latency_p50_s", "latency_s"),
+    "p90_latency": ("p90_latency", "latency_p90", "p90Latency",
+                    "p90_latency_ms", "latency_p90_ms", "p90LatencyMs", "p90_latency_s", "latency_p90_s"),
+}
+# Latency units named by a key's suffix ("latency_ms", "p50LatencyMs", "latency_s")
+LATENCY_KEY_UNITS = (("ms", "ms"), ("_s", "s"), ("sec", "s"), ("seconds", "s"))
+TOTAL_KEYS = ("total", "totalCount", "total_count", "count", "rowCount")
+ROW_COLUMNS = ("model_name", "provider", "p50_throughput", "p50_latency", "p90_latency")
+_ROW_COUNTER = re.compile(r"(\d[\d,]*)\s+rows\b")
+
+# Reads every rendered row (textContent also covers rows scrolled out of view)
+_READ_ROWS_JS = """() => Array.from(document.querySelectorAll('table tbody tr'),
+    r => Array.from(r.cells, c => c.textContent.trim()))"""
+# Scrolls the table by one viewport and resolves after the next paint
+_SCROLL_JS = """(el, top) => {
+    if (top !== null) el.scrollTop = top; else el.scrollBy(0, el.clientHeight);
+    return new Promise(r => requestAnimationFrame(() => requestAnimationFrame(() =>
+        r({top: el.scrollTop, bottom: el.scrollTop + el.clientHeight >= el.scrollHeight - 1}))));
+}"""
+
+
+def _row_key(row) -> str:
+    return f"{row['model_name']}|{row['provider']}"
+
+
+def _pick_key(obj, names):
+    return next((name for name in names if obj.get(name) not in (None, "")), None)
+
+
+def _pick(obj, names):
+    key = _pick_key(obj, names)
+    return obj[key] if key is not None else None
+
+
+def _with_unit(value, unit):
+    # JSON payloads carry bare numbers; merge_stats.py expects the table's "85.2 tok/s" / "0.45s" strings
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"{value}{unit}"
+    return str(value) if value is not None else "N/A"
+
+
+def _latency(obj, names) -> str:
+    """
+    The first latency in `names`, with the unit its key names. A key that
+    names none leaves the number bare, which merge_stats reads as seconds
+    (the site's own payload reports latency in seconds).
+    """
+    key = _pick_key(obj, names)
+    if key is None:
+        return "N/A"
+    unit = next((unit for suffix, unit in LATENCY_KEY_UNITS if key.lower().endswith(suffix)), "")
+    return _with_unit(obj[key], unit)
+
+
+def row_from_object(obj):
+    """A scraped row for a JSON object describing one (model, provider) pair, or None."""
+    model = _pick(obj, FIELD_ALIASES["model_name"])
+    provider = _pick(obj, FIELD_ALIASES["provider"])
+    if not isinstance(model, str) or not isinstance(provider, str):
+        return None
+    if _pick(obj, FIELD_ALIASES["p50_throughput"] + FIELD_ALIASES["p50_latency"]) is None:
+        return None
+    return {
+        "model_name": model.strip(),
+        "provider": provider.strip(),
+        "p50_throughput": _with_unit(_pick(obj, FIELD_ALIASES["p50_throughput"]), " tok/s"),
+        "p50_latency": _latency(obj, FIELD_ALIASES["p50_latency"]),
+        "p90_latency": _latency(obj, FIELD_ALIASES["p90_latency"]),
+    }
+
+
+def extract_rows(payload):
+    """
+    (rows, total) found anywhere in a JSON payload.
+
+    total is the dataset size the payload announces (e.g. {"total": 712}),
+    or None.
+    """
+    rows, total = [], None
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            row = row_from_object(node)
+            if row:
+                rows.append(row)
+                continue
+            for key in TOTAL_KEYS:
+                if isinstance(node.get(key), int) and not isinstance(node.get(key), bool):
+                    total = max(total or 0, node[key])
+            stack.extend(v for v in node.values() if isinstance(v, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(v for v in reversed(node) if isinstance(v, (dict, list)))
+    return rows, total
+
+
+def row_from_cells(cells):
+    """
+    A scraped row for one rendered table row's cell texts, or None.
+
+    Cells keep their column; a blank or missing cell is None.
+    """
+    values = [c or None for c in cells[:len(ROW_COLUMNS)]]
+    row = dict(zip(ROW_COLUMNS, values + [None] * (len(ROW_COLUMNS) - len(values))))
+    # Spacer rows of a virtualized table, or a pair without any figures
+    if not row["model_name"] or not row["provider"] or not any(row[c] for c in ROW_COLUMNS[2:]):
+        return None
+    return row
+
+
+def load_checkpoint(url) -> dict:
+    try:
+        with open(CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return checkpoint if checkpoint.get("url") == url else {}
+
+
+def save_checkpoint(url, rows, scroll_top=None):
+    CHECKPOINT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CHECKPOINT_FILE.with_suffix(".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({"url": url, "scroll_top": scroll_top, "rows": list(rows.values())}, f)
+    os.replace(tmp, CHECKPOINT_FILE)
+
+
+class StatsScan:
+    """Collects rows for one page load from captured responses and the rendered table."""
+
+    def __init__(self, url, rows=None):
+        self.url = url
+        self.rows = dict(rows or {})
+        self.expected = None
+
+    @property
+    def complete(self) -> bool:
+        return self.expected is not None and len(self.rows) >= self.expected
+
+    def add(self, rows) -> int:
+        before = len(self.rows)
+        for row in rows:
+            self.rows[_row_key(row)] = row
+        return len(self.rows) - before
+
+    def on_response(self, response):
+        if "json" not in (response.headers.get("content-type") or ""):
+            return
+        try:
+            payload = response.json()
+        except Exception:
+            return
+        rows, total = extract_rows(payload)
+        if rows:
+            added = self.add(rows)
+            print(f"  📡 {response.url}: {len(rows)} rows ({added} new)")
+        if total and rows:
+            self.expected = max(self.expected or 0, total)
+
+    def read_counter(self, page):
+        match = _ROW_COUNTER.search(page.inner_text("body"))
+        if match:
+            self.expected = max(self.expected or 0, int(match.group(1).replace(",", "")))
+
+    def read_table(self, page) -> int:
+        return self.add(filter(None, map(row_from_cells, page.evaluate(_READ_ROWS_JS))))
+
+
+def scrape(url=STATS_URL, resume=False, intercept=True, headless=True) -> list[dict]:
+    """Scrape every (model, provider) row from `url`; intercept=False reads only the rendered table."""
+    checkpoint = load_checkpoint(url) if resume else {}
+    scan = StatsScan(url, {_row_key(r): r for r in checkpoint.get("rows", [])})
+    if checkpoint:
+        print(f"↩️  Resuming with {len(scan.rows)} rows from {CHECKPOINT_FILE}")
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            context = browser.new_context(user_agent=USER_AGENT, viewport={'width': 1920, 'height': 1080})
+            page = context.new_page()
+            if intercept:
+                page.on("response", scan.on_response)
+            print(f"🕵️ Loading {url}...")
+            page.goto(url, wait_until="networkidle", timeout=NAV_TIMEOUT_MS)
+            page.wait_for_selector("table tbody tr", timeout=NAV_TIMEOUT_MS)
+
+            scan.read_counter(page)
+            if not scan.complete:
+                scan.read_table(page)
+            save_checkpoint(url, scan.rows)
+
+            # Only a virtualized table still missing rows needs scrolling
+            container = page.locator("div.overflow-auto").first
+            if not scan.complete and container.count() > 0:
+                top = checkpoint.get("scroll_top")
+                print(f"🖱️ Scrolling for the remaining rows ({len(scan.rows)}/{scan.expected or '?'})...")
+                for step in range(MAX_SCROLL_STEPS):
+                    pos = container.evaluate(_SCROLL_JS, top)
+                    top = None
+                    scan.read_table(page)
+                    save_checkpoint(url, scan.rows, pos["top"])
+                    if scan.complete or pos["bottom"]:
+                        break
+                    if step % 20 == 0:
+                        print(f"  Step {step}: {len(scan.rows)} rows...")
+        finally:
+            browser.close()
+
+    if scan.expected and not scan.complete:
+        print(f"⚠️  Collected {len(scan.rows)} of {scan.expected} rows; rerun with --resume to continue")
+    else:
+        CHECKPOINT_FILE.unlink(missing_ok=True)
+    return list(scan.rows.values())
+
+
+def main(default_output=OUTPUT_FILE):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Scrape throughput/latency rows from openrouterstats.com')
+    parser.add_argument('-o', '--output', type=pathlib.Path, default=default_output,
+                        help=f'Output file (default: {default_output})')
+    parser.add_argument('--url', default=STATS_URL, help='Page to scrape')
+    parser.add_argument('--serve', type=pathlib.Path, metavar='DIR',
+                        help='Serve DIR locally and scrape its index.html instead (e.g. scripts/fixtures/openrouterstats)')
+    parser.add_argument('--resume', action='store_true', help='Continue from the last interrupted scan')
+    parser.add_argument('--no-intercept', action='store_true',
+                        help='Ignore captured data responses and read the rendered table only')
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if args.serve:
+        server = serve_directory(str(args.serve))
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+    try:
+        rows = scrape(url, resume=args.resume, intercept=not args.no_intercept)
+    finally:
+        if server:
+            server.shutdown()
+
+    # Atomic, and an identical rescrape keeps the file's mtime (merge_stats' sketch timestamp)
+    if write_if_changed(args.output, json.dumps(rows, indent=2, ensure_ascii=False)):
+        print(f"🏆 Saved {len(rows)} rows to {args.output}")
+    else:
+        print(f"💤 {len(rows)} rows unchanged in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,305 @@
+"""
+Screenshot and front-end performance harness for the built dashboard.
+
+    python scripts/take_screenshot.py                    # images/dashboard.png
+    python scripts/take_screenshot.py --perf             # measure docs/ as built
+    python scripts/take_screenshot.py --perf --sizes 10000 100000 --save-baseline
+
+--perf opens each tab/viewport scenario in its own page of one headless
+Chromium, concurrently, and records load-to-first-row time, JS heap,
+long tasks and the time renderTable, switchTab, filter toggles and
+typing in the search box take to reach a painted table. --sizes builds
+synthetic catalogs (see benchmark.make_catalog) into temporary sites
+instead of using docs/. Reports land in data/benchmarks/ and are compared
+against a saved baseline like benchmark.py's.
+"""
+import argparse
 import asyncio
+import json
 import os
+import pathlib
+import statistics
+import sys
+import tempfile
+import time
 from playwright.async_api import async_playwright
 
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+from local_server import serve_directory
+
+
 async def run():
     async with async_playwright() as p:
         browser = await p.chromium.launch()
         page = await browser.new_page(viewport={"width": 1280, "height": 800})
-        
+
         # Determine paths
         script_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.dirname(script_dir)
-        html_path = os.path.join(project_root, "docs", "index.html")
+        docs_dir = os.path.join(project_root, "docs")
         output_path = os.path.join(project_root, "images", "dashboard.png")
-        
-        print(f"Opening: file://{html_path}")
-        await page.goto(f"file://{html_path}")
-        
-        # Wait for any content to load if needed (e.g. table)
+
+        server = serve_directory(docs_dir)
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+        print(f"Opening: {url}")
+        await page.goto(url)
+
+        # Wait for the shard fetch and the first table rows
         await page.wait_for_load_state("networkidle")
-        
+        await page.wait_for_selector("#tableBody tr.model-row")
+
         print(f"Saving screenshot to: {output_path}")
         await page.screenshot(path=output_path, full_page=False)
-        
+
         await browser.close()
+        server.shutdown()
+
+
+# --- Performance harness ---
+
+BASE_DIR = pathlib.Path(__file__).resolve().parent.parent
+DOCS_DIR = BASE_DIR / "docs"
+BENCH_DIR = BASE_DIR / "data" / "benchmarks"
+BASELINE_FILE = BENCH_DIR / "frontend_baseline.json"
+LATEST_FILE = BENCH_DIR / "frontend_latest.json"
+
+VIEWPORTS = {"desktop": {"width": 1280, "height": 800}, "mobile": {"width": 390, "height": 844}}
+DEFAULT_SCENARIOS = ("text@desktop", "image@desktop", "embedding@desktop", "text@mobile")
+DEFAULT_REPEAT = 5
+SEARCH_TERM = "gpt vision"
+WAIT_TIMEOUT_MS = 60_000
+
+# Same comparison rules as benchmark.py, for browser metrics
+TOLERANCE = {"first_row_ms": 0.25, "render_table_ms": 0.25, "switch_tab_ms": 0.25, "filter_toggle_ms": 0.25,
+             "search_ms": 0.25, "long_task_ms": 0.5, "heap_bytes": 0.10}
+MIN_DELTA = {"first_row_ms": 20, "render_table_ms": 5, "switch_tab_ms": 5, "filter_toggle_ms": 5,
+             "search_ms": 10, "long_task_ms": 50, "heap_bytes": 1024 * 1024}
+
+# Installed before any page script: long-task observer, first-row timestamp, last search keystroke
+_INIT_JS = """
+window.__perf = { longTasks: [], firstRow: null, lastInput: 0, viewAtInput: undefined };
+try {
+    new PerformanceObserver(list => list.getEntries().forEach(e => __perf.longTasks.push(e.duration)))
+        .observe({ type: 'longtask', buffered: true });
+} catch (e) {}
+const __firstRowObserver = new MutationObserver(() => {
+    if (document.querySelector('#tableBody tr.model-row')) {
+        __perf.firstRow = performance.now();
+        __firstRowObserver.disconnect();
+    }
+});
+__firstRowObserver.observe(document, { childList: true, subtree: true });
+document.addEventListener('input', e => {
+    if (e.target.id !== 'searchInput') return;
+    __perf.lastInput = performance.now();
+    __perf.viewAtInput = view;
+}, true);
+"""
+
+# Runs one dashboard action and resolves with the ms until the resulting table was painted.
+# Every action ends in renderTable(), which replaces `view`; some don't await it, so poll for that.
+_TIME_ACTION_JS = """async ([action, arg]) => {
+    const before = view;
+    const t0 = performance.now();
+    if (action === 'renderTable') await renderTable();
+    else if (action === 'switchTab') await switchTab(arg);
+    else if (action === 'toggleFilter') toggleFilter(arg);
+    const deadline = t0 + %d;
+    while (view === before && performance.now() < deadline) await new Promise(r => requestAnimationFrame(r));
+    await new Promise(r => requestAnimationFrame(() => setTimeout(r, 0)));
+    return performance.now() - t0;
+}""" % WAIT_TIMEOUT_MS
+
+_PAINTED_JS = "() => new Promise(r => requestAnimationFrame(() => setTimeout(r, 0)))"
+
+
+async def _time(page, action, arg=None) -> float:
+    return await page.evaluate(_TIME_ACTION_JS, [action, arg])
+
+
+async def _median_time(page, repeat, action, arg=None) -> float:
+    return statistics.median([await _time(page, action, arg) for _ in range(repeat)])
+
+
+async def measure_scenario(browser, url, tab, viewport, repeat) -> dict:
+    """Open the dashboard in a fresh context and time the interactions on one tab."""
+    context = await browser.new_context(viewport=VIEWPORTS[viewport])
+    try:
+        page = await context.new_page()
+        await page.add_init_script(_INIT_JS)
+        await page.goto(url)
+        await page.wait_for_selector("#tableBody tr.model-row", timeout=WAIT_TIMEOUT_MS)
+        first_row = await page.evaluate("() => __perf.firstRow")
+
+        other = "image" if tab == "text" else "text"
+        if tab != "text":
+            await _time(page, "switchTab", tab)
+        render_ms = await _median_time(page, repeat, "renderTable")
+
+        switch_times = []
+        for _ in range(repeat):
+            await _time(page, "switchTab", other)
+            switch_times.append(await _time(page, "switchTab", tab))
+
+        # Toggle the first two chips on and off again, so later steps see the unfiltered tab
+        fids = await page.evaluate("() => [...document.querySelectorAll('.filter-count[data-fid]')].map(e => e.dataset.fid)")
+        filter_times = [await _time(page, "toggleFilter", fid) for fid in fids[:2] for _ in (0, 1)]
+
+        search_times = []
+        for _ in range(repeat):
+            await page.evaluate("""() => {
+                const el = document.getElementById('searchInput');
+                el.value = '';
+                el.dispatchEvent(new Event('input', { bubbles: true }));
+            }""")
+            await page.wait_for_function("() => view !== __perf.viewAtInput", timeout=WAIT_TIMEOUT_MS)
+            await page.click("#searchInput")
+            await page.keyboard.type(SEARCH_TERM, delay=30)
+            await page.wait_for_function("() => view !== __perf.viewAtInput", timeout=WAIT_TIMEOUT_MS)
+            await page.evaluate(_PAINTED_JS)
+            search_times.append(await page.evaluate("() => performance.now() - __perf.lastInput"))
+
+        long_tasks = await page.evaluate("() => __perf.longTasks")
+        heap = await page.evaluate("() => performance.memory ? performance.memory.usedJSHeapSize : 0")
+        return {
+            "first_row_ms": round(first_row, 1),
+            "render_table_ms": round(render_ms, 2),
+            "switch_tab_ms": round(statistics.median(switch_times), 2),
+            "filter_toggle_ms": round(statistics.median(filter_times), 2) if filter_times else 0,
+            # Measured from the last keystroke, so it includes the input debounce
+            "search_ms": round(statistics.median(search_times), 2),
+            "long_tasks": len(long_tasks),
+            "long_task_ms": round(sum(long_tasks), 1),
+            "heap_bytes": heap,
+        }
+    finally:
+        await context.close()
+
+
+async def measure_site(site_dir, scenarios, repeat, parallel) -> dict:
+    """{scenario: metrics} for one built site, scenarios running as concurrent pages."""
+    server = serve_directory(str(site_dir))
+    url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+    limit = asyncio.Semaphore(parallel or len(scenarios))
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(args=["--enable-precise-memory-info"])
+
+            async def one(scenario):
+                tab, viewport = scenario.split("@")
+                async with limit:
+                    return scenario, await measure_scenario(browser, url, tab, viewport, repeat)
+
+            results = dict(await asyncio.gather(*(one(s) for s in scenarios)))
+            await browser.close()
+    finally:
+        server.shutdown()
+    return {s: results[s] for s in scenarios}
+
+
+def build_synthetic_site(size, out_dir, seed=0):
+    """Build a dashboard for a synthetic catalog of `size` models into out_dir (unminified)."""
+    import contextlib
+    import io
+    import shutil
+
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    from benchmark import TEMPLATES_DIR, make_catalog
+    from build import (CAP_BITS, SERVICE_WORKER, build_shards, compute_context_options, compute_provider_options,
+                       create_environment, normalize_catalog, render_dashboard)
+    from catalog import ModelCatalog
+    from facets import compute_facets
+    from fetch import process_data
+
+    out_dir = pathlib.Path(out_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        data = process_data(make_catalog(size, seed), output_file=out_dir / "openrouter_data.json")
+    records = normalize_catalog(data)
+    files, index = build_shards(data, {}, records)
+    html = render_dashboard(create_environment(TEMPLATES_DIR), index, compute_facets(records, CAP_BITS),
+                            compute_context_options(data.get("text", [])), compute_provider_options(ModelCatalog.from_grouped(data)),
+                            f"synthetic {size}")
+    (out_dir / "data").mkdir(parents=True, exist_ok=True)
+    for rel, content in files.items():
+        (out_dir / rel).write_text(content, encoding='utf-8')
+    (out_dir / "index.html").write_text(html, encoding='utf-8')
+    # No service worker: its precaching would be measured along with the page
+    for item in (BASE_DIR / "scripts" / "static").iterdir():
+        if item.is_file() and item.name != SERVICE_WORKER:
+            shutil.copy(item, out_dir / item.name)
+
+
+def print_perf(report):
+    cols = ("first_row_ms", "render_table_ms", "switch_tab_ms", "filter_toggle_ms", "search_ms", "long_task_ms")
+    print(f"{'site':>7} {'scenario':<18} " + " ".join(f"{c.removesuffix('_ms'):>13}" for c in cols) + f" {'heap':>9}")
+    for site, scenarios in report["results"].items():
+        for scenario, m in scenarios.items():
+            print(f"{site:>7} {scenario:<18} " + " ".join(f"{m[c]:>11.1f}ms" for c in cols)
+                  + f" {m['heap_bytes'] / 1024 / 1024:>7.1f}MB")
+
+
+def run_perf(args):
+    from benchmark import compare
+
+    report = {"generated_at": int(time.time()), "repeat": args.repeat, "results": {}}
+    if not args.sizes:
+        if not (DOCS_DIR / "index.html").exists():
+            print(f"❌ No dashboard at {DOCS_DIR}; run scripts/build.py first")
+            sys.exit(1)
+        print(f"⏱️  Measuring {DOCS_DIR} ({len(args.scenarios)} scenarios)...")
+        report["results"]["docs"] = asyncio.run(measure_site(DOCS_DIR, args.scenarios, args.repeat, args.parallel))
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            print(f"🏗️  Building a synthetic {size}-model dashboard...")
+            build_synthetic_site(size, tmp, args.seed)
+            print(f"⏱️  Measuring {size} models ({len(args.scenarios)} scenarios)...")
+            report["results"][str(size)] = asyncio.run(measure_site(tmp, args.scenarios, args.repeat, args.parallel))
+
+    print_perf(report)
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    LATEST_FILE.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"💾 Saved baseline to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"ℹ️  No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+    regressions = compare(report, json.loads(args.baseline.read_text(encoding='utf-8')), TOLERANCE, MIN_DELTA)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) against {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"✅ No regressions against {args.baseline}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Screenshot or measure the built dashboard')
+    parser.add_argument('--perf', action='store_true', help='Run the performance harness instead of the screenshot')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[],
+                        help='Measure synthetic catalogs of these sizes instead of docs/')
+    parser.add_argument('--scenarios', nargs='+', default=list(DEFAULT_SCENARIOS),
+                        help=f'tab@viewport pairs; viewports: {", ".join(VIEWPORTS)}')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Runs per timed interaction; the median is kept')
+    parser.add_argument('--parallel', type=int, default=0, help='Pages measured at once (default: all scenarios)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic catalogs')
+    parser.add_argument('--baseline', type=pathlib.Path, default=BASELINE_FILE, help='Baseline file to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+    args = parser.parse_args()
+
+    if not args.perf:
+        asyncio.run(run())
+        return
+    for scenario in args.scenarios:
+        tab, _, viewport = scenario.partition("@")
+        if tab not in ("text", "image", "embedding") or viewport not in VIEWPORTS:
+            parser.error(f"invalid scenario {scenario!r}")
+    sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+    run_perf(args)
 
 if __name__ == "__main__":
-    asyncio.run(run())
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Keep data/ and docs/ up to date from one long-running process.
+
+Each cycle runs the update.sh pipeline in-process: fetch.py (conditional
+requests, so an unchanged catalog costs two 304s), prefetch_endpoints.py
+for entries past their max age, then build.py, whose manifest skips the
+build unless the catalog, endpoints or stats hash differently. The HTTP
+session, the Jinja environment and the parsed catalog stay warm between
+cycles, and every file is written through a temp file and rename
+(manifest.write_if_changed), with index.html last, so a half-written
+page is never served.
+
+    python scripts/watch.py --interval 600 --release
+    python scripts/watch.py --cycles 1          # one in-process update, then exit
+
+Each cycle writes a metrics file (see metrics.py). SIGTERM or Ctrl-C
+stops the loop after the current cycle.
+"""
+import argparse
+import pathlib
+import signal
+import sys
+import threading
+import time
+import traceback
+
+sys.path.append(str(pathlib.Path(__file__).resolve().parent))
+import fetch
+import metrics
+from build import create_environment, generate_dashboard
+from get_openrouter_data import create_session
+from prefetch_endpoints import DEFAULT_WORKERS, prefetch_endpoints
+
+TEMPLATES_DIR = pathlib.Path(__file__).resolve().parent / "templates"
+DEFAULT_INTERVAL = 15 * 60  # seconds between cycle starts
+# After a failed cycle, wait this long (doubling up to the interval) before retrying
+FAILURE_DELAY = 30
+
+
+def run_cycle(session, env, release=False, endpoints=True) -> bool:
+    """One fetch/prefetch/build pass. Returns True if the dashboard changed."""
+    with metrics.stage("fetch"):
+        if not fetch.main(session=session):
+            raise RuntimeError("catalog fetch failed")
+    if endpoints:
+        with metrics.stage("endpoints"):
+            prefetch_endpoints(session=session)
+    with metrics.stage("build"):
+        return generate_dashboard(release=release, env=env)
+
+
+def watch(interval=DEFAULT_INTERVAL, release=False, endpoints=True, cycles=None, profile=None):
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        print("🛑 Stopping after the current cycle...")
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    session = create_session(pool_size=DEFAULT_WORKERS)
+    env = create_environment(TEMPLATES_DIR)
+    failures = 0
+    cycle = 0
+    print(f"👀 Watching the OpenRouter catalog every {interval:g}s (Ctrl-C to stop)")
+    try:
+        while not stop.is_set() and (cycles is None or cycle < cycles):
+            cycle += 1
+            started = time.monotonic()
+            print(f"\n🔄 Cycle {cycle} at {time.strftime('%Y-%m-%d %H:%M:%S')}")
+            metrics.start_run("watch", profile=profile)
+            status = "error"
+            try:
+                changed = run_cycle(session, env, release, endpoints)
+                status = "ok"
+                failures = 0
+                print("🆕 Dashboard updated." if changed else "💤 Nothing changed.")
+            except Exception:
+                failures += 1
+                traceback.print_exc()
+            finally:
+                metrics.finish_run(status)
+
+            if cycles is not None and cycle >= cycles:
+                break
+            if failures:
+                delay = min(interval, FAILURE_DELAY * 2 ** (failures - 1))
+                print(f"⚠️  Cycle failed ({failures} in a row); retrying in {delay:g}s")
+            else:
+                delay = max(0.0, interval - (time.monotonic() - started))
+            stop.wait(delay)
+    except KeyboardInterrupt:
+        print("\n🛑 Interrupted.")
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Poll the catalog and rebuild the dashboard when it changes')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f'Seconds between polls (default: {DEFAULT_INTERVAL})')
+    parser.add_argument('--release', action='store_true', help='Build with --release (as update.sh does)')
+    parser.add_argument('--no-endpoints', dest='endpoints', action='store_false',
+                        help='Skip the per-model endpoint prefetch')
+    parser.add_argument('--cycles', type=int, help='Stop after this many cycles (default: run until stopped)')
+    metrics.add_profile_argument(parser)
+    args = parser.parse_args()
+
+    watch(args.interval, args.release, args.endpoints, args.cycles, args.profile)
+
+
+if __name__ == "__main__":
+    main()
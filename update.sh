@@ -11,8 +11,12 @@ echo "🚀 Starting OpenRouter Pricing Update..."
 echo "📥 Fetching and consolidating data..."
 uv run python scripts/fetch.py
 
-# 2. Generate Dashboard
+# 2. Prefetch provider endpoints for the details panel
+echo "🔌 Prefetching provider endpoints..."
+uv run python scripts/prefetch_endpoints.py
+
+# 3. Generate Dashboard
 echo "📊 Generating Main Dashboard..."
-uv run python scripts/build.py
+uv run python scripts/build.py --release
 
 echo "✅ Update Complete! Open docs/index.html to view."